@@ -11,6 +11,7 @@ from config import SECRET_KEY, HOST, PORT
 from routes import api_bp
 from websocket import register_socket_events
 from utils import get_local_ip
+from utils.flask_json import CodecJSONProvider
 
 
 def create_app():
@@ -24,6 +25,9 @@ def create_app():
     app = Flask(__name__)
     app.config['SECRET_KEY'] = SECRET_KEY
     
+    # jsonify 使用高速 JSON 编码（未安装 orjson 时自动回退到标准库）
+    app.json = CodecJSONProvider(app)
+    
     # 注册蓝图
     app.register_blueprint(api_bp)
     
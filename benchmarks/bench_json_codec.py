@@ -0,0 +1,98 @@
+"""
+JSON 编解码基准测试
+对比标准库 json 与 utils.json_codec（orjson 后端）在 LCU 典型数据上的解码/编码耗时
+
+用法:
+    python benchmarks/bench_json_codec.py                       # 使用内置的模拟数据
+    python benchmarks/bench_json_codec.py history.json game.json  # 使用录制的真实响应
+
+录制真实响应示例（客户端运行时）:
+    curl -k -u riot:<token> "https://127.0.0.1:<port>/lol-match-history/v1/products/lol/<puuid>/matches?endIndex=200" > history.json
+"""
+import importlib
+import json
+import os
+import sys
+import timeit
+
+# 直接以脚本运行时，仓库根目录不在 sys.path 中
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+json_codec = importlib.import_module('utils.json_codec')
+
+
+def _synthetic_game(game_id):
+    """构造一场结构接近 LCU 返回的对局数据（10 名参与者）"""
+    participants = []
+    identities = []
+    for pid in range(1, 11):
+        stats = {f'stat{i}': i * pid for i in range(100)}
+        stats.update({'kills': pid, 'deaths': 3, 'assists': 7, 'win': pid <= 5})
+        participants.append({
+            'participantId': pid,
+            'championId': 100 + pid,
+            'teamId': 100 if pid <= 5 else 200,
+            'spell1Id': 4,
+            'spell2Id': 14,
+            'stats': stats,
+            'timeline': {'lane': 'MIDDLE', 'role': 'SOLO', 'creepsPerMinDeltas': {'0-10': 7.2, '10-20': 8.1}},
+        })
+        identities.append({
+            'participantId': pid,
+            'player': {'puuid': f'{pid:08d}-aaaa-bbbb-cccc-{game_id:012d}', 'gameName': f'玩家{pid}', 'tagLine': '12345'},
+        })
+    return {
+        'gameId': game_id,
+        'gameMode': 'CLASSIC',
+        'gameCreation': 1700000000000 + game_id,
+        'gameDuration': 1800,
+        'participants': participants,
+        'participantIdentities': identities,
+        'teams': [{'teamId': 100, 'win': 'Win', 'bans': []}, {'teamId': 200, 'win': 'Fail', 'bans': []}],
+    }
+
+
+def _synthetic_payloads():
+    """内置模拟数据：200 场战绩（/get_history 源数据）和单场对局详情（/get_match）"""
+    history = {'accountId': 1, 'games': {'gameCount': 200, 'games': [_synthetic_game(i) for i in range(200)]}}
+    return {
+        'match_history_200': json.dumps(history, ensure_ascii=False).encode('utf-8'),
+        'match_detail': json.dumps(_synthetic_game(1), ensure_ascii=False).encode('utf-8'),
+    }
+
+
+def _bench(func, number):
+    """返回单次调用的最佳平均耗时（毫秒）"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main(paths):
+    if paths:
+        payloads = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                payloads[os.path.basename(path)] = f.read()
+    else:
+        payloads = _synthetic_payloads()
+
+    print(f"json_codec 后端: {json_codec.BACKEND}")
+    if json_codec.BACKEND == 'json':
+        print("⚠️ 未安装 orjson，两列结果应基本相同（pip install orjson）")
+    print(f"{'payload':<22}{'size':>10}  {'op':<7}{'stdlib ms':>11}{'codec ms':>11}{'speedup':>9}")
+
+    for name, raw in payloads.items():
+        obj = json.loads(raw)
+        number = max(1, int(2_000_000 / max(len(raw), 1)))
+        # 通过默认参数绑定本轮的数据和编解码器，避免闭包读到之后迭代的变量
+        cases = [
+            ('decode', lambda raw=raw: json.loads(raw), lambda raw=raw, codec=json_codec: codec.loads(raw)),
+            ('encode', lambda obj=obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':')),
+             lambda obj=obj, codec=json_codec: codec.dumps_bytes(obj)),
+        ]
+        for op, stdlib_func, codec_func in cases:
+            stdlib_ms = _bench(stdlib_func, number)
+            codec_ms = _bench(codec_func, number)
+            print(f"{name:<22}{len(raw):>10}  {op:<7}{stdlib_ms:>11.3f}{codec_ms:>11.3f}{stdlib_ms / codec_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
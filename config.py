@@ -13,7 +13,7 @@ class AppState:
     """应用全局状态管理"""
     def __init__(self):
         from typing import Any
-        from threading import Thread
+        from threading import Lock, Thread
 
         # 功能开关
         self.auto_accept_enabled: bool = False
@@ -25,14 +25,17 @@ class AppState:
         self.current_teammates: set = set()
 
         # LCU凭证 (auth_token may be str or None; app_port may be int or None)
+        # 只通过 set_lcu_credentials 整体替换，读取方不会看到新旧混合的 token/端口
         self.lcu_credentials: dict[str, Any] = {
             "auth_token": None,
             "app_port": None
         }
+        self._credentials_lock = Lock()
 
         # 线程引用
         self.auto_accept_thread: 'Thread | None' = None
         self.auto_analyze_thread: 'Thread | None' = None
+        self.credential_watcher_thread: 'Thread | None' = None
     
     def reset_analysis_state(self):
         """重置分析状态"""
@@ -44,5 +47,27 @@ class AppState:
         """检查LCU是否连接"""
         return self.lcu_credentials["auth_token"] is not None
 
+    def get_lcu_credentials(self):
+        """
+        获取当前LCU凭证（同一次快照中的 token 和端口）
+
+        Returns:
+            tuple: (auth_token, app_port)，未连接时为 (None, None)
+        """
+        credentials = self.lcu_credentials
+        return credentials["auth_token"], credentials["app_port"]
+
+    def set_lcu_credentials(self, token, port):
+        """
+        整体替换LCU凭证
+
+        Returns:
+            bool: 凭证是否发生变化
+        """
+        with self._credentials_lock:
+            changed = self.get_lcu_credentials() != (token, port)
+            self.lcu_credentials = {"auth_token": token, "app_port": port}
+            return changed
+
 # 创建全局状态实例
 app_state = AppState()
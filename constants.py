@@ -1,6 +1,10 @@
-import winreg
 import os
 
+try:
+    import winreg
+except ImportError:  # 非 Windows 平台（如在 Linux 上运行测试）没有注册表
+    winreg = None
+
 # --- LCU 根路径查找函数 ---
 
 # 日志目录路径
@@ -14,6 +18,8 @@ def find_league_client_root_static():
     
     # 尝试从注册表读取路径
     try:
+        if winreg is None:
+            raise FileNotFoundError(REG_KEY_PATH)
         # 使用 KEY_WOW64_64KEY 确保在 64 位系统上找到 64 位应用程序的键
         key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REG_KEY_PATH, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
         # 查找名为 'InstallLocation' 的值，例如: C:\Riot Games\League of Legends
@@ -26,11 +26,82 @@ from .credentials import (
     is_league_client_running,
     get_latest_log_file,
     extract_params_from_log,
-    detect_file_encoding
+    detect_file_encoding,
+    find_client_process,
+    get_credentials_from_process,
+    parse_cmdline_credentials,
+    parse_lockfile,
+    read_lockfile,
+    load_saved_credentials,
+    save_credentials,
+    clear_saved_credentials,
+    validate_credentials
 )
 
 # HTTP 客户端
-from .client import make_request
+from .client import (
+    make_request,
+    request_json,
+    iter_json_array,
+    make_requests_many,
+    map_concurrent,
+    LCURequestError,
+    LCUCircuitOpenError,
+    LCUDeadlineExceededError,
+    LCUResult,
+    get_session,
+    reset_session,
+    get_inflight_count,
+    reset_inflight,
+    get_hedge_stats
+)
+
+# 熔断器
+from .circuit_breaker import (
+    is_endpoint_available,
+    get_retry_after,
+    get_circuit_states,
+    reset_circuit_breakers
+)
+
+# 缓存
+from .cache import LRUTTLCache, get_cache_stats, clear_response_cache
+
+# 请求指标
+from .metrics import get_request_metrics, latency_percentile, reset_metrics
+
+# 请求限流
+from .rate_limiter import (
+    PRIORITY_CRITICAL,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BACKGROUND,
+    request_priority,
+    get_request_priority,
+    configure_rate_limit,
+    get_rate_limiter_stats
+)
+
+# 请求期限
+from .deadline import request_deadline, with_deadline, remaining_budget
+
+# 重试策略
+from .retry import RetryPolicy, DEFAULT_RETRY_POLICY, is_retryable_error
+
+# 事件推送
+from .events import (
+    LCUEvent,
+    LCUEventClient,
+    EventWatcher,
+    URI_GAMEFLOW_PHASE,
+    URI_READY_CHECK,
+    URI_CHAMP_SELECT_SESSION,
+    URI_END_OF_GAME,
+    subscribe_event,
+    unsubscribe_event,
+    start_event_stream,
+    stop_event_stream,
+    is_event_stream_connected
+)
 
 # 游戏流程
 from .game_flow import (
@@ -47,14 +118,25 @@ from .summoner import (
     get_summoner_by_id,
     get_summoner_by_puuid,
     get_summoner_by_name,
-    get_ranked_stats
+    get_ranked_stats,
+    get_ranked_stats_many,
+    summarize_ranked_stats,
+    get_summoners_by_puuids,
+    get_summoners_by_ids,
+    clean_summoner_name,
+    get_summoner_cache_stats,
+    clear_summoner_cache
 )
 
 # 战绩查询
 from .match_history import (
     get_match_history,
+    iter_match_history_games,
     get_tft_match_history,
-    get_match_by_id
+    get_match_by_id,
+    reset_learned_endpoints,
+    clear_match_history_cache,
+    get_match_history_cache_stats
 )
 
 # 游戏内实时数据
@@ -68,43 +150,104 @@ from .live_game import (
 # 数据增强
 from .enrichment import enrich_game_with_summoner_info, enrich_tft_game_with_summoner_info
 
+# 会话生命周期
+from .lifecycle import reset_lcu_state, switch_credentials
+
+# 按名称排序；分组见上方的导入
 __all__ = [
-    # 凭证检测
+    'DEFAULT_RETRY_POLICY',
+    'PRIORITY_BACKGROUND',
+    'PRIORITY_CRITICAL',
+    'PRIORITY_INTERACTIVE',
+    'URI_CHAMP_SELECT_SESSION',
+    'URI_END_OF_GAME',
+    'URI_GAMEFLOW_PHASE',
+    'URI_READY_CHECK',
+    'EventWatcher',
+    'LCUCircuitOpenError',
+    'LCUDeadlineExceededError',
+    'LCUEvent',
+    'LCUEventClient',
+    'LCURequestError',
+    'LCUResult',
+    'LRUTTLCache',
+    'RetryPolicy',
+    'accept_ready_check',
     'autodetect_credentials',
-    'is_league_client_running',
-    'get_latest_log_file',
-    'extract_params_from_log',
+    'clean_summoner_name',
+    'clear_match_history_cache',
+    'clear_response_cache',
+    'clear_saved_credentials',
+    'clear_summoner_cache',
+    'configure_rate_limit',
     'detect_file_encoding',
-    
-    # HTTP 客户端
-    'make_request',
-    
-    # 游戏流程
-    'get_gameflow_phase',
-    'accept_ready_check',
-    'get_champ_select_session',
+    'enrich_game_with_summoner_info',
+    'enrich_tft_game_with_summoner_info',
+    'extract_params_from_log',
+    'find_client_process',
+    'get_all_players_from_game',
+    'get_cache_stats',
     'get_champ_select_enemies',
-    
-    # 召唤师信息
+    'get_champ_select_session',
+    'get_circuit_states',
+    'get_credentials_from_process',
     'get_current_summoner',
+    'get_enemy_players_from_game',
+    'get_enemy_stats',
+    'get_gameflow_phase',
+    'get_hedge_stats',
+    'get_inflight_count',
+    'get_latest_log_file',
+    'get_live_game_data',
+    'get_match_by_id',
+    'get_match_history',
+    'get_match_history_cache_stats',
     'get_puuid',
+    'get_ranked_stats',
+    'get_ranked_stats_many',
+    'get_rate_limiter_stats',
+    'get_request_metrics',
+    'get_request_priority',
+    'get_retry_after',
+    'get_session',
     'get_summoner_by_id',
-    'get_summoner_by_puuid',
     'get_summoner_by_name',
-    'get_ranked_stats',
-    
-    # 战绩查询
-    'get_match_history',
+    'get_summoner_by_puuid',
+    'get_summoner_cache_stats',
+    'get_summoners_by_ids',
+    'get_summoners_by_puuids',
     'get_tft_match_history',
-    'get_match_by_id',
-    
-    # 游戏内实时数据
-    'get_live_game_data',
-    'get_enemy_players_from_game',
-    'get_all_players_from_game',
-    'get_enemy_stats',
-    
-    # 数据增强
-    'enrich_game_with_summoner_info',
-    'enrich_tft_game_with_summoner_info',
+    'is_endpoint_available',
+    'is_event_stream_connected',
+    'is_league_client_running',
+    'is_retryable_error',
+    'iter_json_array',
+    'iter_match_history_games',
+    'latency_percentile',
+    'load_saved_credentials',
+    'make_request',
+    'make_requests_many',
+    'map_concurrent',
+    'parse_cmdline_credentials',
+    'parse_lockfile',
+    'read_lockfile',
+    'remaining_budget',
+    'request_deadline',
+    'request_json',
+    'request_priority',
+    'reset_circuit_breakers',
+    'reset_inflight',
+    'reset_lcu_state',
+    'reset_learned_endpoints',
+    'reset_metrics',
+    'reset_session',
+    'save_credentials',
+    'start_event_stream',
+    'stop_event_stream',
+    'subscribe_event',
+    'summarize_ranked_stats',
+    'switch_credentials',
+    'unsubscribe_event',
+    'validate_credentials',
+    'with_deadline',
 ]
@@ -0,0 +1,231 @@
+"""
+LCU 缓存模块
+提供通用的 LRU + TTL 缓存结构，并按端点策略表缓存 GET 响应（由 client.request_json 透明使用）
+"""
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from utils import json_codec
+
+# 读取时表示未命中的哨兵（缓存值本身可以是 None）
+_MISSING = object()
+
+
+def estimate_size(value):
+    """
+    估算缓存值占用的字节数。
+    
+    bytes/str 按长度计算（响应体缓存的主要情况）；其他对象只计算对象本身
+    （sys.getsizeof，不递归），需要精确值时向 LRUTTLCache 传入自定义 sizeof。
+    """
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+def json_size(value):
+    """
+    按 JSON 编码后的长度估算嵌套 dict/list 占用的字节数。
+    
+    estimate_size 不递归，会严重低估战绩列表这类嵌套结构；编码长度与内存占用
+    同一量级，且只在写入缓存时计算一次。
+    """
+    try:
+        return len(json_codec.dumps_bytes(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class LRUTTLCache:
+    """
+    线程安全的 LRU + TTL 缓存。
+    
+    get/put/淘汰均为 O(1)：条目按最近使用顺序保存在 OrderedDict 中，超出条目数或
+    字节数上限时从最久未使用的一端淘汰。过期采用惰性检查：读取到过期条目时才删除，
+    未被读取的过期条目随 LRU 淘汰，不做全量扫描。
+    
+    Args:
+        name: 缓存名称（用于统计）
+        ttl: 默认过期时间（秒），None 表示永不过期
+        max_entries: 最大条目数
+        max_bytes: 估算字节数上限，None 表示不限制
+        sizeof: 估算单个值字节数的函数（默认 estimate_size）
+    
+    Examples:
+        >>> cache = LRUTTLCache('summoner', ttl=600, max_entries=500)
+        >>> cache.put('puuid', {'gameName': 'Faker'})
+        >>> cache.get('puuid')
+        {'gameName': 'Faker'}
+    """
+
+    def __init__(self, name, ttl=None, max_entries=1000, max_bytes=None, sizeof=estimate_size):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: (expires_at, size, value)}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """读取缓存值（未命中或已过期返回 default），命中时标记为最近使用"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, size, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value, ttl=_MISSING):
+        """
+        写入缓存值。
+        
+        Args:
+            key: 键
+            value: 值
+            ttl: 本条目的过期时间（秒），默认使用缓存的 ttl，None 表示永不过期
+        """
+        if ttl is _MISSING:
+            ttl = self.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            old = self._entries.pop(key, _MISSING)
+            if old is not _MISSING:
+                self._bytes -= old[1]
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """删除并返回缓存值（不存在时返回 default，不计入命中统计）"""
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            self._bytes -= entry[1]
+            return entry[2]
+
+    def clear(self):
+        """清空所有条目（保留统计）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        获取缓存统计。
+        
+        Returns:
+            dict: 条目数、估算字节数、上限、命中/未命中/淘汰/过期次数和命中率
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'name': self.name,
+                'ttl': self.ttl,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# 缓存策略：
+#   name: 策略名称（用于统计）
+#   pattern: 匹配端点路径的正则
+#   ttl: 过期时间（秒），None 表示永不过期（不可变数据）
+#   max_entries: 最大条目数，超出后淘汰最久未使用的条目
+#   max_bytes: 响应体总字节数上限，None 表示只按条目数限制
+CachePolicy = namedtuple('CachePolicy', ['name', 'pattern', 'ttl', 'max_entries', 'max_bytes'], defaults=(None,))
+
+# 端点缓存策略表（按顺序匹配第一条）
+CACHE_POLICIES = [
+    # 已结束对局的详情不会再变化
+    CachePolicy(
+        'match_detail',
+        re.compile(r'^/(lol-match-history/v1/(games|matches|match|products/[^/]+/matches)|match/v1/matches)/[^/]+$'),
+        None, 200, 32 * 1024 * 1024
+    ),
+    CachePolicy('summoner_by_puuid', re.compile(r'^/lol-summoner/v1/summoners/by-puuid/[^/]+$'), 600, 500),
+    CachePolicy('summoner_by_id', re.compile(r'^/lol-summoner/v1/summoners/\d+$'), 600, 500),
+    CachePolicy('summoner_by_name', re.compile(r'^/lol-summoner/v1/summoners$'), 600, 300),
+    CachePolicy('ranked_stats', re.compile(r'^/lol-ranked/v1/ranked-stats/[^/]+$'), 300, 300),
+]
+
+
+_caches = {
+    policy.name: LRUTTLCache(policy.name, ttl=policy.ttl, max_entries=policy.max_entries, max_bytes=policy.max_bytes)
+    for policy in CACHE_POLICIES
+}
+
+
+def match_policy(endpoint):
+    """
+    查找端点对应的缓存策略。
+
+    Args:
+        endpoint: API端点路径
+
+    Returns:
+        CachePolicy: 匹配的策略，不缓存的端点返回None
+    """
+    for policy in CACHE_POLICIES:
+        if policy.pattern.match(endpoint):
+            return policy
+    return None
+
+
+def get_cached(policy, key):
+    """读取缓存的响应体（未命中或已过期返回None）"""
+    return _caches[policy.name].get(key)
+
+
+def put_cached(policy, key, content):
+    """写入响应体"""
+    _caches[policy.name].put(key, content)
+
+
+def get_cache_stats():
+    """
+    获取各策略的缓存统计。
+
+    Returns:
+        list[dict]: 每个策略的条目数、字节数、命中/未命中次数、淘汰/过期次数和命中率
+    """
+    return [{'policy': name, **cache.stats()} for name, cache in _caches.items()]
+
+
+def clear_response_cache():
+    """清空所有响应缓存（LCU 凭证变化时调用）"""
+    for cache in _caches.values():
+        cache.clear()
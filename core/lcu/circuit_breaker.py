@@ -0,0 +1,169 @@
+"""
+LCU 熔断器模块
+按端点族（如 /lol-match-history）跟踪失败情况，客户端卡顿时快速失败
+"""
+import threading
+import time
+
+# 连续失败多少次后熔断
+FAILURE_THRESHOLD = 3
+# 熔断冷却时间（秒），期间所有请求立即失败
+COOLDOWN_SECONDS = 15
+
+STATE_CLOSED = 'closed'        # 正常
+STATE_OPEN = 'open'            # 熔断中，请求立即失败
+STATE_HALF_OPEN = 'half_open'  # 冷却结束，仅放行一个探测请求
+
+
+class CircuitBreaker:
+    """
+    单个端点族的熔断器。
+
+    连续出现 FAILURE_THRESHOLD 次超时或 5xx 后进入 open 状态；
+    冷却结束后放行一个探测请求，成功则恢复，失败则重新熔断。
+    """
+
+    def __init__(self, family, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self):
+        """
+        判断是否允许发送请求。
+
+        Returns:
+            bool: 允许返回True；熔断中（或探测请求进行中）返回False
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN and time.time() - self._opened_at >= self.cooldown:
+                self._state = STATE_HALF_OPEN
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """记录一次成功（包括 4xx：说明客户端仍在响应）"""
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                print(f"✅ LCU 端点 {self.family} 已恢复，关闭熔断")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """记录一次超时或 5xx 失败"""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    print(f"⚠️ LCU 端点 {self.family} 连续失败 {self._failures} 次，熔断 {self.cooldown} 秒")
+                self._state = STATE_OPEN
+                self._opened_at = time.time()
+
+    def retry_after(self):
+        """距离下一次允许探测的剩余秒数（未熔断时为 0）"""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0
+            return max(0.0, self.cooldown - (time.time() - self._opened_at))
+
+    def snapshot(self):
+        """
+        获取熔断器当前状态。
+
+        Returns:
+            dict: {'family', 'state', 'failures', 'retry_after'}
+        """
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                'family': self.family,
+                'state': self._state,
+                'failures': self._failures,
+                'retry_after': round(retry_after, 1),
+            }
+
+
+# 熔断器注册表：{endpoint_family: CircuitBreaker}
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def endpoint_family(endpoint):
+    """
+    提取端点族（路径的第一段）。
+
+    Examples:
+        >>> endpoint_family('/lol-match-history/v1/games/123')
+        '/lol-match-history'
+    """
+    path = endpoint.split('?', 1)[0].strip('/')
+    return '/' + path.split('/', 1)[0]
+
+
+def get_breaker(endpoint):
+    """获取（必要时创建）端点所属族的熔断器"""
+    family = endpoint_family(endpoint)
+    with _breakers_lock:
+        breaker = _breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(family)
+            _breakers[family] = breaker
+        return breaker
+
+
+def get_retry_after(endpoint):
+    """
+    获取端点所属族的剩余熔断时间。
+
+    Args:
+        endpoint: 端点路径或端点族（如 '/lol-match-history'）
+
+    Returns:
+        float: 剩余秒数，未熔断时为 0
+    """
+    return get_breaker(endpoint).retry_after()
+
+
+def is_endpoint_available(endpoint):
+    """
+    判断端点当前是否可请求（未熔断）。
+
+    供路由在发起耗时请求前快速判断并返回"LCU 繁忙"响应。
+    不会占用 half-open 状态下的探测名额。
+
+    Args:
+        endpoint: 端点路径或端点族（如 '/lol-match-history'）
+
+    Returns:
+        bool: 未熔断或冷却已结束返回True
+    """
+    return get_retry_after(endpoint) <= 0
+
+
+def get_circuit_states():
+    """
+    获取所有端点族的熔断状态。
+
+    Returns:
+        list[dict]: 每个端点族的状态快照
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [b.snapshot() for b in breakers]
+
+
+def reset_circuit_breakers():
+    """清空所有熔断状态（LCU 凭证变化时调用）"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -2,43 +2,209 @@
 LCU HTTP 客户端模块
 提供统一的 LCU API 请求封装
 """
-import json
+import threading
+import time
+import contextvars
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import urllib3
+from .circuit_breaker import get_breaker
+from .json_stream import iter_array_items
+from .cache import match_policy, get_cached, put_cached
+from .metrics import record_request, latency_percentile
+from . import rate_limiter
+from .deadline import MIN_CALL_BUDGET, cap_timeout, remaining_budget
+from utils import json_codec
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 连接池大小：覆盖 enrichment 一次性 10~30 个并发/连续请求
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
 
-def make_request(method, endpoint, token, port, **kwargs):
+# 流式读取时每次读取的字节数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 对冲请求：首个请求超过该端点近期 p95 延迟仍未返回时，再发一个相同请求，先到先用
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20       # 样本不足时使用默认延迟
+HEDGE_DEFAULT_DELAY_MS = 250
+HEDGE_MIN_DELAY_MS = 20      # 延迟下限，避免对本就很快的端点加倍请求
+HEDGE_MAX_DELAY_MS = 1000
+
+# 当前凭证对应的持久会话，以及该会话所属的凭证 (token, port)
+_session = None
+_session_key = None
+_session_lock = threading.Lock()
+
+
+def _build_session(token):
     """
-    统一的 LCU API 请求封装，处理认证和 SSL 验证。
+    为指定凭证创建带连接池的 keep-alive 会话。
+    
+    Args:
+        token: 认证令牌
+    
+    Returns:
+        requests.Session: 已配置认证和 SSL 选项的会话
+    """
+    session = requests.Session()
+    # LCU 认证要求使用 HTTPBasicAuth，用户名是 'riot'
+    session.auth = HTTPBasicAuth('riot', token)
+    session.verify = False  # 忽略SSL证书错误（LCU 使用自签名证书）
+    # 不读取环境变量中的代理/CA 配置：REQUESTS_CA_BUNDLE 会覆盖 verify=False，
+    # 系统代理也不应拦截 127.0.0.1 的本地请求
+    session.trust_env = False
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(token, port):
+    """
+    获取当前凭证对应的持久 HTTPS 会话。
+    
+    会话按 (token, port) 作用域复用：凭证不变时所有 LCU 请求共享同一连接池，
+    避免每次请求都重新建立 TCP 连接和 TLS 握手；凭证变化（客户端重启）时
+    自动关闭旧会话并重建。
     
     Args:
-        method: HTTP方法 ('GET', 'POST', 'PUT', 'DELETE' 等)
-        endpoint: API端点路径（如 '/lol-summoner/v1/current-summoner'）
         token: 认证令牌
         port: LCU端口
-        **kwargs: 其他请求参数（可包含自定义timeout、params、json等）
     
     Returns:
-        dict: 响应JSON数据，失败返回None
+        requests.Session: 可直接用于 LCU 请求的会话
+    """
+    global _session, _session_key
+    key = (token, port)
+    with _session_lock:
+        if _session is None or _session_key != key:
+            if _session is not None:
+                _session.close()
+            _session = _build_session(token)
+            _session_key = key
+        return _session
+
+
+def reset_session():
+    """关闭并丢弃当前连接池（凭证失效或断开 LCU 时调用）"""
+    global _session, _session_key
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_key = None
+
+
+class LCURequestError(Exception):
+    """
+    LCU 请求失败。
     
-    Examples:
-        >>> make_request('GET', '/lol-gameflow/v1/gameflow-phase', token, port)
-        >>> make_request('POST', '/lol-matchmaking/v1/ready-check/accept', token, port)
-        >>> make_request('GET', '/lol-summoner/v1/summoners', token, port, params={'name': 'Faker'})
+    Attributes:
+        method: HTTP方法
+        endpoint: API端点路径
+        url: 完整请求URL
+        status_code: HTTP 状态码（网络异常时为 None）
+        reason: 状态说明或底层异常描述
+        is_timeout: 是否为超时
+    """
+
+    def __init__(self, method, endpoint, url, status_code=None, reason='', is_timeout=False):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.is_timeout = is_timeout
+        if status_code is not None:
+            message = f"{method} {endpoint} -> {status_code} {reason}"
+        else:
+            message = f"{method} {endpoint} -> {reason}"
+        super().__init__(message)
+
+
+class LCUCircuitOpenError(LCURequestError):
+    """端点族处于熔断状态，请求未发送即失败"""
+
+    def __init__(self, method, endpoint, url, retry_after):
+        self.retry_after = retry_after
+        super().__init__(method, endpoint, url, reason=f"LCU 繁忙（熔断中，{retry_after:.0f} 秒后重试）")
+
+
+class LCUDeadlineExceededError(LCURequestError):
+    """请求期限（见 deadline.request_deadline）已用尽，请求未发送即失败"""
+
+    def __init__(self, method, endpoint, url):
+        super().__init__(method, endpoint, url, reason="请求期限已用尽，跳过请求", is_timeout=True)
+
+
+def _apply_deadline(method, endpoint, url, kwargs):
+    """
+    按当前上下文的剩余预算收紧 timeout。
+    
+    Returns:
+        dict: timeout 已收紧的请求参数副本
+    
+    Raises:
+        LCUDeadlineExceededError: 剩余预算不足以发起请求
+    """
+    timeout = cap_timeout(kwargs.get('timeout'))
+    if timeout is None:
+        raise LCUDeadlineExceededError(method, endpoint, url)
+    return dict(kwargs, timeout=timeout)
+
+
+# 进行中的 GET 请求：{(token, port, endpoint, params): _InFlightCall}
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# 批量请求的单项结果：data 为响应数据，error 为 LCURequestError（成功时为 None）
+LCUResult = namedtuple('LCUResult', ['data', 'error'])
+
+# 批量请求默认并发数
+DEFAULT_BATCH_WORKERS = 8
+
+
+def request_json(method, endpoint, token, port, **kwargs):
+    """
+    发送 LCU API 请求并返回 JSON 数据，失败时抛出异常。
+    
+    与 make_request 参数相同；需要区分失败原因（如 404 与超时）的调用方使用此函数。
+    
+    Args:
+        method: HTTP方法
+        endpoint: API端点路径
+        token: 认证令牌
+        port: LCU端口
+        **kwargs: 其他请求参数（可包含自定义timeout、params、json等）；
+                  use_cache=False 可跳过响应缓存（强制请求最新数据）；
+                  priority 指定限流优先级（默认取当前上下文，见 rate_limiter）；
+                  hedge=True 为 GET 启用对冲请求（仅用于幂等的读请求）
+    
+    Returns:
+        dict: 响应JSON数据（204 No Content 时为 None）
+    
+    Raises:
+        LCUCircuitOpenError: 端点族处于熔断冷却期（立即失败，不等待超时）
+        LCUDeadlineExceededError: 当前请求期限已用尽（立即失败，不发送请求）
+        LCURequestError: HTTP 4xx/5xx、网络异常或响应无法解析
     """
     url = f"https://127.0.0.1:{port}{endpoint}"
-    # LCU 认证要求使用 HTTPBasicAuth，用户名是 'riot'
-    auth = HTTPBasicAuth('riot', token) 
+    # 复用凭证作用域内的连接池（认证和 SSL 选项已在会话上配置）
+    session = get_session(token, port)
+    use_cache = kwargs.pop('use_cache', True)
+    priority = kwargs.pop('priority', None)
+    hedge = kwargs.pop('hedge', False)
     
     # 🔇 减少日志噪音：仅在详细模式下打印（通过环境变量控制）
     # print(f"--- LCU Request: {method} {endpoint} ---")
     
     # 处理 JSON 数据：将 json 参数转换为 data + Content-Type
     if 'json' in kwargs:
-        kwargs['data'] = json.dumps(kwargs.pop('json'))
+        kwargs['data'] = json_codec.dumps_bytes(kwargs.pop('json'))
         kwargs['headers'] = kwargs.get('headers', {})
         kwargs['headers']['Content-Type'] = 'application/json'
 
@@ -47,36 +213,497 @@ def make_request(method, endpoint, token, port, **kwargs):
     if 'timeout' not in kwargs:
         kwargs['timeout'] = 5
 
+    if method.upper() == 'GET':
+        key = _request_key(token, port, endpoint, kwargs.get('params'))
+
+        # 按策略表缓存的端点：命中时直接解析缓存的响应体
+        policy = match_policy(endpoint) if use_cache else None
+        if policy is not None:
+            content = get_cached(policy, key)
+            if content is not None:
+                return _decode(method, endpoint, url, content)
+
+        # 路由设置了请求期限时，等待合并请求的时间同样不超过剩余预算
+        kwargs = _apply_deadline(method, endpoint, url, kwargs)
+
+        # 并发的相同 GET 请求合并为一次真实请求
+        send = _send_hedged if hedge else _send
+        response = _singleflight(key, lambda: send(session, method, endpoint, url, kwargs, priority), kwargs['timeout'])
+
+        if policy is not None and response.status_code == 200:
+            put_cached(policy, key, response.content)
+    else:
+        response = _send(session, method, endpoint, url, kwargs, priority)
+
+    if response.status_code == 204:  # No Content
+        return None
+
+    return _decode(method, endpoint, url, response.content)
+
+
+def _decode(method, endpoint, url, content):
+    """
+    解析响应体。
+    
+    缓存和合并请求只共享原始字节，每个调用方各自解析，避免共享同一个可变对象
+    （enrichment 等逻辑会就地修改返回的数据）。
+    """
     try:
-        response = requests.request(
-            method,
-            url,
-            auth=auth,
-            verify=False,  # 忽略SSL证书错误
-            **kwargs
-        )
-        
-        # 抛出 HTTPError 异常，处理 4xx/5xx 状态码
-        response.raise_for_status() 
+        return json_codec.loads(content)
+    except ValueError as e:
+        raise LCURequestError(method, endpoint, url, reason=f"无法解析响应: {e}") from e
 
-        if response.status_code == 204:  # No Content
-            return None
-        
-        return response.json()
-        
-    except requests.exceptions.HTTPError as e:
-        # 🔇 静默处理404错误（端点尝试时很常见），只记录其他错误
-        if e.response.status_code != 404:
-            # Print full URL to help diagnose path/encoding issues
-            print(f"⚠️ LCU API 错误 ({method} {endpoint}) -> URL: {url} : {e.response.status_code} {e.response.reason}")
-            
-            # 打印 403 错误的详细信息
-            if e.response.status_code == 403:
-                print("!!! 权限拒绝 (403 Forbidden) !!! 可能原因: LCU 客户端限制或当前游戏状态不允许查询。")
+
+def iter_json_array(endpoint, token, port, path, **kwargs):
+    """
+    以流式方式 GET 端点，逐个产出响应中 path 指向的数组元素。
+    
+    适用于大体量响应（如 200 场战绩）：无需把完整响应体和完整对象树同时放在内存中，
+    目标数组结束后立即停止读取。
+    
+    Args:
+        endpoint: API端点路径
+        token: 认证令牌
+        port: LCU端口
+        path: 目标数组在 JSON 中的键路径，如 ('games', 'games')
+        **kwargs: 其他请求参数（timeout、params、priority等）
+    
+    Yields:
+        数组中的每个元素
+    
+    Raises:
+        LCURequestError: 请求失败、网络中断或 JSON 格式错误
+    """
+    url = f"https://127.0.0.1:{port}{endpoint}"
+    session = get_session(token, port)
+    priority = kwargs.pop('priority', None)
+    kwargs.setdefault('timeout', 5)
+    kwargs['stream'] = True
+
+    response = _send(session, 'GET', endpoint, url, kwargs, priority)
+    try:
+        yield from iter_array_items(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), path)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        raise LCURequestError('GET', endpoint, url, reason=f"流式读取失败: {e}") from e
+    finally:
+        response.close()
+
+
+class _BreakerOutcome:
+    """
+    一次逻辑请求的熔断记录：对冲请求的多个副本只记录一个结果。
+    
+    每个参与方（请求副本或对冲协调方）登记后恰好报告一次：任一副本成功（包括 4xx）
+    立即记一次成功；所有参与方都结束、且至少一个副本超时/网络异常/5xx 时记一次失败；
+    都未发送请求时不记录。
+    """
+
+    def __init__(self, breaker):
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._failed = False
+        self._recorded = False
+
+    def join(self):
+        """登记一个参与方"""
+        with self._lock:
+            self._pending += 1
+
+    def report(self, failed):
+        """
+        报告一个参与方的结果。
         
+        Args:
+            failed: True 为失败，False 为成功，None 为未发送请求（不影响结果）
+        """
+        with self._lock:
+            self._pending -= 1
+            if self._recorded:
+                return
+            if failed is False:
+                self._recorded = True
+            else:
+                self._failed = self._failed or failed is True
+                if self._pending > 0 or not self._failed:
+                    return
+                self._recorded = True
+        if failed is False:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+
+def _send(session, method, endpoint, url, kwargs, priority=None, outcome=None):
+    """
+    通过会话发送一次真实请求，并更新端点族的熔断状态。
+    
+    发送前从限流器获取令牌（按 priority 排队，最多等待请求超时时间）。
+    路由设置了请求期限时，超时不超过剩余预算；预算已用尽则不发送。
+    
+    Args:
+        outcome: 对冲请求各副本共享的熔断记录（调用方已为本副本 join），
+                 默认每次请求单独记录
+    
+    Returns:
+        requests.Response: 状态码小于 400 的响应
+    
+    Raises:
+        LCUCircuitOpenError: 端点族熔断中，请求未发送
+        LCUDeadlineExceededError: 请求期限已用尽，请求未发送
+        LCURequestError: HTTP 4xx/5xx、网络异常或限流排队超时
+    """
+    breaker = get_breaker(endpoint)
+    if outcome is None:
+        outcome = _BreakerOutcome(breaker)
+        outcome.join()
+    failed = None  # 未发送请求时不影响熔断状态
+    try:
+        kwargs = _apply_deadline(method, endpoint, url, kwargs)
+        if breaker.retry_after() > 0:
+            raise LCUCircuitOpenError(method, endpoint, url, breaker.retry_after())
+
+        # 先排队获取令牌，再占用熔断器的探测名额（避免探测名额在排队超时后无法释放）
+        timeout = kwargs.get('timeout')
+        wait_timeout = timeout[-1] if isinstance(timeout, tuple) else timeout
+        if not rate_limiter.acquire(priority, wait_timeout):
+            raise LCURequestError(method, endpoint, url, reason='LCU 限流排队超时', is_timeout=True)
+        kwargs = _apply_deadline(method, endpoint, url, kwargs)  # 排队期间预算可能已减少
+
+        if not breaker.allow_request():
+            raise LCUCircuitOpenError(method, endpoint, url, breaker.retry_after())
+        # 已占用熔断器的名额（half-open 时为唯一的探测名额）：此后任何意外异常都记为失败，
+        # 否则熔断器会一直停留在 half-open 且探测名额无法释放
+        failed = True
+
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+            # 流式请求此时只读取了响应头，大小取 Content-Length
+            if kwargs.get('stream'):
+                nbytes = int(response.headers.get('Content-Length') or 0)
+            else:
+                nbytes = len(response.content)
+        except requests.exceptions.RequestException as e:
+            # 连接超时、连接被拒绝、读取响应体中断等网络异常
+            is_timeout = isinstance(e, requests.exceptions.Timeout)
+            record_request(method, endpoint, time.perf_counter() - started, timeout=is_timeout)
+            raise LCURequestError(method, endpoint, url, reason=str(e), is_timeout=is_timeout) from e
+        record_request(method, endpoint, time.perf_counter() - started, status=response.status_code, nbytes=nbytes)
+
+        # 5xx 视为客户端繁忙；4xx 说明客户端仍在正常响应
+        failed = response.status_code >= 500
+
+        if response.status_code >= 400:
+            raise LCURequestError(method, endpoint, url, status_code=response.status_code, reason=response.reason)
+
+        return response
+    finally:
+        outcome.report(failed)
+
+
+# 对冲请求使用的线程池（主请求和对冲请求都在其中执行，调用方只负责等待）
+_hedge_executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix='lcu-hedge')
+_hedge_stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0}
+_hedge_stats_lock = threading.Lock()
+
+
+def _hedge_delay(method, endpoint):
+    """对冲延迟（秒）：端点近期成功请求的 p95，限制在 [HEDGE_MIN_DELAY_MS, HEDGE_MAX_DELAY_MS]"""
+    p95 = latency_percentile(method, endpoint, HEDGE_QUANTILE, min_samples=HEDGE_MIN_SAMPLES)
+    if p95 is None:
+        p95 = HEDGE_DEFAULT_DELAY_MS
+    return min(max(p95, HEDGE_MIN_DELAY_MS), HEDGE_MAX_DELAY_MS) / 1000
+
+
+def _send_hedged(session, method, endpoint, url, kwargs, priority=None):
+    """
+    发送带对冲的请求：主请求在对冲延迟内未返回时，再发送一个相同的请求，
+    返回最先成功的响应。
+    
+    4xx 是确定的结果（如改名后的玩家返回 404），任一副本收到后立即抛出；
+    只有超时、网络异常和 5xx 才继续等待另一个副本，两个都失败时抛出最后一个异常。
+    两个副本共享一次熔断记录，一次慢请求不会被计为两次失败。
+    
+    Returns / Raises: 同 _send
+    """
+    delay = _hedge_delay(method, endpoint)
+    outcome = _BreakerOutcome(get_breaker(endpoint))
+    # 协调方也登记为参与方：决定是否发出对冲前，主请求的失败不会单独记录
+    outcome.join()
+    outcome.join()
+    primary = _hedge_executor.submit(contextvars.copy_context().run, _send, session, method, endpoint, url, kwargs, priority, outcome)
+    with _hedge_stats_lock:
+        _hedge_stats['requests'] += 1
+
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        outcome.report(None)
+        return primary.result()
+
+    outcome.join()
+    hedge = _hedge_executor.submit(contextvars.copy_context().run, _send, session, method, endpoint, url, kwargs, priority, outcome)
+    outcome.report(None)
+    with _hedge_stats_lock:
+        _hedge_stats['hedged'] += 1
+
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                if future is hedge:
+                    with _hedge_stats_lock:
+                        _hedge_stats['hedge_wins'] += 1
+                return future.result()
+            status_code = getattr(error, 'status_code', None)
+            if status_code is not None and 400 <= status_code < 500:
+                raise error
+    raise error
+
+
+def get_hedge_stats():
+    """
+    获取对冲请求统计。
+    
+    Returns:
+        dict: requests（启用对冲的真实请求数）、hedged（实际发出对冲的次数）、
+              hedge_wins（对冲请求先返回的次数）
+    """
+    with _hedge_stats_lock:
+        return dict(_hedge_stats)
+
+
+class _InFlightCall:
+    """一次进行中的请求：首个调用方执行，其余调用方等待同一结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        # 首个调用方的截止时间（time.monotonic()），None 表示不限制
+        self.deadline = None
+
+
+def _request_key(token, port, endpoint, params):
+    """生成请求键（凭证 + 端点 + 规范化后的查询参数），用于请求合并和响应缓存"""
+    if isinstance(params, dict):
+        params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+    elif params is not None:
+        params = str(params)
+    return (token, port, endpoint, params)
+
+
+def _current_deadline():
+    """当前上下文的截止时间（time.monotonic()），未设置期限时返回None"""
+    remaining = remaining_budget()
+    return None if remaining is None else time.monotonic() + remaining
+
+
+def _is_leader_budget_error(call, error):
+    """
+    判断首个调用方的失败是否源于它自己的请求期限（不应共享给等待方）。
+    
+    期限用尽直接失败；超时则仅当首个调用方的期限早于当前调用方时才视为期限所致
+    （首个调用方的超时被收紧得更短，当前调用方自己请求可能成功）。
+    """
+    if isinstance(error, LCUDeadlineExceededError):
+        return True
+    if not getattr(error, 'is_timeout', False) or call.deadline is None:
+        return False
+    own_deadline = _current_deadline()
+    return own_deadline is None or own_deadline > call.deadline
+
+
+def _singleflight(key, fetch, timeout):
+    """
+    合并相同键的并发请求：只有首个调用方真正发送请求，
+    其余调用方等待并获得同一响应或同一异常。
+    
+    除 GET 请求外，也用于合并不经过 request_json 的整体拉取（如战绩的流式查询）。
+    
+    首个调用方因自己的请求期限失败（期限用尽或被收紧的超时）时不共享该异常，
+    等待方改为自己发起请求；等待方的等待时间同样不超过自己的剩余预算。
+    
+    Args:
+        key: 请求合并键（第三项为端点，用于错误信息）
+        fetch: 执行真实请求的函数
+        timeout: 等待方的最长等待时间（秒），与请求超时一致
+    
+    Returns:
+        fetch 的返回值（GET 请求为共享的 requests.Response）
+    """
+    wait_timeout = timeout[-1] if isinstance(timeout, tuple) else timeout
+    wait_until = None if wait_timeout is None else time.monotonic() + wait_timeout
+    while True:
+        with _inflight_lock:
+            call = _inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                call.deadline = _current_deadline()
+                _inflight[key] = call
+
+        if is_leader:
+            break
+
+        remaining = None if wait_until is None else wait_until - time.monotonic()
+        budget = remaining_budget()
+        budget_capped = budget is not None and (remaining is None or budget < remaining)
+        if budget_capped:
+            if budget < MIN_CALL_BUDGET:
+                raise LCUDeadlineExceededError('GET', key[2], '')
+            remaining = budget
+        if not call.done.wait(remaining):
+            if budget_capped:
+                raise LCUDeadlineExceededError('GET', key[2], '')
+            raise LCURequestError('GET', key[2], '', reason='等待合并请求超时', is_timeout=True)
+        if call.error is None:
+            return call.response
+        if not _is_leader_budget_error(call, call.error):
+            raise call.error
+        # 首个调用方的期限不足，由当前调用方重新发起（或加入新的合并请求）
+
+    try:
+        call.response = fetch()
+        return call.response
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            if _inflight.get(key) is call:
+                del _inflight[key]
+        call.done.set()
+
+
+def reset_inflight():
+    """
+    丢弃所有进行中请求的合并记录（凭证变化时调用）。
+    
+    已在等待的调用方仍会收到原请求的结果；之后的请求不会再合并到旧请求上。
+    """
+    with _inflight_lock:
+        _inflight.clear()
+
+
+def get_inflight_count():
+    """返回当前进行中（已合并）的请求数量"""
+    with _inflight_lock:
+        return len(_inflight)
+
+
+def make_request(method, endpoint, token, port, **kwargs):
+    """
+    统一的 LCU API 请求封装，处理认证和 SSL 验证。
+    
+    Args:
+        method: HTTP方法 ('GET', 'POST', 'PUT', 'DELETE' 等)
+        endpoint: API端点路径（如 '/lol-summoner/v1/current-summoner'）
+        token: 认证令牌
+        port: LCU端口
+        **kwargs: 其他请求参数（可包含自定义timeout、params、json等）
+    
+    Returns:
+        dict: 响应JSON数据，失败返回None
+    
+    Examples:
+        >>> make_request('GET', '/lol-gameflow/v1/gameflow-phase', token, port)
+        >>> make_request('POST', '/lol-matchmaking/v1/ready-check/accept', token, port)
+        >>> make_request('GET', '/lol-summoner/v1/summoners', token, port, params={'name': 'Faker'})
+        >>> make_request('GET', f'/lol-match-history/v1/games/{game_id}', token, port, hedge=True)
+    """
+    try:
+        return request_json(method, endpoint, token, port, **kwargs)
+    except LCURequestError as e:
+        _log_request_error(e)
         return None
-        
-    except requests.exceptions.RequestException as e:
+
+
+def _log_request_error(error):
+    """打印请求错误（静默处理 404，端点尝试时很常见）"""
+    if isinstance(error, (LCUCircuitOpenError, LCUDeadlineExceededError)):
+        # 熔断开启时已打印过一次，不再为每个被拒绝的请求刷屏；
+        # 期限用尽时剩余的调用都会被跳过，同样不逐个打印
+        return
+
+    if error.status_code is None:
         # 处理其他请求异常（如连接超时、DNS 错误）
-        print(f"⚠️ LCU API 请求异常 ({method} {endpoint}) -> URL: {url} : {e}")
-        return None
+        print(f"⚠️ LCU API 请求异常 ({error.method} {error.endpoint}) -> URL: {error.url} : {error.reason}")
+        return
+
+    if error.status_code != 404:
+        # Print full URL to help diagnose path/encoding issues
+        print(f"⚠️ LCU API 错误 ({error.method} {error.endpoint}) -> URL: {error.url} : {error.status_code} {error.reason}")
+        
+        # 打印 403 错误的详细信息
+        if error.status_code == 403:
+            print("!!! 权限拒绝 (403 Forbidden) !!! 可能原因: LCU 客户端限制或当前游戏状态不允许查询。")
+
+
+def map_concurrent(func, items, max_workers=DEFAULT_BATCH_WORKERS):
+    """
+    在有界线程池中对每个元素并发执行 func，按输入顺序返回结果。
+    
+    单个元素失败不会影响其他元素：异常被收集到对应结果的 error 字段中。
+    工作线程继承调用方的 contextvars 上下文。
+    
+    Args:
+        func: 单参数函数
+        items: 输入列表
+        max_workers: 最大并发数
+    
+    Returns:
+        list[LCUResult]: 与 items 顺序一致的结果列表
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _run(item):
+        try:
+            return LCUResult(func(item), None)
+        except Exception as e:
+            return LCUResult(None, e)
+
+    workers = max(1, min(max_workers, len(items)))
+    if workers == 1:
+        return [_run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lcu-batch') as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _run, item) for item in items]
+        return [f.result() for f in futures]
+
+
+def make_requests_many(requests_list, token, port, max_workers=DEFAULT_BATCH_WORKERS, **kwargs):
+    """
+    并发发送一组 LCU API 请求。
+    
+    Args:
+        requests_list: 请求列表，每项为 (method, endpoint) 或 (method, endpoint, params)
+        token: 认证令牌
+        port: LCU端口
+        max_workers: 最大并发数
+        **kwargs: 所有请求共用的其他参数（如 timeout）
+    
+    Returns:
+        list[LCUResult]: 与输入顺序一致的结果；成功项 error 为 None，
+                         失败项 data 为 None、error 为 LCURequestError
+    
+    Examples:
+        >>> results = make_requests_many([
+        ...     ('GET', f'/lol-summoner/v1/summoners/by-puuid/{p}') for p in puuids
+        ... ], token, port)
+        >>> summoners = [r.data for r in results if r.error is None]
+    """
+    def _send(item):
+        method, endpoint, *rest = item
+        params = rest[0] if rest else None
+        request_kwargs = dict(kwargs)
+        if params:
+            request_kwargs['params'] = params
+        return request_json(method, endpoint, token, port, **request_kwargs)
+
+    return map_concurrent(_send, requests_list, max_workers=max_workers)
@@ -2,11 +2,247 @@
 LCU 凭证检测和提取模块
 负责从日志文件和进程中获取 LCU 认证信息
 """
+import contextlib
+import mmap
 import os
 import re
+import threading
 import chardet
 import psutil
-from constants import LOG_DIR
+from constants import CLIENT_ROOT_PATH, LOG_DIR
+from utils import json_codec
+from .client import request_json, LCURequestError
+
+# LCU 客户端进程名
+CLIENT_PROCESS_NAME = "LeagueClientUx.exe"
+# 客户端安装目录下的 lockfile：LeagueClient:<pid>:<port>:<password>:<protocol>
+LOCKFILE_NAME = "lockfile"
+
+# 凭证参数的字节级正则：参数名和值都是 ASCII，在 GBK/UTF-8 等编码下字节相同，无需先检测编码
+_TOKEN_BYTES_RE = re.compile(rb"--remoting-auth-token=([\w-]+)")
+_PORT_BYTES_RE = re.compile(rb"--app-port=(\d+)")
+
+# 无法内存映射时按块读取：块大小和相邻块的重叠长度（覆盖跨块的匹配）
+SCAN_CHUNK_SIZE = 1024 * 1024
+SCAN_CHUNK_OVERLAP = 256
+
+# 日志目录扫描缓存：目录修改时间不变（没有新建/删除文件）时直接复用上次找到的最新日志
+_latest_log_cache = {'dir_mtime': None, 'path': None}
+_latest_log_lock = threading.Lock()
+
+# 上次找到的客户端进程 PID：再次检测时只需确认该进程仍存活，无需遍历所有进程
+_client_pid = None
+
+# 上次可用的凭证保存位置：启动时先用一次轻量请求验证，客户端未重启时无需重新检测
+SAVED_CREDENTIALS_FILE = os.path.join(os.path.expanduser('~'), '.lol_helper', 'lcu_credentials.json')
+# 验证保存的凭证时的请求超时（秒）：客户端在本机，正常响应只需几毫秒
+VALIDATE_TIMEOUT = 2
+
+
+def parse_cmdline_credentials(cmdline):
+    """
+    从客户端进程的命令行参数中解析凭证。
+    
+    Args:
+        cmdline: 参数列表（psutil.Process.cmdline()）或完整命令行字符串
+    
+    Returns:
+        tuple: (token, port)，未找到的项为None
+    
+    Examples:
+        >>> parse_cmdline_credentials(['LeagueClientUx.exe', '--remoting-auth-token=abc', '--app-port=5000'])
+        ('abc', 5000)
+    """
+    if not isinstance(cmdline, str):
+        cmdline = ' '.join(cmdline or ())
+    token_match = re.search(r"--remoting-auth-token=([\w-]+)", cmdline)
+    port_match = re.search(r"--app-port=(\d+)", cmdline)
+    return (
+        token_match.group(1) if token_match else None,
+        int(port_match.group(1)) if port_match else None,
+    )
+
+
+def parse_lockfile(content):
+    """
+    解析 lockfile 内容。
+    
+    Args:
+        content: lockfile 文本，格式为 'LeagueClient:<pid>:<port>:<password>:<protocol>'
+    
+    Returns:
+        tuple: (token, port)，格式不正确时返回 (None, None)
+    
+    Examples:
+        >>> parse_lockfile('LeagueClient:12345:54321:s3cr3t:https')
+        ('s3cr3t', 54321)
+    """
+    parts = content.strip().split(':')
+    if len(parts) < 5 or not parts[2].isdigit() or not parts[3]:
+        return None, None
+    return parts[3], int(parts[2])
+
+
+def read_lockfile(install_dir):
+    """
+    读取安装目录下的 lockfile。
+    
+    Args:
+        install_dir: 客户端安装目录
+    
+    Returns:
+        tuple: (token, port)，文件不存在或格式不正确时返回 (None, None)
+    """
+    try:
+        with open(os.path.join(install_dir, LOCKFILE_NAME), 'r', encoding='utf-8', errors='replace') as f:
+            return parse_lockfile(f.read())
+    except OSError:
+        return None, None
+
+
+def load_saved_credentials(path=SAVED_CREDENTIALS_FILE):
+    """
+    读取上次保存的凭证。
+    
+    Returns:
+        tuple: (token, port)，文件不存在或内容无效时返回 (None, None)
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = json_codec.loads(f.read())
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(data, dict):
+        return None, None
+    token, port = data.get('auth_token'), data.get('app_port')
+    if not isinstance(token, str) or not token or not isinstance(port, int):
+        return None, None
+    return token, port
+
+
+def save_credentials(token, port, path=SAVED_CREDENTIALS_FILE):
+    """
+    保存可用的凭证（先写临时文件再替换，避免留下写了一半的文件）。
+    
+    token 可直接控制客户端，文件创建时即限制为仅当前用户可读写（0o600）。
+    
+    Returns:
+        bool: 保存成功返回True
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # 残留的临时文件可能是旧版本以默认权限创建的，O_CREAT 不会修改已有文件的权限
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json_codec.dumps_bytes({'auth_token': token, 'app_port': port}))
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"⚠️ 保存 LCU 凭证失败: {e}")
+        return False
+
+
+def clear_saved_credentials(path=SAVED_CREDENTIALS_FILE):
+    """删除保存的凭证（凭证已失效时调用，避免过期的 token 留在磁盘上）"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ 删除保存的 LCU 凭证失败: {e}")
+
+
+def validate_credentials(token, port, timeout=VALIDATE_TIMEOUT):
+    """
+    用一次轻量请求（当前召唤师）验证凭证是否可用。
+    
+    客户端已重启时旧端口无人监听（连接立即被拒绝）或旧 token 被拒绝（401），
+    验证都会很快失败。
+    
+    Returns:
+        bool: 凭证可用返回True
+    """
+    try:
+        request_json("GET", "/lol-summoner/v1/current-summoner", token, port, timeout=timeout, use_cache=False)
+        return True
+    except LCURequestError:
+        return False
+
+
+def find_client_process(process_name=CLIENT_PROCESS_NAME):
+    """
+    查找客户端进程。
+    
+    优先检查上次缓存的 PID 是否仍是存活的客户端进程，失败时才遍历所有进程。
+    
+    Args:
+        process_name: 进程名
+    
+    Returns:
+        psutil.Process: 客户端进程，未运行返回None
+    """
+    global _client_pid
+    if _client_pid is not None:
+        try:
+            proc = psutil.Process(_client_pid)
+            if proc.is_running() and proc.name() == process_name:
+                return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        _client_pid = None
+
+    for proc in psutil.process_iter(['name']):
+        if proc.info['name'] == process_name:
+            _client_pid = proc.pid
+            return proc
+    return None
+
+
+def get_credentials_from_process(proc):
+    """
+    直接从客户端进程获取凭证（无需读取日志）。
+    
+    先读取进程命令行；无权限读取或命令行中没有凭证时，
+    在 --install-directory 参数、进程所在目录和客户端安装根目录
+    （CLIENT_ROOT_PATH 及 LOG_DIR 的上级目录）中查找 lockfile。
+    
+    Args:
+        proc: psutil.Process（或提供 cmdline()/exe() 的同类对象）
+    
+    Returns:
+        tuple: (token, port) 或 (None, None)
+    """
+    cmdline = []
+    try:
+        cmdline = proc.cmdline()
+        token, port = parse_cmdline_credentials(cmdline)
+        if token and port:
+            return token, port
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        pass
+
+    install_dirs = [
+        arg.split('=', 1)[1] for arg in cmdline
+        if arg.startswith('--install-directory=')
+    ]
+    try:
+        install_dirs.append(os.path.dirname(proc.exe()))
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        pass
+    # lockfile 位于安装根目录，而不是日志目录
+    if CLIENT_ROOT_PATH:
+        install_dirs.append(CLIENT_ROOT_PATH)
+    if LOG_DIR:
+        install_dirs.append(os.path.dirname(os.path.normpath(LOG_DIR)))
+
+    for install_dir in dict.fromkeys(install_dirs):
+        token, port = read_lockfile(install_dir)
+        if token and port:
+            return token, port
+    return None, None
 
 
 def is_league_client_running(status_bar):
@@ -19,15 +255,11 @@ def is_league_client_running(status_bar):
     Returns:
         bool: 进程是否运行
     """
-    client_process_name = "LeagueClientUx.exe" 
-    
-    # 遍历所有正在运行的进程
-    for proc in psutil.process_iter(['name']):
-        if proc.info['name'] == client_process_name:
-            status_bar.showMessage(f"✅ 检测到进程: {client_process_name} 正在运行。")
-            return True
+    if find_client_process() is not None:
+        status_bar.showMessage(f"✅ 检测到进程: {CLIENT_PROCESS_NAME} 正在运行。")
+        return True
             
-    status_bar.showMessage(f"❌ 未检测到进程: {client_process_name}。请先启动客户端。")
+    status_bar.showMessage(f"❌ 未检测到进程: {CLIENT_PROCESS_NAME}。请先启动客户端。")
     return False
 
 
@@ -66,17 +298,31 @@ def get_latest_log_file(status_bar):
         if not os.path.exists(LOG_DIR):
             status_bar.showMessage(f"错误：日志目录未找到: {LOG_DIR}。请检查 LOG_DIR 变量。")
             return None
-            
-        full_log_files = []
-        for f in os.listdir(LOG_DIR):
-            if f.endswith("_LeagueClientUx.log") and "T" in f:
-                full_log_files.append(os.path.join(LOG_DIR, f))
-        
-        if not full_log_files:
-            status_bar.showMessage(f"未在目录 {LOG_DIR} 中找到符合条件的日志文件。")
-            return None
-        
-        latest_file = max(full_log_files, key=os.path.getmtime)
+
+        dir_mtime = os.stat(LOG_DIR).st_mtime
+        with _latest_log_lock:
+            cached_path = _latest_log_cache['path'] if _latest_log_cache['dir_mtime'] == dir_mtime else None
+
+        if cached_path and os.path.exists(cached_path):
+            latest_file = cached_path
+        else:
+            # scandir 的目录项自带 stat 信息（Windows 上无需逐个文件再次 stat）
+            latest_file = None
+            latest_mtime = None
+            with os.scandir(LOG_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith("_LeagueClientUx.log") and "T" in entry.name:
+                        mtime = entry.stat().st_mtime
+                        if latest_mtime is None or mtime > latest_mtime:
+                            latest_file, latest_mtime = entry.path, mtime
+
+            if latest_file is None:
+                status_bar.showMessage(f"未在目录 {LOG_DIR} 中找到符合条件的日志文件。")
+                return None
+
+            with _latest_log_lock:
+                _latest_log_cache['dir_mtime'] = dir_mtime
+                _latest_log_cache['path'] = latest_file
         
         if os.path.getsize(latest_file) < 500:
             status_bar.showMessage(f"警告：最新日志文件 ({os.path.basename(latest_file)}) 太小，可能为空或正在写入。")
@@ -92,10 +338,59 @@ def get_latest_log_file(status_bar):
         return None
 
 
+def _scan_log_bytes(log_file):
+    """
+    在日志文件的原始字节中查找凭证参数，找到后立即停止。
+    
+    优先内存映射文件（不把整个文件读入内存）；无法映射时按块读取。
+    
+    Args:
+        log_file: 日志文件路径
+    
+    Returns:
+        tuple: (token, port)，未找到的项为None
+    """
+    with open(log_file, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                token_match = _TOKEN_BYTES_RE.search(mm)
+                port_match = _PORT_BYTES_RE.search(mm)
+                return (
+                    token_match.group(1).decode('ascii') if token_match else None,
+                    int(port_match.group(1)) if port_match else None,
+                )
+        except (ValueError, OSError):
+            # 空文件或不支持映射，回退为按块读取
+            f.seek(0)
+
+        token = port = None
+        tail = b''
+        while token is None or port is None:
+            chunk = f.read(SCAN_CHUNK_SIZE)
+            at_eof = len(chunk) < SCAN_CHUNK_SIZE
+            data = tail + chunk
+            # 匹配恰好结束于块末尾时值可能被截断，除非已到文件末尾，否则留到下一块再确认
+            if token is None:
+                token_match = _TOKEN_BYTES_RE.search(data)
+                if token_match and (at_eof or token_match.end() < len(data)):
+                    token = token_match.group(1).decode('ascii')
+            if port is None:
+                port_match = _PORT_BYTES_RE.search(data)
+                if port_match and (at_eof or port_match.end() < len(data)):
+                    port = int(port_match.group(1))
+            if at_eof:
+                break
+            tail = data[-SCAN_CHUNK_OVERLAP:]
+        return token, port
+
+
 def extract_params_from_log(log_file, status_bar):
     """
     从日志文件中提取认证令牌和端口号。
     
+    先在原始字节中查找（无需检测编码，找到即停止读取）；
+    仅当字节级查找失败时（如 UTF-16 编码的日志）才检测编码并按文本查找。
+    
     Args:
         log_file: 日志文件路径
         status_bar: 状态栏对象
@@ -104,6 +399,11 @@ def extract_params_from_log(log_file, status_bar):
         tuple: (token, port) 或 (None, None)
     """
     try:
+        token, port = _scan_log_bytes(log_file)
+        if token and port:
+            status_bar.showMessage(f"成功提取参数：Token={token[:8]}..., Port={port}")
+            return token, port
+
         encoding = detect_file_encoding(log_file, status_bar)
         status_bar.showMessage(f"检测到文件编码: {encoding}")
         
@@ -135,8 +435,10 @@ def autodetect_credentials(status_bar):
     自动检测LCU凭证的入口函数。
     
     流程:
+    0. 上次保存的凭证仍可用时直接返回（一次请求，无需扫描进程和日志）
     1. 检查 LeagueClientUx.exe 进程是否运行
-    2. 如果进程运行，则尝试从最新日志中提取凭证
+    2. 如果进程运行，直接从进程命令行或 lockfile 读取凭证
+    3. 失败时回退为从最新日志中提取凭证
     
     Args:
         status_bar: 状态栏对象
@@ -144,14 +446,29 @@ def autodetect_credentials(status_bar):
     Returns:
         tuple: (auth_token, app_port) 或 (None, None)
     """
+    # 步骤 0: 验证上次保存的凭证
+    auth_token, app_port = load_saved_credentials()
+    if auth_token and app_port:
+        if validate_credentials(auth_token, app_port):
+            status_bar.showMessage(f"✅ 上次保存的凭证仍然有效：Port={app_port}")
+            return auth_token, app_port
+        clear_saved_credentials()
+
     status_bar.showMessage("正在尝试自动检测 LCU 凭证 (进程+日志)...")
     
     # 步骤 1: 检查进程
     if not is_league_client_running(status_bar):
         status_bar.showMessage("⚠️ 进程检测失败。无法连接 LCU。")
         return None, None
+
+    # 步骤 2: 快速路径，直接读取进程命令行或 lockfile（进程已缓存，无需再次遍历）
+    proc = find_client_process()
+    auth_token, app_port = get_credentials_from_process(proc) if proc else (None, None)
+    if auth_token and app_port:
+        status_bar.showMessage(f"✅ 已从客户端进程获取凭证：Token={auth_token[:8]}..., Port={app_port}")
+        return auth_token, app_port
         
-    # 进程运行，继续读取日志
+    # 步骤 3: 回退为读取日志
     log_file = get_latest_log_file(status_bar)
     
     if log_file:
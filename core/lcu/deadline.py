@@ -0,0 +1,89 @@
+"""
+请求期限模块
+路由为一次请求设置总耗时预算，预算随 contextvars 传递到所有 LCU 调用
+"""
+import contextlib
+import contextvars
+import functools
+import time
+
+# 剩余预算低于该值时不再发起新请求（秒）
+MIN_CALL_BUDGET = 0.05
+
+# 当前上下文的截止时间（time.monotonic()），None 表示不限制
+_deadline = contextvars.ContextVar('lcu_deadline', default=None)
+
+
+@contextlib.contextmanager
+def request_deadline(seconds):
+    """
+    在 with 块内限制所有 LCU 调用的总耗时。
+
+    嵌套使用时取更早的截止时间。工作线程（map_concurrent、对冲请求）
+    会继承调用方的截止时间。
+
+    Args:
+        seconds: 总耗时预算（秒）
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    reset_token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(reset_token)
+
+
+def with_deadline(seconds):
+    """
+    路由装饰器：为整个请求处理设置 LCU 调用的总耗时预算。
+
+    Examples:
+        >>> @api_bp.route('/get_match')
+        ... @with_deadline(20)
+        ... def get_match():
+        ...     ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with request_deadline(seconds):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def remaining_budget():
+    """
+    获取当前上下文的剩余预算。
+
+    Returns:
+        float: 剩余秒数（可能为负数），未设置期限时返回None
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def cap_timeout(timeout):
+    """
+    按剩余预算收紧请求超时。
+
+    Args:
+        timeout: 原超时（秒数或 (connect, read) 元组）
+
+    Returns:
+        收紧后的超时；未设置期限时原样返回。剩余预算不足 MIN_CALL_BUDGET 时返回None，
+        表示不应再发起请求
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining < MIN_CALL_BUDGET:
+        return None
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
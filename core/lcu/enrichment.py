@@ -2,7 +2,15 @@
 数据增强模块
 为游戏数据填充缺失的召唤师信息
 """
-from .summoner import get_summoner_by_puuid, get_summoner_by_id, get_summoner_by_name
+from .client import map_concurrent
+from .rate_limiter import request_priority, PRIORITY_BACKGROUND
+from .summoner import (
+    get_summoner_by_puuid,
+    get_summoner_by_id,
+    get_summoner_by_name,
+    get_summoners_by_puuids,
+    get_summoners_by_ids
+)
 from constants import get_augment_icon_url, get_augment_info
 
 
@@ -42,40 +50,29 @@ def enrich_game_with_summoner_info(token, port, game):
         if pid is not None:
             idents[pid] = player
     
-    # 遍历每个参与者，填充缺失信息
+    # 先补全可读名称（不需要请求），再并发查询所有参与者的召唤师信息
     for p in participants:
-        try:
-            # 如果已有可读的 summonerName，跳过
-            # Ensure summonerName exists if riotId fields are present
-            if not p.get('summonerName'):
-                # prefer Riot game name + tagline if available
-                game_name = p.get('riotIdGameName') or p.get('riotId') or None
-                tag_line = p.get('riotIdTagline') or p.get('riotTagLine') or ''
-                if game_name:
-                    p['summonerName'] = f"{game_name}#{tag_line}" if tag_line else game_name
-
-            if p.get('summonerName'):
-                # already have a readable name — but we may still try to fill profileIcon below
-                pass
-
-            info = None
-            
-            # 方法1: 尝试通过 puuid 查询
-            puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
-            if puuid:
-                info = get_summoner_by_puuid(token, port, puuid)
+        if not isinstance(p, dict):
+            continue
+        # Ensure summonerName exists if riotId fields are present
+        if not p.get('summonerName'):
+            # prefer Riot game name + tagline if available
+            game_name = p.get('riotIdGameName') or p.get('riotId') or None
+            tag_line = p.get('riotIdTagline') or p.get('riotTagLine') or ''
+            if game_name:
+                p['summonerName'] = f"{game_name}#{tag_line}" if tag_line else game_name
 
-            # 方法2: 尝试通过 summonerId 查询
-            if not info:
-                sid = p.get('summonerId') or (p.get('player') or {}).get('summonerId')
-                if sid:
-                    info = get_summoner_by_id(token, port, sid)
+    # 补全属于后台请求，让路给前端的交互请求
+    with request_priority(PRIORITY_BACKGROUND):
+        _prefetch_participant_summoners(token, port, participants)
+        lookups = map_concurrent(lambda p: _lookup_participant_summoner(token, port, p), participants)
 
-            # 方法3: 尝试通过 name 查询
-            if not info:
-                name = p.get('summonerName') or (p.get('player') or {}).get('summonerName')
-                if name:
-                    info = get_summoner_by_name(token, port, name)
+    # 遍历每个参与者，填充缺失信息
+    for p, lookup in zip(participants, lookups):
+        try:
+            if lookup.error is not None:
+                raise lookup.error
+            info = lookup.data
 
             # 如果查询成功，填充数据
             if info and isinstance(info, dict):
@@ -119,6 +116,65 @@ def enrich_game_with_summoner_info(token, port, game):
     return game
 
 
+def _prefetch_participant_summoners(token, port, participants):
+    """
+    批量查询所有参与者的召唤师信息并写入缓存，之后的逐个查询直接命中缓存。
+    
+    有 puuid 的参与者按 puuid 批量查询，其余有 summonerId 的按 summonerId 批量查询。
+    """
+    puuids = []
+    summoner_ids = []
+    for p in participants:
+        if not isinstance(p, dict):
+            continue
+        player = p.get('player') or {}
+        puuid = p.get('puuid') or player.get('puuid')
+        if puuid:
+            puuids.append(puuid)
+            continue
+        sid = p.get('summonerId') or player.get('summonerId')
+        if sid:
+            summoner_ids.append(sid)
+    if puuids:
+        get_summoners_by_puuids(token, port, puuids)
+    if summoner_ids:
+        get_summoners_by_ids(token, port, summoner_ids)
+
+
+def _lookup_participant_summoner(token, port, p):
+    """
+    依次通过 puuid、summonerId、summonerName 查询单个参与者的召唤师信息。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        p: 参与者数据（dict）
+    
+    Returns:
+        dict: 召唤师信息，全部失败返回None
+    """
+    info = None
+    
+    # 方法1: 尝试通过 puuid 查询
+    puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
+    if puuid:
+        info = get_summoner_by_puuid(token, port, puuid)
+
+    # 方法2: 尝试通过 summonerId 查询
+    if not info:
+        sid = p.get('summonerId') or (p.get('player') or {}).get('summonerId')
+        if sid:
+            info = get_summoner_by_id(token, port, sid)
+
+    # 方法3: 尝试通过 name 查询
+    if not info:
+        name = p.get('summonerName') or (p.get('player') or {}).get('summonerName')
+        if name:
+            info = get_summoner_by_name(token, port, name)
+
+    return info
+
+
 def enrich_tft_game_with_summoner_info(token, port, game):
     """
     为 TFT 游戏数据填充召唤师信息
@@ -143,22 +199,29 @@ def enrich_tft_game_with_summoner_info(token, port, game):
     
     participants = game_json.get('participants') or []
     
-    # 遍历每个参与者，填充缺失信息
+    # 如果没有 summonerName，先尝试从 riotId 字段构造一个可读名称
     for p in participants:
-        try:
-            # 如果没有 summonerName，先尝试从 riotId 字段构造一个可读名称
-            if not p.get('summonerName'):
-                rn = p.get('riotIdGameName') or p.get('riotId') or None
-                rt = p.get('riotIdTagline') or p.get('riotTagLine') or ''
-                if rn:
-                    p['summonerName'] = f"{rn}#{rt}" if rt else rn
+        if isinstance(p, dict) and not p.get('summonerName'):
+            rn = p.get('riotIdGameName') or p.get('riotId') or None
+            rt = p.get('riotIdTagline') or p.get('riotTagLine') or ''
+            if rn:
+                p['summonerName'] = f"{rn}#{rt}" if rt else rn
+
+    # 方法1: 并发通过 puuid 查询以获取更完整的召唤师信息（头像等）
+    def _lookup(p):
+        puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
+        return get_summoner_by_puuid(token, port, puuid) if puuid else None
 
-            info = None
+    with request_priority(PRIORITY_BACKGROUND):
+        _prefetch_participant_summoners(token, port, participants)
+        lookups = map_concurrent(_lookup, participants)
 
-            # 方法1: 尝试通过 puuid 查询以获取更完整的召唤师信息（头像等）
-            puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
-            if puuid:
-                info = get_summoner_by_puuid(token, port, puuid)
+    # 遍历每个参与者，填充缺失信息
+    for p, lookup in zip(participants, lookups):
+        try:
+            if lookup.error is not None:
+                raise lookup.error
+            info = lookup.data
 
             # 如果查询成功，填充数据（包括头像）
             if info and isinstance(info, dict):
@@ -0,0 +1,361 @@
+"""
+LCU 事件推送模块
+通过客户端本地 WebSocket（WAMP 协议）订阅状态变化事件，替代轮询
+"""
+import base64
+import ssl
+import threading
+from collections import namedtuple
+
+import simple_websocket
+
+from utils import json_codec
+
+# WAMP 消息类型
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
+
+# 事件对应的资源路径（订阅者按路径接收事件）
+URI_GAMEFLOW_PHASE = '/lol-gameflow/v1/gameflow-phase'
+URI_READY_CHECK = '/lol-matchmaking/v1/ready-check'
+URI_CHAMP_SELECT_SESSION = '/lol-champ-select/v1/session'
+URI_END_OF_GAME = '/lol-end-of-game/v1/eog-stats-block'
+
+# 默认订阅的 WAMP 主题（OnJsonApiEvent_ + 路径去掉开头的 / 并将 / 替换为 _）
+DEFAULT_TOPICS = tuple(
+    'OnJsonApiEvent' + uri.replace('/', '_')
+    for uri in (URI_GAMEFLOW_PHASE, URI_READY_CHECK, URI_CHAMP_SELECT_SESSION, URI_END_OF_GAME)
+)
+
+# 断线后重连的等待时间（秒）
+RECONNECT_DELAY = 2.0
+# 接收循环检查停止标志的间隔（秒）
+RECEIVE_POLL_INTERVAL = 1.0
+
+# 单个事件：
+#   uri: 资源路径（如 '/lol-gameflow/v1/gameflow-phase'）
+#   event_type: 'Create' / 'Update' / 'Delete'
+#   data: 资源的最新数据
+#   topic: WAMP 主题
+LCUEvent = namedtuple('LCUEvent', ['uri', 'event_type', 'data', 'topic'])
+
+# 订阅者：{uri: [callback]}，'*' 接收所有事件
+# 与连接无关，客户端重连或凭证变化后订阅依然有效
+_subscribers = {}
+_subscribers_lock = threading.Lock()
+
+
+def subscribe_event(uri, callback):
+    """
+    订阅指定资源路径的事件。
+
+    回调在事件接收线程中执行，应尽快返回（耗时操作交给其他线程）。
+
+    Args:
+        uri: 资源路径（如 URI_GAMEFLOW_PHASE），'*' 表示所有事件
+        callback: 接收 LCUEvent 的函数
+
+    Returns:
+        callable: 调用后取消订阅
+    """
+    with _subscribers_lock:
+        _subscribers.setdefault(uri, []).append(callback)
+    return lambda: unsubscribe_event(uri, callback)
+
+
+def unsubscribe_event(uri, callback):
+    """取消订阅"""
+    with _subscribers_lock:
+        callbacks = _subscribers.get(uri, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+
+def dispatch_event(event):
+    """将事件分发给订阅了该路径（以及 '*'）的回调"""
+    with _subscribers_lock:
+        callbacks = list(_subscribers.get(event.uri, ())) + list(_subscribers.get('*', ()))
+    for callback in callbacks:
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"⚠️ LCU 事件回调异常 ({event.uri}): {e}")
+
+
+def parse_event_message(message):
+    """
+    解析一条 WAMP 消息。
+
+    Args:
+        message: WebSocket 文本消息，如 '[8, "OnJsonApiEvent_...", {"uri": ..., "eventType": ..., "data": ...}]'
+
+    Returns:
+        LCUEvent: 事件消息返回事件，其他消息（或无法解析）返回None
+    """
+    try:
+        payload = json_codec.loads(message)
+    except ValueError:
+        return None
+    if not (isinstance(payload, list) and len(payload) >= 3 and payload[0] == WAMP_EVENT):
+        return None
+    body = payload[2]
+    if not isinstance(body, dict):
+        return None
+    return LCUEvent(body.get('uri'), body.get('eventType'), body.get('data'), payload[1])
+
+
+class _DaemonThread(threading.Thread):
+    """WebSocket 接收线程不应阻止进程退出"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.daemon = True
+
+
+def _default_ssl_context():
+    """LCU 使用自签名证书，不校验证书和主机名"""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class LCUEventClient:
+    """
+    LCU WebSocket 事件客户端。
+
+    在后台线程中连接、订阅主题并接收事件，断线后自动重连。
+
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        topics: 订阅的 WAMP 主题
+        url: WebSocket 地址（默认 wss://127.0.0.1:{port}/，测试时可指向本地替身服务器）
+        ssl_context: TLS 配置（默认不校验自签名证书）
+        on_event: 事件处理函数（默认分发给 subscribe_event 注册的订阅者）
+        fetch: 读取资源当前数据的函数 uri -> data（资源不存在时抛出 404 的 LCURequestError），
+               用于每次（重新）连接后为 EventWatcher 补齐断线期间错过的变化；默认通过 LCU HTTP 接口读取
+    """
+
+    def __init__(self, token, port, topics=DEFAULT_TOPICS, url=None, ssl_context=None, on_event=None, fetch=None):
+        self.token = token
+        self.port = port
+        self.topics = tuple(topics)
+        self.url = url or f"wss://127.0.0.1:{port}/"
+        self.ssl_context = ssl_context
+        self.on_event = on_event or dispatch_event
+        self.fetch = fetch or self._fetch_resource
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread = None
+        self._ws = None
+
+    @property
+    def connected(self):
+        """是否已连接并完成订阅"""
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout=None):
+        """等待连接建立，超时返回False"""
+        return self._connected.wait(timeout)
+
+    def start(self):
+        """启动后台接收线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='lcu-events', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """停止接收并关闭连接"""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _connect(self):
+        auth = base64.b64encode(f"riot:{self.token}".encode()).decode('ascii')
+        ssl_context = self.ssl_context
+        if ssl_context is None and self.url.startswith('wss://'):
+            ssl_context = _default_ssl_context()
+        ws = simple_websocket.Client.connect(
+            self.url,
+            subprotocols=['wamp'],
+            headers={'Authorization': f'Basic {auth}'},
+            ssl_context=ssl_context,
+            thread_class=_DaemonThread,
+        )
+        for topic in self.topics:
+            ws.send(json_codec.dumps([WAMP_SUBSCRIBE, topic]))
+        return ws
+
+    def _fetch_resource(self, uri):
+        # 延迟导入：client 模块较重，且事件模块本身不依赖 HTTP 客户端
+        from .client import request_json
+        return request_json('GET', uri, self.token, self.port, use_cache=False)
+
+    def _seed_watchers(self):
+        """
+        订阅完成后读取所有被 EventWatcher 跟踪的资源的当前数据，并以事件形式分发。
+        
+        断线期间的变化不会补发，不读取的话 EventWatcher 会一直停留在重置后的 None
+        （或错过断线期间进入的 ReadyCheck）。
+        """
+        from .client import LCURequestError
+        for uri in sorted({watcher.uri for watcher in _live_watchers()}):
+            try:
+                data = self.fetch(uri)
+            except LCURequestError as e:
+                if e.status_code == 404:
+                    # 资源不存在（如不在选人阶段时的选人会话）
+                    self.on_event(LCUEvent(uri, 'Delete', None, None))
+                continue
+            except Exception as e:
+                print(f"⚠️ 读取 {uri} 的当前数据失败: {e}")
+                continue
+            self.on_event(LCUEvent(uri, 'Update', data, None))
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._ws = self._connect()
+            except Exception as e:
+                print(f"⚠️ LCU 事件连接失败: {e}，{RECONNECT_DELAY:.0f} 秒后重试")
+                self._stop.wait(RECONNECT_DELAY)
+                continue
+
+            try:
+                # 先补齐断线期间的状态，再标记为已连接（之后的事件按顺序覆盖补齐的数据）
+                self._seed_watchers()
+                self._connected.set()
+                print(f"🔔 LCU 事件推送已连接 (订阅 {len(self.topics)} 个主题)")
+                while not self._stop.is_set():
+                    message = self._ws.receive(timeout=RECEIVE_POLL_INTERVAL)
+                    if message is None:
+                        continue
+                    event = parse_event_message(message)
+                    if event is not None:
+                        self.on_event(event)
+            except simple_websocket.ConnectionClosed:
+                if not self._stop.is_set():
+                    print("⚠️ LCU 事件推送连接断开，准备重连")
+            finally:
+                self._connected.clear()
+                if not self._stop.is_set():
+                    # 意外断线：断线期间收不到事件，已记录的数据不再可信；等待中的线程被唤醒后回退为轮询
+                    # （主动停止时由 start_event_stream/stop_event_stream 负责重置）
+                    _reset_watchers()
+                try:
+                    self._ws.close()
+                except Exception:
+                    pass
+                self._ws = None
+            self._stop.wait(RECONNECT_DELAY)
+
+
+class EventWatcher:
+    """
+    跟踪某个资源的最新数据，并允许线程等待其变化。
+
+    Examples:
+        >>> phase = EventWatcher(URI_GAMEFLOW_PHASE)
+        >>> if phase.wait_for_change(timeout=10):
+        ...     print(phase.value)
+    """
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.value = None
+        self._changed = threading.Event()
+        self._unsubscribe = subscribe_event(uri, self._on_event)
+        with _watchers_lock:
+            _watchers.add(self)
+
+    def _on_event(self, event):
+        self.value = None if event.event_type == 'Delete' else event.data
+        self._changed.set()
+
+    def wait_for_change(self, timeout=None):
+        """
+        等待下一次事件。
+
+        Returns:
+            bool: 收到事件返回True，超时返回False
+        """
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def reset(self):
+        """丢弃已记录的数据（连接切换后旧数据不再可信），并唤醒等待的线程"""
+        self.value = None
+        self._changed.set()
+
+    def close(self):
+        """取消订阅（不再使用的 EventWatcher 必须调用，否则会一直保留在订阅表中）"""
+        self._unsubscribe()
+        with _watchers_lock:
+            _watchers.discard(self)
+
+
+# 所有未关闭的 EventWatcher，事件连接切换时统一重置。
+# 订阅表持有 _on_event 的强引用，EventWatcher 只有在 close() 后才会释放
+_watchers = set()
+_watchers_lock = threading.Lock()
+
+
+def _live_watchers():
+    with _watchers_lock:
+        return list(_watchers)
+
+
+def _reset_watchers():
+    for watcher in _live_watchers():
+        watcher.reset()
+
+
+# 当前凭证对应的全局事件客户端
+_client = None
+_client_lock = threading.Lock()
+
+
+def start_event_stream(token, port):
+    """
+    为当前凭证启动全局事件客户端（凭证变化时替换旧连接）。
+
+    Returns:
+        LCUEventClient: 正在运行的客户端
+    """
+    global _client
+    with _client_lock:
+        if _client is not None and (_client.token, _client.port) == (token, port):
+            _client.start()
+            return _client
+        if _client is not None:
+            _client.stop(timeout=0)
+        _reset_watchers()
+        _client = LCUEventClient(token, port)
+        _client.start()
+        return _client
+
+
+def stop_event_stream():
+    """停止全局事件客户端（断开 LCU 时调用）"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.stop(timeout=0)
+            _reset_watchers()
+        _client = None
+
+
+def is_event_stream_connected():
+    """全局事件客户端是否已连接（未连接时调用方应回退到轮询）"""
+    client = _client
+    return client is not None and client.connected
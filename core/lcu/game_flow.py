@@ -3,6 +3,7 @@
 处理游戏阶段、准备检查、选人等功能
 """
 from .client import make_request
+from .rate_limiter import PRIORITY_CRITICAL
 
 
 def get_gameflow_phase(token, port):
@@ -32,6 +33,8 @@ def accept_ready_check(token, port):
     """
     接受排队准备检查。
     
+    以 PRIORITY_CRITICAL 发送，不受限流排队影响（准备检查只有约 10 秒）。
+    
     Args:
         token: LCU认证令牌
         port: LCU端口
@@ -39,7 +42,7 @@ def accept_ready_check(token, port):
     Returns:
         dict: 响应数据
     """
-    return make_request("POST", "/lol-matchmaking/v1/ready-check/accept", token, port)
+    return make_request("POST", "/lol-matchmaking/v1/ready-check/accept", token, port, priority=PRIORITY_CRITICAL)
 
 
 def get_champ_select_session(token, port):
@@ -0,0 +1,138 @@
+"""
+流式 JSON 解析模块
+在不完整读取整个响应的情况下，逐个解析 JSON 中指定数组的元素
+"""
+import codecs
+import json
+
+_WHITESPACE = ' \t\r\n'
+
+
+class _ChunkBuffer:
+    """按需从字节块迭代器中读取文本的缓冲区"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        读取下一批数据（同时丢弃已消费的部分）。
+
+        Returns:
+            bool: 读取到新数据返回True，数据已读完返回False
+        """
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self.text = self.text[self.pos:] + self._decoder.decode(chunk)
+                self.pos = 0
+                return True
+        self.text = self.text[self.pos:] + self._decoder.decode(b'', final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self):
+        """跳过空白并返回下一个字符（数据结束时返回空字符串）"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        """消费指定字符，不匹配时抛出 ValueError"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON 格式错误：期望 '{char}'，实际为 '{found or 'EOF'}' (位置 {self.pos})")
+        self.pos += 1
+
+    def decode_value(self, decoder):
+        """
+        解析下一个完整的 JSON 值。
+
+        数据不完整时自动读取更多数据后重试；值恰好结束于缓冲区末尾时
+        （如被截断的数字）也会先读取更多数据以确认其完整。
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_array_items(chunks, path):
+    """
+    从 JSON 字节流中逐个产出 path 指向的数组元素。
+
+    只会完整解析目标数组的元素；路径上其他键的值会被跳过，
+    目标数组结束后立即停止读取。
+
+    Args:
+        chunks: 字节块迭代器（如 response.iter_content()）
+        path: 由对象键组成的路径，如 ('games', 'games')；
+              中途遇到数组时提前停止（兼容 {'games': [...]} 结构）
+
+    Yields:
+        目标数组中的每个元素
+
+    Raises:
+        ValueError: JSON 格式错误或数据不完整
+
+    Examples:
+        >>> list(iter_array_items([b'{"games": {"games": [1, 2]}}'], ('games', 'games')))
+        [1, 2]
+    """
+    decoder = json.JSONDecoder()
+    buf = _ChunkBuffer(chunks)
+
+    # 沿路径逐层进入对象，找到目标数组的起始位置
+    # 若路径中途遇到的值已经是数组，则直接将其作为目标数组
+    if buf.peek() != '{':
+        raise ValueError("JSON 格式错误：顶层不是对象")
+    for target_key in path:
+        char = buf.peek()
+        if char == '[':
+            break
+        if char != '{':
+            return  # 目标不是数组
+        buf.pos += 1
+        while True:
+            if buf.peek() == '}':
+                return  # 路径不存在
+            key = buf.decode_value(decoder)
+            buf.expect(':')
+            if key == target_key:
+                break
+            buf.decode_value(decoder)  # 跳过无关键的值
+            if buf.peek() == ',':
+                buf.pos += 1
+
+    if buf.peek() != '[':
+        return  # 目标不是数组
+    buf.pos += 1
+
+    # 逐个解析数组元素
+    while True:
+        char = buf.peek()
+        if char == ']':
+            return
+        if char == ',':
+            buf.pos += 1
+            continue
+        if not char:
+            raise ValueError("JSON 数据不完整：数组未结束")
+        yield buf.decode_value(decoder)
@@ -0,0 +1,46 @@
+"""
+LCU 会话生命周期模块
+客户端重启（凭证变化）或断开时，统一清理所有与旧会话绑定的状态
+"""
+from .cache import clear_response_cache
+from .circuit_breaker import reset_circuit_breakers
+from .client import reset_inflight, reset_session
+from .events import start_event_stream, stop_event_stream
+from .match_history import clear_match_history_cache, reset_learned_endpoints
+from .summoner import clear_summoner_cache
+
+
+def reset_lcu_state():
+    """
+    清空会话作用域的状态：连接池、进行中的合并请求、熔断状态、
+    响应缓存、召唤师身份缓存、战绩缓存和已记住的对局详情端点。
+    """
+    reset_session()
+    reset_inflight()
+    reset_circuit_breakers()
+    clear_response_cache()
+    clear_summoner_cache()
+    clear_match_history_cache()
+    reset_learned_endpoints()
+
+
+def switch_credentials(token, port):
+    """
+    切换到新的 LCU 凭证（token 为 None 表示断开）。
+    
+    清空旧会话的状态；有新凭证时预先建立连接池并连接事件推送，
+    否则停止事件推送。
+    
+    Args:
+        token: 新的认证令牌，None 表示客户端已关闭
+        port: 新的端口
+    """
+    reset_lcu_state()
+    if token and port:
+        # 预先为新凭证建立连接池，后续请求直接复用
+        from .client import get_session
+        get_session(token, port)
+        # 订阅客户端事件推送（游戏阶段、准备检查、选人、结算），后台服务据此替代轮询
+        start_event_stream(token, port)
+    else:
+        stop_event_stream()
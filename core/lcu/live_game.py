@@ -6,6 +6,10 @@
 import requests
 import urllib3
 
+from utils import json_codec
+
+from .client import map_concurrent
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
@@ -31,8 +35,8 @@ def get_live_game_data():
         url = "https://127.0.0.1:2999/liveclientdata/allgamedata"
         response = requests.get(url, verify=False, timeout=5)
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return json_codec.loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"获取游戏内数据失败（可能游戏未开始）: {e}")
         return None
 
@@ -171,12 +175,18 @@ def get_all_players_from_game(token, port):
         teammate_list = []
         enemy_list = []
         
-        for player in all_players:
+        # 并发查询所有玩家的PUUID（单个玩家超时不会阻塞其他玩家）
+        puuid_lookups = map_concurrent(
+            lambda player: get_puuid(token, port, player.get('summonerName', '未知')),
+            all_players
+        )
+        
+        for player, lookup in zip(all_players, puuid_lookups):
             summoner_name = player.get('summonerName', '未知')
             player_team = player.get('team', '')
             
             # 获取PUUID
-            puuid = get_puuid(token, port, summoner_name)
+            puuid = lookup.data
             
             # 解析游戏名和标签
             if '#' in summoner_name:
@@ -256,12 +266,17 @@ def get_enemy_stats(token, port):
     
     enemy_stats = []
     
-    for player in enemy_players:
+    # 步骤1: 并发获取所有敌方玩家的PUUID（前端可以用来查询战绩）
+    puuid_lookups = map_concurrent(
+        lambda player: get_puuid(token, port, player.get('summonerName', '未知')),
+        enemy_players
+    )
+    
+    for player, lookup in zip(enemy_players, puuid_lookups):
         summoner_name = player.get('summonerName', '未知')
         print(f"正在查询敌方玩家: {summoner_name}")
         
-        # 步骤1: 获取PUUID（前端可以用来查询战绩）
-        puuid = get_puuid(token, port, summoner_name)
+        puuid = lookup.data
         if not puuid:
             print(f"  ⚠️ 无法获取 {summoner_name} 的PUUID")
             enemy_stats.append({
@@ -2,36 +2,35 @@
 战绩查询 API
 处理比赛历史记录和对局详情查询
 """
-from .client import make_request
-import time
-import base64
-import requests
+from .cache import LRUTTLCache, json_size
+from .client import make_request, request_json, iter_json_array, LCURequestError, _singleflight
+from .retry import DEFAULT_RETRY_POLICY
 from urllib.parse import quote_plus
 
-# 简单的内存缓存：{puuid: (timestamp, data)}
-_match_history_cache = {}
+# 战绩缓存：{cache_key: data}，cache_key 见 get_match_history / get_tft_match_history
 CACHE_TTL = 300  # 缓存5分钟
-MAX_CACHE_SIZE = 100  # 最大缓存100个玩家
+MAX_CACHE_SIZE = 100  # 最大缓存100条
+# 最大缓存字节数（按 JSON 编码长度估算）：完整模式 200 场战绩可达数 MB，只限条目数不足以约束内存
+# 切片与完整列表共享对象，按各自编码长度计算会偏大，淘汰偏保守
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+_match_history_cache = LRUTTLCache(
+    'match_history', ttl=CACHE_TTL, max_entries=MAX_CACHE_SIZE,
+    max_bytes=MAX_CACHE_BYTES, sizeof=json_size
+)
 
+# 摘要模式下每场保留的字段（战绩卡片只需要这些）
+SUMMARY_GAME_FIELDS = (
+    'gameId', 'matchId', 'gameMode', 'queueId',
+    'gameCreation', 'gameDuration', 'participantIdentities'
+)
+SUMMARY_PARTICIPANT_FIELDS = ('participantId', 'puuid', 'championId', 'teamId', 'win')
+SUMMARY_STAT_FIELDS = (
+    'win', 'kills', 'deaths', 'assists', 'goldEarned',
+    'totalMinionsKilled', 'neutralMinionsKilled', 'champLevel'
+)
 
-def _clean_cache():
-    """清理过期缓存和超出容量的缓存"""
-    global _match_history_cache
-    current_time = time.time()
-    
-    # 删除过期缓存
-    expired_keys = [k for k, (t, _) in _match_history_cache.items() if current_time - t > CACHE_TTL]
-    for k in expired_keys:
-        del _match_history_cache[k]
-    
-    # 如果缓存过大，删除最旧的条目
-    if len(_match_history_cache) > MAX_CACHE_SIZE:
-        sorted_items = sorted(_match_history_cache.items(), key=lambda x: x[1][0])
-        for k, _ in sorted_items[:len(_match_history_cache) - MAX_CACHE_SIZE]:
-            del _match_history_cache[k]
 
-
-def get_match_history(token, port, puuid, count=20, begin_index=0):
+def get_match_history(token, port, puuid, count=20, begin_index=0, summary_only=False):
     """
     通过 PUUID 获取比赛历史记录。
     
@@ -41,36 +40,38 @@ def get_match_history(token, port, puuid, count=20, begin_index=0):
         puuid: 玩家PUUID
         count: 查询数量 (默认20场)
         begin_index: 起始索引 (默认0，用于分页)
+        summary_only: 仅需要战绩卡片摘要时为True，此时流式解析响应，
+                      每场只保留摘要所需字段（见 SUMMARY_GAME_FIELDS）
     
     Returns:
         dict: 战绩数据，包含 games 列表（已切片）
     
     Notes:
         - LCU API 不支持真正的分页参数，我们会一次性请求大量数据并缓存
-        - 首次请求会获取最多200场，缓存10分钟
+        - 首次请求会获取最多200场，缓存5分钟
         - 后续分页请求会从缓存中切片
+        - 摘要模式与完整模式分别缓存；摘要模式也可直接使用完整数据缓存
     """
-    # 定期清理缓存
-    _clean_cache()
-    
     # 检查是否有完整数据的缓存
     full_cache_key = f"{puuid}_full"
-    sliced_cache_key = f"{puuid}_{begin_index}_{count}"
+    summary_cache_key = f"{puuid}_summary"
+    sliced_cache_key = f"{puuid}_{begin_index}_{count}" + ("_summary" if summary_only else "")
     
     # 先检查切片后的缓存
-    if sliced_cache_key in _match_history_cache:
-        cached_time, cached_data = _match_history_cache[sliced_cache_key]
-        if time.time() - cached_time < CACHE_TTL:
-            print(f"✅ 使用切片缓存 (begin={begin_index}, count={count})")
-            return cached_data
+    cached_data = _match_history_cache.get(sliced_cache_key)
+    if cached_data is not None:
+        print(f"✅ 使用切片缓存 (begin={begin_index}, count={count})")
+        return cached_data
     
-    # 检查完整数据缓存
+    # 检查完整数据缓存（摘要模式下完整数据同样可用）
     all_games = None
-    if full_cache_key in _match_history_cache:
-        cached_time, cached_games = _match_history_cache[full_cache_key]
-        if time.time() - cached_time < CACHE_TTL:
+    cache_keys = [full_cache_key, summary_cache_key] if summary_only else [full_cache_key]
+    for cache_key in cache_keys:
+        cached_games = _match_history_cache.get(cache_key)
+        if cached_games is not None:
             print(f"✅ 使用完整数据缓存 (共 {len(cached_games)} 场)")
             all_games = cached_games
+            break
     
     # 如果没有缓存，请求完整数据
     if all_games is None:
@@ -80,44 +81,45 @@ def get_match_history(token, port, puuid, count=20, begin_index=0):
         max_games = 200
         timeout = 25  # 最大超时
         
-        print(f"📊 首次请求，获取最多 {max_games} 场历史记录...")
-        
-        # 尝试查询，支持重试
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                params = {'endIndex': max_games}
-                
-                result = make_request(
-                    "GET",
-                    endpoint,
-                    token,
-                    port,
-                    params=params,
-                    timeout=timeout
-                )
-                
-                if result:
-                    # 提取游戏列表
-                    games_data = result.get('games', {})
-                    if isinstance(games_data, dict):
-                        all_games = games_data.get('games', [])
-                    else:
-                        all_games = games_data if isinstance(games_data, list) else []
-                    
-                    print(f"✅ API返回 {len(all_games)} 场历史记录")
-                    
-                    # 缓存完整数据
-                    _match_history_cache[full_cache_key] = (time.time(), all_games)
-                    break
-                    
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"⚠️ 查询失败，1秒后重试... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(1)
-                else:
-                    print(f"❌ 查询最终失败 (PUUID={puuid[:8]}...): {e}")
-                    return None
+        # 可重试的错误（超时、503 等）按统一策略退避重试
+        def _fetch():
+            if summary_only:
+                # 流式解析：逐场读取并裁剪，不保留完整响应
+                return list(iter_match_history_games(
+                    token, port, puuid, max_games=max_games, timeout=timeout, summary_only=True
+                ))
+            result = request_json("GET", endpoint, token, port, params={'endIndex': max_games}, timeout=timeout)
+            # 提取游戏列表
+            games_data = (result or {}).get('games', {})
+            if isinstance(games_data, dict):
+                return games_data.get('games', [])
+            return games_data if isinstance(games_data, list) else []
+
+        def _load():
+            # 排队期间上一个请求可能已写入缓存
+            for cache_key in cache_keys:
+                cached_games = _match_history_cache.get(cache_key)
+                if cached_games is not None:
+                    return cached_games
+            print(f"📊 首次请求，获取最多 {max_games} 场历史记录...")
+            games = DEFAULT_RETRY_POLICY.call(_fetch)
+            if summary_only:
+                print(f"✅ API返回 {len(games)} 场历史记录 (摘要模式)")
+                _match_history_cache.put(summary_cache_key, games)
+            else:
+                print(f"✅ API返回 {len(games)} 场历史记录")
+                # 缓存完整数据
+                _match_history_cache.put(full_cache_key, games)
+            return games
+
+        # 同一玩家的并发查询（如对局结束后多人同时打开战绩）共享一次拉取，
+        # 摘要模式的流式请求不经过 request_json 的请求合并，这里按缓存键合并
+        flight_key = (token, port, endpoint, summary_cache_key if summary_only else full_cache_key)
+        try:
+            all_games = _singleflight(flight_key, _load, DEFAULT_RETRY_POLICY.budget)
+        except LCURequestError as e:
+            print(f"❌ 查询最终失败 (PUUID={puuid[:8]}...): {e}")
+            return None
     
     # 如果还是没有数据，返回None
     if all_games is None:
@@ -140,18 +142,83 @@ def get_match_history(token, port, puuid, count=20, begin_index=0):
     }
     
     # 缓存切片后的结果
-    _match_history_cache[sliced_cache_key] = (time.time(), sliced_result)
+    _match_history_cache.put(sliced_cache_key, sliced_result)
     print(f"✅ 返回 {len(sliced_games)} 场比赛")
     
     return sliced_result
 
 
+def iter_match_history_games(token, port, puuid, max_games=200, timeout=25, summary_only=True):
+    """
+    流式读取 LOL 战绩，逐场产出游戏数据。
+    
+    响应按 games.games 数组逐个元素解码，不会一次性构建完整对象树。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        puuid: 玩家PUUID
+        max_games: 最多读取的场数
+        timeout: 请求超时（秒）
+        summary_only: 为True时每场只保留摘要字段
+    
+    Yields:
+        dict: 单场游戏数据
+    
+    Raises:
+        LCURequestError: 请求失败或响应格式错误
+    """
+    endpoint = f"/lol-match-history/v1/products/lol/{puuid}/matches"
+    games = iter_json_array(
+        endpoint, token, port, ('games', 'games'),
+        params={'endIndex': max_games}, timeout=timeout
+    )
+    for game in games:
+        yield _slim_game(game) if summary_only else game
+
+
+def _slim_game(game):
+    """
+    裁剪单场游戏数据，只保留战绩卡片摘要（_process_single_lol_game）所需字段。
+    
+    Args:
+        game: 完整游戏数据
+    
+    Returns:
+        dict: 裁剪后的游戏数据
+    """
+    if not isinstance(game, dict):
+        return game
+
+    slim = {k: game[k] for k in SUMMARY_GAME_FIELDS if k in game}
+
+    participants = []
+    for p in game.get('participants') or []:
+        if not isinstance(p, dict):
+            continue
+        slim_p = {k: p[k] for k in SUMMARY_PARTICIPANT_FIELDS if k in p}
+        stats = p.get('stats')
+        if isinstance(stats, dict):
+            slim_p['stats'] = {k: stats[k] for k in SUMMARY_STAT_FIELDS if k in stats}
+        participants.append(slim_p)
+    slim['participants'] = participants
+
+    teams = game.get('teams')
+    if isinstance(teams, list):
+        slim['teams'] = [
+            {'teamId': t.get('teamId'), 'win': t.get('win')}
+            for t in teams if isinstance(t, dict)
+        ]
+
+    return slim
+
+
 def get_tft_match_history(token, port, puuid, count=20):
     """
     通过 PUUID 获取 TFT (TFT product) 的比赛历史记录。
 
-    使用直接 HTTPS 请求 + Basic Auth（与 runs/fetch_tft_history.py 相同的方式），
-    避免高级 HTTP 客户端的参数处理差异或兼容性问题。
+    使用预先拼接好查询字符串的端点请求（与 runs/fetch_tft_history.py 相同的 URL），
+    避免 params 参数编码差异；请求经由 request_json，共享连接池、熔断和指标统计。
 
     Args:
         token: LCU认证令牌
@@ -163,60 +230,36 @@ def get_tft_match_history(token, port, puuid, count=20):
         dict: 标准化的战绩数据 {'games': {'games': [...]}}，失败返回None
     """
     # reuse cache mechanism but use a distinct cache key
-    _clean_cache()
     cache_key = f"tft_{puuid}_{count}"
-    if cache_key in _match_history_cache:
-        cached_time, cached_data = _match_history_cache[cache_key]
-        if time.time() - cached_time < CACHE_TTL:
-            print(f"✅ 使用缓存数据 (TFT PUUID={puuid[:8]}..., count={count})")
-            return cached_data
+    cached_data = _match_history_cache.get(cache_key)
+    if cached_data is not None:
+        print(f"✅ 使用缓存数据 (TFT PUUID={puuid[:8]}..., count={count})")
+        return cached_data
 
     timeout = 8 + (count // 20) * 2
     timeout = min(timeout, 25)
 
     print(f"📊 查询 TFT {count} 场战绩，预计timeout={timeout}秒")
 
-    # 直接使用 HTTPS 请求 + Basic Auth（与 runs/fetch_tft_history.py 相同）
-    # 这避免了 make_request 和 HTTPBasicAuth 可能的参数处理差异
-    url = f"https://127.0.0.1:{port}/lol-match-history/v1/products/tft/{quote_plus(puuid)}/matches?begin=0&count={count}"
-    auth_header = base64.b64encode(f"riot:{token}".encode('ascii')).decode('ascii')
-    headers = {'Authorization': f'Basic {auth_header}'}
+    # 直接拼接查询字符串（与 runs/fetch_tft_history.py 相同），避免 params 编码差异
+    endpoint = f"/lol-match-history/v1/products/tft/{quote_plus(puuid)}/matches?begin=0&count={count}"
 
-    print(f"🔎 TFT 直接请求: {url}")
+    print(f"🔎 TFT 直接请求: {endpoint}")
 
-    max_retries = 2
-    for attempt in range(max_retries):
-        try:
-            resp = requests.get(url, headers=headers, verify=False, timeout=timeout)
-            print(f"📡 TFT 请求响应: {resp.status_code}")
-
-            if resp.status_code == 200:
-                data = resp.json()
-                # 规范化响应：确保返回 {'games': {'games': [...]}}
-                normalized = _normalize_tft_response(data)
-                _match_history_cache[cache_key] = (time.time(), normalized)
-                
-                games_count = _get_games_count(normalized)
-                print(f"✅ TFT 查询成功 (PUUID={puuid[:8]}..., {games_count} 场比赛)")
-                return normalized
-            else:
-                print(f"⚠️ TFT 请求失败: {resp.status_code}")
-                if attempt < max_retries - 1:
-                    print(f"⏳ {timeout}秒后重试... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(1)
-                else:
-                    print(f"❌ TFT 查询最终失败")
-                    return None
-        except Exception as e:
-            print(f"⚠️ TFT 请求异常: {e}")
-            if attempt < max_retries - 1:
-                print(f"⏳ {timeout}秒后重试... (attempt {attempt + 1}/{max_retries})")
-                time.sleep(1)
-            else:
-                print(f"❌ TFT 查询异常失败")
-                return None
+    try:
+        data = DEFAULT_RETRY_POLICY.call(request_json, "GET", endpoint, token, port, timeout=timeout)
+    except LCURequestError as e:
+        print(f"❌ TFT 查询最终失败: {e.status_code or e.reason}")
+        return None
+    print("📡 TFT 请求响应: 200")
 
-    return None
+    # 规范化响应：确保返回 {'games': {'games': [...]}}
+    normalized = _normalize_tft_response(data)
+    _match_history_cache.put(cache_key, normalized)
+
+    games_count = _get_games_count(normalized)
+    print(f"✅ TFT 查询成功 (PUUID={puuid[:8]}..., {games_count} 场比赛)")
+    return normalized
 
 
 def _normalize_tft_response(data):
@@ -260,42 +303,72 @@ def _get_games_count(normalized):
     return 0
 
 
-def get_match_by_id(token, port, match_id):
+# get_match_by_id 的候选端点模板
+# 🚀 性能优化：根据日志统计，将最常用的端点放在第一位
+# 经验表明 /lol-match-history/v1/games/{match_id} 是最常成功的端点
+MATCH_DETAIL_ENDPOINTS = (
+    "/lol-match-history/v1/games/{match_id}",  # ✅ 最常用，优先尝试
+    "/lol-match-history/v1/matches/{match_id}",
+    "/lol-match-history/v1/products/lol/matches/{match_id}",
+    "/lol-match-history/v1/match/{match_id}",
+    "/match/v1/matches/{match_id}",
+)
+
+# 已验证可用的端点：{(port, kind): 候选端点模板}
+# 以端口区分客户端会话，客户端重启（端口变化）后自动重新探测
+_learned_match_endpoints = LRUTTLCache('match_endpoints', ttl=None, max_entries=16)
+
+
+def get_match_by_id(token, port, match_id, is_tft=False):
     """
     通过 match_id 获取完整对局详情。
     
-    尝试多个可能的 LCU 端点，返回第一个成功的响应。
-    不同版本的 LCU 或打包服务器可能使用不同的路径。
+    不同版本的 LCU 或打包服务器可能使用不同的路径。首次查询时按顺序尝试
+    MATCH_DETAIL_ENDPOINTS，记住当前客户端会话中第一个成功的端点；
+    之后直接请求该端点，仅在其失败时才重新完整探测。
     
     Args:
         token: LCU认证令牌
         port: LCU端口
         match_id: 对局ID
+        is_tft: 是否为 TFT 对局（LOL 和 TFT 分别记忆可用端点）
     
     Returns:
         dict: 对局完整数据，失败返回None
     """
-    # 🚀 性能优化：根据日志统计，将最常用的端点放在第一位
-    # 经验表明 /lol-match-history/v1/games/{match_id} 是最常成功的端点
-    candidates = [
-        f"/lol-match-history/v1/games/{match_id}",  # ✅ 最常用，优先尝试
-        f"/lol-match-history/v1/matches/{match_id}",
-        f"/lol-match-history/v1/products/lol/matches/{match_id}",
-        f"/lol-match-history/v1/match/{match_id}",
-        f"/match/v1/matches/{match_id}",
-    ]
-
-    for ep in candidates:
-        try:
-            # 🔇 仅在失败时打印日志，减少控制台噪音
-            res = make_request("GET", ep, token, port, timeout=3)  # 单次请求超时3秒
-            if res:
-                print(f"✅ 获取对局成功 (match_id={match_id})")
-                return res
-        except Exception as e:
-            # 静默失败，继续尝试下一个端点
+    kind = 'tft' if is_tft else 'lol'
+    learned = _learned_match_endpoints.get((port, kind))
+
+    if learned:
+        res = make_request("GET", learned.format(match_id=match_id), token, port, timeout=3, hedge=True)
+        if res:
+            return res
+
+    for template in MATCH_DETAIL_ENDPOINTS:
+        if template == learned:
             continue
+        # 🔇 仅在失败时打印日志，减少控制台噪音
+        res = make_request("GET", template.format(match_id=match_id), token, port, timeout=3)  # 单次请求超时3秒
+        if res:
+            _learned_match_endpoints.put((port, kind), template)
+            print(f"✅ 获取对局成功 (match_id={match_id})，记住可用端点 {template}")
+            return res
 
     # 如果都失败，打印日志供调试
     print(f"❌ 无法通过任何已知 LCU 端点获取 match_id={match_id}")
     return None
+
+
+def reset_learned_endpoints():
+    """清空已记住的对局详情端点（LCU 凭证变化时调用）"""
+    _learned_match_endpoints.clear()
+
+
+def clear_match_history_cache():
+    """清空战绩缓存（LCU 凭证变化时调用）"""
+    _match_history_cache.clear()
+
+
+def get_match_history_cache_stats():
+    """获取战绩缓存的统计"""
+    return _match_history_cache.stats()
@@ -0,0 +1,190 @@
+"""
+LCU 请求指标模块
+按端点模板记录每次真实请求的耗时、状态码、响应大小和超时，支持滚动窗口查询
+"""
+import math
+import re
+import threading
+import time
+from collections import deque, namedtuple
+
+# 每个端点模板保留的最近样本数
+MAX_SAMPLES_PER_TEMPLATE = 2048
+# 默认查询窗口（秒）
+DEFAULT_WINDOW = 300
+# 延迟直方图分桶上界（毫秒），最后一个桶为 +inf
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_NUMERIC_RE = re.compile(r'^\d+$')
+_MATCH_ID_RE = re.compile(r'^[A-Za-z0-9]+_\d+$')  # 如 HN1_1234567890
+
+# 单次请求样本：时间戳、耗时（毫秒）、状态码（网络异常为 None）、响应字节数、是否超时
+Sample = namedtuple('Sample', ['ts', 'latency_ms', 'status', 'nbytes', 'timeout'])
+
+_samples = {}  # {template: deque[Sample]}
+_totals = {}   # {template: 累计请求数}
+_lock = threading.Lock()
+
+
+def endpoint_template(endpoint):
+    """
+    将端点路径归一化为模板（去掉查询参数，ID 类路径段替换为占位符）。
+
+    Examples:
+        >>> endpoint_template('/lol-summoner/v1/summoners/by-puuid/0a1b2c3d-0000-1111-2222-333344445555')
+        '/lol-summoner/v1/summoners/by-puuid/{puuid}'
+        >>> endpoint_template('/lol-match-history/v1/games/7012345678')
+        '/lol-match-history/v1/games/{id}'
+    """
+    path = endpoint.split('?', 1)[0]
+    segments = []
+    for segment in path.split('/'):
+        if _UUID_RE.match(segment):
+            segments.append('{puuid}')
+        elif _NUMERIC_RE.match(segment) or _MATCH_ID_RE.match(segment):
+            segments.append('{id}')
+        else:
+            segments.append(segment)
+    return '/'.join(segments)
+
+
+def record_request(method, endpoint, latency, status=None, nbytes=0, timeout=False):
+    """
+    记录一次真实 LCU 请求。
+
+    Args:
+        method: HTTP方法
+        endpoint: API端点路径
+        latency: 耗时（秒）
+        status: HTTP 状态码（网络异常为 None）
+        nbytes: 响应字节数
+        timeout: 是否超时
+    """
+    template = f"{method.upper()} {endpoint_template(endpoint)}"
+    sample = Sample(time.time(), latency * 1000, status, nbytes, timeout)
+    with _lock:
+        samples = _samples.get(template)
+        if samples is None:
+            samples = deque(maxlen=MAX_SAMPLES_PER_TEMPLATE)
+            _samples[template] = samples
+        samples.append(sample)
+        _totals[template] = _totals.get(template, 0) + 1
+
+
+def _window_samples(template, window):
+    """获取模板在窗口内的样本（内部加锁，调用方不应持有 _lock）"""
+    cutoff = time.time() - window
+    with _lock:
+        samples = list(_samples.get(template, ()))
+    return [s for s in samples if s.ts >= cutoff]
+
+
+def _percentile(sorted_values, q):
+    """计算已排序数据的分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_percentile(method, endpoint, q, window=DEFAULT_WINDOW, min_samples=1):
+    """
+    获取端点在窗口内成功请求的延迟分位数。
+
+    Args:
+        method: HTTP方法
+        endpoint: API端点路径（会自动归一化为模板）
+        q: 分位数，如 0.95
+        window: 窗口大小（秒）
+        min_samples: 样本数不足时返回None
+
+    Returns:
+        float: 延迟（毫秒），样本不足返回None
+    """
+    template = f"{method.upper()} {endpoint_template(endpoint)}"
+    latencies = sorted(
+        s.latency_ms for s in _window_samples(template, window)
+        if s.status is not None and s.status < 500
+    )
+    if len(latencies) < min_samples:
+        return None
+    return _percentile(latencies, q)
+
+
+def _summarize(template, samples):
+    """汇总单个模板的样本"""
+    latencies = sorted(s.latency_ms for s in samples)
+    statuses = {}
+    for s in samples:
+        key = str(s.status) if s.status is not None else 'error'
+        statuses[key] = statuses.get(key, 0) + 1
+
+    histogram = {}
+    for bound in LATENCY_BUCKETS_MS:
+        histogram[f"<={bound}ms"] = 0
+    histogram['+inf'] = 0
+    for latency in latencies:
+        for bound in LATENCY_BUCKETS_MS:
+            if latency <= bound:
+                histogram[f"<={bound}ms"] += 1
+                break
+        else:
+            histogram['+inf'] += 1
+
+    total_bytes = sum(s.nbytes for s in samples)
+    return {
+        'endpoint': template,
+        'count': len(samples),
+        'timeouts': sum(1 for s in samples if s.timeout),
+        'errors': sum(1 for s in samples if s.status is None or s.status >= 500),
+        'status': statuses,
+        'latency_ms': {
+            'p50': round(_percentile(latencies, 0.50), 1),
+            'p95': round(_percentile(latencies, 0.95), 1),
+            'p99': round(_percentile(latencies, 0.99), 1),
+            'max': round(latencies[-1], 1) if latencies else 0.0,
+            'mean': round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        },
+        'bytes': {
+            'total': total_bytes,
+            'mean': int(total_bytes / len(samples)) if samples else 0,
+        },
+        'histogram': histogram,
+        'busy_ms': round(sum(latencies), 1),
+    }
+
+
+def get_request_metrics(window=DEFAULT_WINDOW):
+    """
+    获取窗口内各端点模板的请求统计，按总耗时（busy_ms）降序排列。
+
+    Args:
+        window: 窗口大小（秒）
+
+    Returns:
+        list[dict]: 每个端点模板的请求数、超时数、状态码分布、延迟分位数、
+                    响应大小和延迟直方图；'total' 为进程启动以来的累计请求数
+    """
+    with _lock:
+        templates = list(_samples.keys())
+        totals = dict(_totals)
+
+    result = []
+    for template in templates:
+        samples = _window_samples(template, window)
+        if not samples:
+            continue
+        summary = _summarize(template, samples)
+        summary['total'] = totals.get(template, 0)
+        result.append(summary)
+
+    result.sort(key=lambda m: m['busy_ms'], reverse=True)
+    return result
+
+
+def reset_metrics():
+    """清空所有指标"""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
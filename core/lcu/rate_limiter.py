@@ -0,0 +1,208 @@
+"""
+LCU 请求限流模块
+令牌桶 + 优先级队列：交互请求优先于后台请求，关键请求（如接受对局）从不等待
+"""
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+# 优先级（数值越小越优先）
+PRIORITY_CRITICAL = 0     # 时间敏感操作（接受对局），不受限流约束
+PRIORITY_INTERACTIVE = 1  # 前端路由发起的请求（默认）
+PRIORITY_BACKGROUND = 2   # 后台分析、召唤师信息补全等
+
+PRIORITY_NAMES = {
+    PRIORITY_CRITICAL: 'critical',
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+# 令牌桶参数：稳定速率（请求/秒）和突发容量
+DEFAULT_RATE = 25
+DEFAULT_BURST = 25
+
+# 当前上下文的请求优先级（随 contextvars 传递到 map_concurrent 的工作线程）
+_current_priority = contextvars.ContextVar('lcu_request_priority', default=PRIORITY_INTERACTIVE)
+
+
+def get_request_priority():
+    """获取当前上下文的请求优先级"""
+    return _current_priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority):
+    """
+    在 with 块内以指定优先级发送 LCU 请求。
+
+    Examples:
+        >>> with request_priority(PRIORITY_BACKGROUND):
+        ...     enrich_game_with_summoner_info(token, port, game)
+    """
+    reset_token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(reset_token)
+
+
+class PriorityRateLimiter:
+    """
+    带优先级队列的令牌桶限流器（线程安全）。
+
+    令牌不足时请求按 (优先级, 到达顺序) 排队，队首请求获得下一个令牌；
+    PRIORITY_CRITICAL 请求直接放行（仍消耗令牌，使其他请求相应让出额度）。
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queue = []  # heap[(priority, seq)]
+        self._seq = itertools.count()
+        self._stats = {p: _new_stats() for p in PRIORITY_NAMES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        获取一个令牌，必要时排队等待。
+
+        Args:
+            priority: 请求优先级
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 获得令牌返回True，等待超时返回False
+        """
+        started = time.monotonic()
+        with self._cond:
+            self._refill()
+            if priority == PRIORITY_CRITICAL:
+                self._tokens -= 1
+                self._record(priority, 0.0)
+                return True
+
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._queue, entry)
+            delayed = False
+            deadline = None if timeout is None else started + timeout
+            while True:
+                self._refill()
+                if self._queue[0] == entry and self._tokens >= 1:
+                    self._tokens -= 1
+                    heapq.heappop(self._queue)
+                    self._cond.notify_all()  # 唤醒新的队首
+                    self._record(priority, time.monotonic() - started if delayed else 0.0)
+                    return True
+
+                wait = None
+                if self._queue[0] == entry:
+                    wait = (1 - self._tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._queue.remove(entry)
+                        heapq.heapify(self._queue)
+                        self._cond.notify_all()
+                        self._stats[priority]['rejected'] += 1
+                        return False
+                    wait = remaining if wait is None else min(wait, remaining)
+                delayed = True
+                self._cond.wait(wait)
+
+    def _record(self, priority, waited):
+        stats = self._stats[priority]
+        stats['acquired'] += 1
+        if waited > 0:
+            stats['delayed'] += 1
+            stats['wait_total'] += waited
+            stats['wait_max'] = max(stats['wait_max'], waited)
+
+    def configure(self, rate=None, burst=None):
+        """调整速率和突发容量"""
+        with self._cond:
+            self._refill()
+            if rate is not None:
+                self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        获取限流状态。
+
+        Returns:
+            dict: 速率、当前令牌数、各优先级排队数和等待统计（毫秒）
+        """
+        with self._cond:
+            self._refill()
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue:
+                depth[PRIORITY_NAMES[priority]] += 1
+            classes = {}
+            for priority, stats in self._stats.items():
+                delayed = stats['delayed']
+                classes[PRIORITY_NAMES[priority]] = {
+                    'acquired': stats['acquired'],
+                    'delayed': delayed,
+                    'rejected': stats['rejected'],
+                    'wait_mean_ms': round(stats['wait_total'] / delayed * 1000, 1) if delayed else 0.0,
+                    'wait_max_ms': round(stats['wait_max'] * 1000, 1),
+                }
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                'queue_depth': depth,
+                'classes': classes,
+            }
+
+
+def _new_stats():
+    return {'acquired': 0, 'delayed': 0, 'rejected': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+
+
+_limiter = PriorityRateLimiter()
+
+
+def acquire(priority=None, timeout=None):
+    """
+    为一次真实请求获取令牌（由 client 在发送前调用）。
+
+    Args:
+        priority: 请求优先级，None 表示使用当前上下文的优先级
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        bool: 获得令牌返回True，等待超时返回False
+    """
+    if priority is None:
+        priority = _current_priority.get()
+    return _limiter.acquire(priority, timeout)
+
+
+def configure_rate_limit(rate=None, burst=None):
+    """
+    调整全局 LCU 请求速率。
+
+    Args:
+        rate: 稳定速率（请求/秒）
+        burst: 突发容量
+    """
+    _limiter.configure(rate, burst)
+
+
+def get_rate_limiter_stats():
+    """获取全局限流器的状态（排队深度、各优先级等待时间）"""
+    return _limiter.stats()
@@ -0,0 +1,115 @@
+"""
+LCU 请求重试策略
+统一的指数退避 + 随机抖动重试，按错误类型判断是否值得重试
+"""
+import random
+import time
+
+import requests
+
+from .client import LCUCircuitOpenError, LCUDeadlineExceededError, LCURequestError
+from .deadline import remaining_budget, request_deadline
+
+# 可重试的 HTTP 状态码：游戏加载/客户端繁忙时 LCU 常返回 503
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+def is_retryable_error(error):
+    """
+    判断 LCU 请求错误是否值得重试。
+
+    可重试：超时、连接异常、502/503/504。
+    不可重试：熔断中（重试只会继续失败）、请求期限已用尽、404 等其他 4xx/5xx、响应无法解析。
+
+    Args:
+        error: 请求抛出的异常
+
+    Returns:
+        bool: 值得重试返回True
+    """
+    if not isinstance(error, LCURequestError) or isinstance(error, (LCUCircuitOpenError, LCUDeadlineExceededError)):
+        return False
+    if error.status_code is not None:
+        return error.status_code in RETRYABLE_STATUS_CODES
+    if error.is_timeout:
+        return True
+    return isinstance(error.__cause__, requests.exceptions.ConnectionError)
+
+
+class RetryPolicy:
+    """
+    重试策略：带随机抖动的指数退避，并限制单次调用的总耗时预算。
+
+    第 n 次重试前等待 [0, min(max_delay, base_delay * 2**n)] 之间的随机时间，
+    避免多个调用方在 LCU 恢复的瞬间同时重试。等待会超过当前请求期限
+    （见 deadline.request_deadline）时不再重试。
+
+    每次尝试都在剩余预算内执行：request_json 等调用的 timeout 会被收紧到
+    budget - 已耗时，整个调用（包括最后一次尝试）不会超出预算。退避后剩余预算
+    不足 min_attempt_time 时不再重试。
+
+    Attributes:
+        max_attempts: 最多尝试次数（包括首次）
+        base_delay: 退避基数（秒）
+        max_delay: 单次等待上限（秒）
+        budget: 单次调用的总耗时预算（秒），包括每次尝试本身的耗时；None 表示不限制
+        min_attempt_time: 发起重试所需的最少剩余预算（秒），不足时直接抛出上次的错误
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=4.0, budget=30.0, min_attempt_time=1.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.min_attempt_time = min_attempt_time
+
+    def backoff(self, retry_index):
+        """
+        计算第 retry_index 次重试（从 0 开始）前的等待时间。
+
+        Returns:
+            float: 等待秒数
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry_index)))
+
+    def call(self, func, *args, **kwargs):
+        """
+        执行 func，遇到可重试的错误时按策略退避后重试。
+
+        Args:
+            func: 要执行的函数（通常是 request_json）
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            最后一次尝试的异常（不可重试、次数或预算耗尽时）
+
+        Examples:
+            >>> DEFAULT_RETRY_POLICY.call(request_json, 'GET', endpoint, token, port, timeout=10)
+        """
+        started = time.monotonic()
+        for attempt in range(self.max_attempts):
+            try:
+                if self.budget is None:
+                    return func(*args, **kwargs)
+                # 本次尝试的超时收紧到剩余预算（request_json 通过请求期限自动收紧）
+                with request_deadline(self.budget - (time.monotonic() - started)):
+                    return func(*args, **kwargs)
+            except Exception as e:
+                if attempt + 1 >= self.max_attempts or not is_retryable_error(e):
+                    raise
+                delay = self.backoff(attempt)
+                # 退避后剩余的预算不够再完成一次尝试，则不再重试
+                if self.budget is not None and self.budget - (time.monotonic() - started) - delay < self.min_attempt_time:
+                    raise
+                remaining = remaining_budget()
+                if remaining is not None and remaining - delay < self.min_attempt_time:
+                    raise
+                print(f"⚠️ {e}，{delay:.1f} 秒后重试... (attempt {attempt + 1}/{self.max_attempts})")
+                time.sleep(delay)
+
+
+# 默认策略：最多 3 次尝试，总预算 30 秒（战绩等大请求单次超时 25 秒，超时后的重试只能用剩余的预算）
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -3,30 +3,155 @@
 查询召唤师资料、PUUID 等信息
 """
 import re
-import time
-from .client import make_request
+from utils import json_codec
+from .cache import LRUTTLCache
+from .client import make_request, request_json, map_concurrent, LCURequestError, _log_request_error
 
-# PUUID缓存：{summoner_name: (timestamp, puuid)}
-_puuid_cache = {}
-PUUID_CACHE_TTL = 600  # 缓存10分钟
-MAX_PUUID_CACHE_SIZE = 200  # 最大缓存200个召唤师
+# 名称中不可见的 Unicode 控制字符 (如 U+206E, U+2069 等 Bidi 字符)
+CLEANR = re.compile(r'[\u200e-\u200f\u202a-\u202e\u2066-\u2069]')
 
+# 召唤师身份缓存：同一份召唤师数据按 puuid、summonerId、Riot ID 和显示名称分别建立索引，
+# 任意一种方式查到后，其他方式的查询都能直接命中
+# {(kind, key): summoner}，kind 为 'puuid' / 'id' / 'name'
+SUMMONER_CACHE_TTL = 600  # 缓存10分钟
+MAX_SUMMONER_CACHE_KEYS = 2000  # 最大索引条目数（每个召唤师约 3~4 条）
+_identity_cache = LRUTTLCache('summoner_identity', ttl=SUMMONER_CACHE_TTL, max_entries=MAX_SUMMONER_CACHE_KEYS)
 
-def _clean_puuid_cache():
-    """清理过期的PUUID缓存"""
-    global _puuid_cache
-    current_time = time.time()
+# 未找到（404）的查询：改名玩家的旧名称等，短时间内再次查询不再请求 LCU
+# 超时、5xx 等临时错误不会记录
+# {(kind, key): True}
+NEGATIVE_CACHE_TTL = 60  # 缓存1分钟
+MAX_NEGATIVE_CACHE_KEYS = 1000
+_negative_cache = LRUTTLCache('summoner_not_found', ttl=NEGATIVE_CACHE_TTL, max_entries=MAX_NEGATIVE_CACHE_KEYS)
+
+# 批量查询端点：按 puuid 列表（POST 请求体为 JSON 数组）、按 summonerId 列表（ids 参数为 JSON 数组）
+BATCH_BY_PUUID_ENDPOINT = "/lol-summoner/v2/summoners/puuid"
+BATCH_BY_ID_ENDPOINT = "/lol-summoner/v2/summoners"
+MAX_BATCH_SIZE = 50  # 单次批量查询的最大数量
+# 批量端点返回这些状态码时视为客户端不支持，之后直接逐个查询
+# （400 可能只是这一批参数有误，不能据此认定端点不存在）
+BATCH_UNSUPPORTED_STATUS = frozenset({404, 405})
+# 不支持批量查询的 (port, endpoint)
+_batch_unsupported = set()
+
+# 排位队列类型 -> 摘要中的键名
+RANKED_QUEUE_KEYS = {
+    'RANKED_SOLO_5x5': 'solo',
+    'RANKED_FLEX_SR': 'flex',
+    'RANKED_TFT': 'tft',
+}
+
+
+def clean_summoner_name(name):
+    """
+    移除名称中不可见的 Unicode 控制字符，保留 # 号用于 Riot ID 格式。
     
-    # 删除过期缓存
-    expired_keys = [k for k, (t, _) in _puuid_cache.items() if current_time - t > PUUID_CACHE_TTL]
-    for k in expired_keys:
-        del _puuid_cache[k]
+    Examples:
+        >>> clean_summoner_name('\u2066Faker\u2069#KR1 ')
+        'Faker#KR1'
+    """
+    return CLEANR.sub('', name).strip()
+
+
+def _name_key(name):
+    """名称索引键：清洗控制字符并忽略大小写（Riot ID 不区分大小写）"""
+    return ('name', clean_summoner_name(name).casefold())
+
+
+def _identity_keys(summoner):
+    """召唤师数据对应的所有索引键"""
+    keys = []
+    if summoner.get('puuid'):
+        keys.append(('puuid', summoner['puuid']))
+    if summoner.get('summonerId'):
+        keys.append(('id', str(summoner['summonerId'])))
+    game_name = summoner.get('gameName')
+    if game_name:
+        tag_line = summoner.get('tagLine')
+        keys.append(_name_key(f"{game_name}#{tag_line}" if tag_line else game_name))
+    if summoner.get('displayName'):
+        keys.append(_name_key(summoner['displayName']))
+    return keys
+
+
+def _remember_summoner(summoner, *extra_keys):
+    """
+    将召唤师数据写入身份缓存。
     
-    # 如果缓存过大，删除最旧的条目
-    if len(_puuid_cache) > MAX_PUUID_CACHE_SIZE:
-        sorted_items = sorted(_puuid_cache.items(), key=lambda x: x[1][0])
-        for k, _ in sorted_items[:len(_puuid_cache) - MAX_PUUID_CACHE_SIZE]:
-            del _puuid_cache[k]
+    Args:
+        summoner: 召唤师数据
+        *extra_keys: 额外的索引键（如查询时使用的名称）
+    """
+    if not isinstance(summoner, dict):
+        return
+    for key in (*_identity_keys(summoner), *extra_keys):
+        _identity_cache.put(key, summoner)
+        _negative_cache.pop(key)
+
+
+def _lookup_summoner(key):
+    """从身份缓存中读取召唤师数据（未命中或已过期返回None）"""
+    return _identity_cache.get(key)
+
+
+def _remember_not_found(key):
+    """记录查询结果为 404 的索引键"""
+    _negative_cache.put(key, True)
+
+
+def _is_known_missing(key):
+    """索引键是否在短时间内查询过且结果为 404"""
+    return _negative_cache.get(key, False)
+
+
+def _fetch_summoner(token, port, key, endpoint, params=None):
+    """
+    查询单个召唤师（先查身份缓存和未找到缓存），结果写入对应缓存。
+    
+    Args:
+        key: 本次查询的索引键
+        endpoint: 查询端点
+        params: 查询参数
+    
+    Returns:
+        dict: 召唤师信息，未找到或请求失败返回None
+    """
+    cached = _lookup_summoner(key)
+    if cached is not None:
+        return cached
+    if _is_known_missing(key):
+        return None
+    try:
+        data = request_json("GET", endpoint, token, port, params=params, hedge=True)
+    except LCURequestError as e:
+        if e.status_code == 404:
+            _remember_not_found(key)
+        _log_request_error(e)
+        return None
+    # 查询使用的索引键也指向结果（如不带 #TAG 的旧式名称）
+    _remember_summoner(data, key)
+    return data
+
+
+def get_summoner_cache_stats():
+    """
+    获取召唤师身份缓存的统计。
+    
+    Returns:
+        dict: 索引条目数、命中/未命中次数、命中率，以及未找到缓存的条目数和命中次数
+    """
+    stats = _identity_cache.stats()
+    not_found = _negative_cache.stats()
+    stats['not_found_entries'] = not_found['entries']
+    stats['not_found_hits'] = not_found['hits']
+    return stats
+
+
+def clear_summoner_cache():
+    """清空召唤师身份缓存、未找到缓存和批量端点的支持情况（LCU 凭证变化时调用）"""
+    _identity_cache.clear()
+    _negative_cache.clear()
+    _batch_unsupported.clear()
 
 
 def get_current_summoner(token, port):
@@ -56,7 +181,7 @@ def get_puuid(token, port, summoner_name):
     
     使用 LCU API /lol-summoner/v1/summoners?name={summoner_name} 查询。
     会自动清理名称中的 Unicode 控制字符（如 Bidi 字符）。
-    结果会缓存10分钟，避免重复查询。
+    结果写入召唤师身份缓存（10分钟），避免重复查询。
     
     Args:
         token: LCU认证令牌
@@ -66,40 +191,10 @@ def get_puuid(token, port, summoner_name):
     Returns:
         str: PUUID，失败返回None
     """
-    # 定期清理缓存
-    _clean_puuid_cache()
-    
-    # 检查缓存
-    if summoner_name in _puuid_cache:
-        cached_time, cached_puuid = _puuid_cache[summoner_name]
-        if time.time() - cached_time < PUUID_CACHE_TTL:
-            print(f"✅ 使用PUUID缓存 ({summoner_name})")
-            return cached_puuid
-    
-    endpoint = "/lol-summoner/v1/summoners"
-    
-    # 移除不可见的 Unicode 控制字符 (如 U+206E, U+2069 等 Bidi 字符)
-    # 同时保留 # 号用于 Riot ID 格式
-    CLEANR = re.compile(r'[\u200e-\u200f\u202a-\u202e\u2066-\u2069]')
-    cleaned_name = re.sub(CLEANR, '', summoner_name).strip() 
-
-    # 使用 make_request 发送请求
-    data = make_request(
-        "GET",
-        endpoint,
-        token,
-        port,
-        params={'name': cleaned_name}  # 使用查询参数传递清洗后的名称
-    )
-    
+    data = get_summoner_by_name(token, port, summoner_name)
     if data:
         # Riot ID 查询返回的是一个包含 puuid 的字典
-        puuid = data.get('puuid')
-        if puuid:
-            # 缓存结果
-            _puuid_cache[summoner_name] = (time.time(), puuid)
-            print(f"✅ 查询PUUID成功 ({summoner_name})")
-        return puuid
+        return data.get('puuid')
     return None
 
 
@@ -113,10 +208,10 @@ def get_summoner_by_id(token, port, summoner_id):
         summoner_id: 召唤师ID
     
     Returns:
-        dict: 召唤师信息
+        dict: 召唤师信息，失败返回None
     """
     endpoint = f"/lol-summoner/v1/summoners/{summoner_id}"
-    return make_request("GET", endpoint, token, port)
+    return _fetch_summoner(token, port, ('id', str(summoner_id)), endpoint)
 
 
 def get_summoner_by_puuid(token, port, puuid):
@@ -129,28 +224,29 @@ def get_summoner_by_puuid(token, port, puuid):
         puuid: 玩家PUUID
     
     Returns:
-        dict: 召唤师信息
+        dict: 召唤师信息，失败返回None
     """
     endpoint = f"/lol-summoner/v1/summoners/by-puuid/{puuid}"
-    return make_request("GET", endpoint, token, port)
+    return _fetch_summoner(token, port, ('puuid', puuid), endpoint)
 
 
 def get_summoner_by_name(token, port, name):
     """
     通过召唤师名字查询完整信息。
     
-    使用 ?name= 查询参数，LCU 返回字典格式。
+    使用 ?name= 查询参数，LCU 返回字典格式。名称会先清理 Unicode 控制字符，
+    同一名称的不同写法（控制字符、大小写）命中同一条缓存。
     
     Args:
         token: LCU认证令牌
         port: LCU端口
-        name: 召唤师名称
+        name: 召唤师名称（支持 GameName#TAG 格式）
     
     Returns:
-        dict: 召唤师信息
+        dict: 召唤师信息，失败返回None
     """
     endpoint = "/lol-summoner/v1/summoners"
-    return make_request("GET", endpoint, token, port, params={'name': name})
+    return _fetch_summoner(token, port, _name_key(name), endpoint, params={'name': clean_summoner_name(name)})
 
 
 def get_ranked_stats(token, port, summoner_id):
@@ -167,8 +263,177 @@ def get_ranked_stats(token, port, summoner_id):
     Returns:
         dict: 排位信息，包含 RANKED_SOLO_5x5 和 RANKED_FLEX_SR 等队列数据
               如果未查询到数据则返回空字典
+    
+    Notes:
+        响应按召唤师缓存 5 分钟（见 cache.CACHE_POLICIES 的 ranked_stats 策略），
+        同一页面反复渲染或同一对局内多次查询不会重复请求
     """
     endpoint = f"/lol-ranked/v1/ranked-stats/{summoner_id}"
     result = make_request("GET", endpoint, token, port)
     return result if result else {}
 
+
+def get_ranked_stats_many(token, port, summoner_ids):
+    """
+    并发获取多个召唤师的排位信息（如整个选人阶段或对局内的所有玩家）。
+    
+    LCU 没有批量排位端点，这里去重后并发查询，命中缓存的召唤师不会发起请求。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        summoner_ids: 召唤师标识列表，与 get_ranked_stats 的 summoner_id 相同
+                      （新版客户端的排位端点使用 puuid）；可包含重复和空值
+    
+    Returns:
+        dict: {summoner_id: 排位信息}，查询失败的召唤师对应空字典
+    """
+    unique_ids = list(dict.fromkeys(sid for sid in summoner_ids if sid))
+    lookups = map_concurrent(lambda sid: get_ranked_stats(token, port, sid), unique_ids)
+    return {
+        sid: (lookup.data if lookup.error is None and lookup.data else {})
+        for sid, lookup in zip(unique_ids, lookups)
+    }
+
+
+def summarize_ranked_stats(ranked_stats):
+    """
+    提取各排位队列的段位、小段位和胜点（用于段位徽章）。
+    
+    Args:
+        ranked_stats: get_ranked_stats 返回的排位信息
+    
+    Returns:
+        dict: {'solo' / 'flex' / 'tft': {'tier', 'division', 'leaguePoints'}}，
+              未定级的队列不在结果中
+    
+    Examples:
+        >>> summarize_ranked_stats({'queues': [{'queueType': 'RANKED_SOLO_5x5', 'tier': 'GOLD', 'division': 'II', 'leaguePoints': 40}]})
+        {'solo': {'tier': 'GOLD', 'division': 'II', 'leaguePoints': 40}}
+    """
+    summary = {}
+    if not isinstance(ranked_stats, dict):
+        return summary
+    for queue in ranked_stats.get('queues') or []:
+        key = RANKED_QUEUE_KEYS.get(queue.get('queueType'))
+        tier = queue.get('tier')
+        if key and tier and tier != 'NONE':
+            summary[key] = {
+                'tier': tier,
+                'division': queue.get('division', ''),
+                'leaguePoints': queue.get('leaguePoints', 0),
+            }
+    return summary
+
+
+def _batch_lookup(token, port, keys, kind, endpoint, fetch_batch, fetch_one):
+    """
+    批量查询召唤师的通用流程：先查身份缓存，未命中的按批量端点分块查询，
+    客户端不支持批量端点（或批量请求失败）时回退为并发逐个查询。
+    
+    Args:
+        keys: puuid 或 summonerId 列表
+        kind: 身份缓存的索引类型（'puuid' / 'id'）
+        endpoint: 批量端点（用于记录是否支持）
+        fetch_batch: 批量请求函数 chunk -> list[dict]，失败时抛出 LCURequestError
+        fetch_one: 单个查询函数 key -> dict
+    
+    Returns:
+        dict: {key: 召唤师信息}，查询失败的 key 不在结果中
+    """
+    result = {}
+    missing = []
+    for key in dict.fromkeys(k for k in keys if k):
+        cached = _lookup_summoner((kind, str(key)))
+        if cached is not None:
+            result[key] = cached
+        elif not _is_known_missing((kind, str(key))):
+            missing.append(key)
+    if not missing:
+        return result
+
+    pending = {str(key): key for key in missing}
+    failed = []
+    if (port, endpoint) not in _batch_unsupported:
+        for start in range(0, len(missing), MAX_BATCH_SIZE):
+            chunk = missing[start:start + MAX_BATCH_SIZE]
+            try:
+                summoners = fetch_batch(chunk)
+            except LCURequestError as e:
+                if e.status_code in BATCH_UNSUPPORTED_STATUS:
+                    print(f"⚠️ 客户端不支持批量查询 ({endpoint})，改为逐个查询")
+                    _batch_unsupported.add((port, endpoint))
+                    failed.extend(missing[start:])
+                    break
+                failed.extend(chunk)
+                continue
+            for summoner in summoners if isinstance(summoners, list) else ():
+                if not isinstance(summoner, dict):
+                    continue
+                _remember_summoner(summoner)
+                value = summoner.get('puuid') if kind == 'puuid' else summoner.get('summonerId')
+                key = pending.get(str(value))
+                if key is not None:
+                    result[key] = summoner
+    else:
+        failed = missing
+
+    if failed:
+        lookups = map_concurrent(lambda key: fetch_one(token, port, key), failed)
+        for key, lookup in zip(failed, lookups):
+            if lookup.error is None and lookup.data:
+                result[key] = lookup.data
+    return result
+
+
+def get_summoners_by_puuids(token, port, puuids):
+    """
+    批量通过 puuid 获取召唤师信息。
+    
+    使用 POST /lol-summoner/v2/summoners/puuid 一次查询多个玩家（10 人对局或
+    16 人斗魂竞技场只需一次请求），客户端不支持时回退为并发逐个查询。
+    结果写入召唤师身份缓存。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        puuids: puuid 列表（可包含重复和空值）
+    
+    Returns:
+        dict: {puuid: 召唤师信息}，查询失败的 puuid 不在结果中
+    """
+    def fetch_batch(chunk):
+        return request_json("POST", BATCH_BY_PUUID_ENDPOINT, token, port, json=chunk)
+
+    return _batch_lookup(token, port, puuids, 'puuid', BATCH_BY_PUUID_ENDPOINT, fetch_batch, get_summoner_by_puuid)
+
+
+def get_summoners_by_ids(token, port, summoner_ids):
+    """
+    批量通过 summonerId 获取召唤师信息。
+    
+    使用 GET /lol-summoner/v2/summoners?ids=[...] 一次查询多个玩家，
+    客户端不支持时回退为并发逐个查询。结果写入召唤师身份缓存。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        summoner_ids: summonerId 列表（可包含重复和空值，非数字的 ID 会被跳过）
+    
+    Returns:
+        dict: {summonerId: 召唤师信息}，查询失败的 summonerId 不在结果中
+    """
+    valid_ids = []
+    for sid in summoner_ids:
+        if sid is None or sid == '':
+            continue
+        if str(sid).isdigit():
+            valid_ids.append(sid)
+        else:
+            print(f"⚠️ 跳过无效的 summonerId: {sid!r}")
+
+    def fetch_batch(chunk):
+        params = {'ids': json_codec.dumps([int(sid) for sid in chunk])}
+        return request_json("GET", BATCH_BY_ID_ENDPOINT, token, port, params=params)
+
+    return _batch_lookup(token, port, valid_ids, 'id', BATCH_BY_ID_ENDPOINT, fetch_batch, get_summoner_by_id)
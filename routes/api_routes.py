@@ -8,6 +8,7 @@ from constants import CHAMPION_MAP
 from core import lcu
 from core.lcu.enrichment import enrich_game_with_augments
 from utils.game_data_formatter import format_game_data
+from utils import json_codec
 import requests
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -21,6 +22,38 @@ api_bp = Blueprint('api', __name__)
 # 向后兼容的别名
 api = api_bp
 
+# 各路由中 LCU 调用的总耗时预算（秒）：预算随请求上下文传递到每个 LCU 调用，
+# 剩余预算会收紧单次请求的超时，预算用尽后剩余的调用直接跳过
+SUMMONER_PAGE_DEADLINE = 10
+HISTORY_DEADLINE = 30
+MATCH_DEADLINE = 20
+RANKED_DEADLINE = 10
+
+# 单次段位查询的最大召唤师数（斗魂竞技场 16 人）
+MAX_RANKED_BATCH = 20
+
+
+def _lcu_busy_response(*endpoints):
+    """
+    检查端点族是否处于熔断状态（客户端加载中或卡死）
+    
+    Args:
+        *endpoints: 需要检查的端点族，如 '/lol-match-history'
+    
+    Returns:
+        tuple: (JSON响应, 503)，端点均可用时返回None
+    """
+    for endpoint in endpoints:
+        retry_after = lcu.get_retry_after(endpoint)
+        if retry_after > 0:
+            return jsonify({
+                "success": False,
+                "busy": True,
+                "retry_after": round(retry_after, 1),
+                "message": f"LCU 繁忙（客户端加载中或无响应），请 {retry_after:.0f} 秒后重试"
+            }), 503
+    return None
+
 
 @api_bp.route('/')
 def index():
@@ -29,6 +62,7 @@ def index():
 
 
 @api_bp.route('/summoner/<path:summoner_name>')
+@lcu.with_deadline(SUMMONER_PAGE_DEADLINE)
 def summoner_detail(summoner_name):
     """
     渲染召唤师详细战绩页面
@@ -50,59 +84,31 @@ def summoner_detail(summoner_name):
     # 获取召唤师头像 ID、等级和段位信息
     profile_icon_id = 29  # 默认头像
     summoner_level = 0  # 默认等级
-    ranked_solo_tier = ""  # 单排段位
-    ranked_solo_rank = ""  # 单排小段位
-    ranked_solo_lp = 0  # 单排胜点
-    ranked_flex_tier = ""  # 灵活组排段位
-    ranked_flex_rank = ""  # 灵活组排小段位
-    ranked_flex_lp = 0  # 灵活组排胜点
+    ranked = {}  # 段位摘要：{'solo' / 'flex': {'tier', 'division', 'leaguePoints'}}
     
     if app_state.is_lcu_connected():
-        token = app_state.lcu_credentials["auth_token"]
-        port = app_state.lcu_credentials["app_port"]
+        token, port = app_state.get_lcu_credentials()
         if puuid:
-            summoner_data = lcu.get_summoner_by_puuid(token, port, puuid)
-            if summoner_data:
-                profile_icon_id = summoner_data.get('profileIconId', 29)
-                summoner_level = summoner_data.get('summonerLevel', 0)
-                # 获取段位信息
-                summoner_id = summoner_data.get('id')
-                if summoner_id:
-                    ranked_stats = lcu.get_ranked_stats(token, port, summoner_id)
-                    if ranked_stats and isinstance(ranked_stats, dict):
-                        queues = ranked_stats.get('queues', [])
-                        for queue in queues:
-                            if queue.get('queueType') == 'RANKED_SOLO_5x5':
-                                ranked_solo_tier = queue.get('tier', '')
-                                ranked_solo_rank = queue.get('division', '')
-                                ranked_solo_lp = queue.get('leaguePoints', 0)
-                            elif queue.get('queueType') == 'RANKED_FLEX_SR':
-                                ranked_flex_tier = queue.get('tier', '')
-                                ranked_flex_rank = queue.get('division', '')
-                                ranked_flex_lp = queue.get('leaguePoints', 0)
+            # 已知 puuid：召唤师信息和段位（排位端点按 puuid 查询）互不依赖，并发获取
+            summoner_lookup, ranked_lookup = lcu.map_concurrent(lambda fetch: fetch(), [
+                lambda: lcu.get_summoner_by_puuid(token, port, puuid),
+                lambda: lcu.get_ranked_stats(token, port, puuid),
+            ])
+            summoner_data = summoner_lookup.data if summoner_lookup.error is None else None
+            ranked_stats = ranked_lookup.data if ranked_lookup.error is None else None
         else:
-            # 如果没有 puuid，尝试通过名称获取（使用解码后的名称）
-            s_data = lcu.get_summoner_by_name(token, port, decoded_summoner_name)
-            if s_data:
-                profile_icon_id = s_data.get('profileIconId', 29)
-                summoner_level = s_data.get('summonerLevel', 0)
-                # 同时获取 puuid 用于后续查询
-                puuid = s_data.get('puuid')
-                # 获取段位信息
-                summoner_id = s_data.get('id')
-                if summoner_id:
-                    ranked_stats = lcu.get_ranked_stats(token, port, summoner_id)
-                    if ranked_stats and isinstance(ranked_stats, dict):
-                        queues = ranked_stats.get('queues', [])
-                        for queue in queues:
-                            if queue.get('queueType') == 'RANKED_SOLO_5x5':
-                                ranked_solo_tier = queue.get('tier', '')
-                                ranked_solo_rank = queue.get('division', '')
-                                ranked_solo_lp = queue.get('leaguePoints', 0)
-                            elif queue.get('queueType') == 'RANKED_FLEX_SR':
-                                ranked_flex_tier = queue.get('tier', '')
-                                ranked_flex_rank = queue.get('division', '')
-                                ranked_flex_lp = queue.get('leaguePoints', 0)
+            # 如果没有 puuid，先通过名称获取（使用解码后的名称），再按 puuid 查询段位
+            summoner_data = lcu.get_summoner_by_name(token, port, decoded_summoner_name)
+            # 同时获取 puuid 用于后续查询
+            puuid = summoner_data.get('puuid') if summoner_data else None
+            ranked_stats = lcu.get_ranked_stats(token, port, puuid) if puuid else None
+        if summoner_data:
+            profile_icon_id = summoner_data.get('profileIconId', 29)
+            summoner_level = summoner_data.get('summonerLevel', 0)
+            ranked = lcu.summarize_ranked_stats(ranked_stats)
+    
+    solo = ranked.get('solo', {})
+    flex = ranked.get('flex', {})
     
     # pass champion map so templates can resolve championId -> champion key for ddragon
     return render_template(
@@ -112,16 +118,17 @@ def summoner_detail(summoner_name):
         puuid=puuid,
         profile_icon_id=profile_icon_id,
         summoner_level=summoner_level,
-        ranked_solo_tier=ranked_solo_tier,
-        ranked_solo_rank=ranked_solo_rank,
-        ranked_solo_lp=ranked_solo_lp,
-        ranked_flex_tier=ranked_flex_tier,
-        ranked_flex_rank=ranked_flex_rank,
-        ranked_flex_lp=ranked_flex_lp
+        ranked_solo_tier=solo.get('tier', ''),
+        ranked_solo_rank=solo.get('division', ''),
+        ranked_solo_lp=solo.get('leaguePoints', 0),
+        ranked_flex_tier=flex.get('tier', ''),
+        ranked_flex_rank=flex.get('division', ''),
+        ranked_flex_lp=flex.get('leaguePoints', 0)
     )
 
 
 @api_bp.route('/tft_summoner/<path:summoner_name>')
+@lcu.with_deadline(SUMMONER_PAGE_DEADLINE)
 def tft_summoner_detail(summoner_name):
     """
     渲染 TFT 专用的召唤师战绩页面
@@ -136,8 +143,7 @@ def tft_summoner_detail(summoner_name):
     # 获取召唤师头像 ID
     profile_icon_id = 29  # 默认头像
     if app_state.is_lcu_connected():
-        token = app_state.lcu_credentials["auth_token"]
-        port = app_state.lcu_credentials["app_port"]
+        token, port = app_state.get_lcu_credentials()
         if puuid:
             summoner_data = lcu.get_summoner_by_puuid(token, port, puuid)
             if summoner_data:
@@ -195,6 +201,7 @@ def live_game():
 
 
 @api_bp.route('/get_history', methods=['GET'])
+@lcu.with_deadline(HISTORY_DEADLINE)
 def get_history():
     """
     获取指定召唤师的战绩
@@ -224,9 +231,12 @@ def get_history():
             "message": "未连接到客户端"
         })
 
+    busy = _lcu_busy_response('/lol-summoner', '/lol-match-history')
+    if busy:
+        return busy
+
     # 获取PUUID（若客户端未直接提供）
-    token = app_state.lcu_credentials["auth_token"]
-    port = app_state.lcu_credentials["app_port"]
+    token, port = app_state.get_lcu_credentials()
     if not puuid:
         puuid = lcu.get_puuid(token, port, summoner_name)
         if not puuid:
@@ -246,7 +256,8 @@ def get_history():
     begin_index = (page - 1) * count
     
     # 获取战绩
-    history = lcu.get_match_history(token, port, puuid, count=count, begin_index=begin_index)
+    # 列表页只需要摘要字段，使用流式摘要模式降低内存峰值
+    history = lcu.get_match_history(token, port, puuid, count=count, begin_index=begin_index, summary_only=True)
     if not history:
         return jsonify({
             "success": False,
@@ -267,6 +278,7 @@ def get_history():
 
 
 @api_bp.route('/get_tft_history', methods=['GET'])
+@lcu.with_deadline(HISTORY_DEADLINE)
 def get_tft_history():
     """
     获取指定召唤师的 TFT 战绩（调用 LCU 的 TFT 产品端点）
@@ -291,8 +303,11 @@ def get_tft_history():
             "message": "未连接到客户端"
         })
 
-    token = app_state.lcu_credentials["auth_token"]
-    port = app_state.lcu_credentials["app_port"]
+    busy = _lcu_busy_response('/lol-summoner', '/lol-match-history')
+    if busy:
+        return busy
+
+    token, port = app_state.get_lcu_credentials()
     if not puuid:
         puuid = lcu.get_puuid(token, port, summoner_name)
         if not puuid:
@@ -330,6 +345,7 @@ def get_tft_history():
 
 
 @api_bp.route('/get_match', methods=['GET'])
+@lcu.with_deadline(MATCH_DEADLINE)
 def get_match():
     """
     返回指定召唤师历史列表中某一场的完整对局信息（包含所有参赛者）
@@ -350,12 +366,15 @@ def get_match():
     if not app_state.is_lcu_connected():
         return jsonify({"success": False, "message": "未连接到客户端"}), 400
 
-    token = app_state.lcu_credentials["auth_token"]
-    port = app_state.lcu_credentials["app_port"]
+    busy = _lcu_busy_response('/lol-summoner', '/lol-match-history')
+    if busy:
+        return busy
+
+    token, port = app_state.get_lcu_credentials()
 
     # 如果有 match_id，直接通过 match_id 查询（仅支持 LOL）
     if match_id:
-        match_obj = lcu.get_match_by_id(token, port, match_id)
+        match_obj = lcu.get_match_by_id(token, port, match_id, is_tft=is_tft)
         if match_obj:
             game = match_obj.get('game') if (isinstance(match_obj, dict) and 'game' in match_obj) else match_obj
             try:
@@ -398,7 +417,7 @@ def get_match():
         if game_match_id:
             # 通过 match_id 获取完整 TFT 对局数据（包含所有8名玩家的完整信息）
             print(f"🔍 [TFT] 通过 match_id={game_match_id} 获取完整对局详情")
-            full_game = lcu.get_match_by_id(token, port, game_match_id)
+            full_game = lcu.get_match_by_id(token, port, game_match_id, is_tft=True)
             if full_game:
                 # 有些端点返回 {'game': {...}}，有些直接返回 game 对象
                 game = full_game.get('game') if (isinstance(full_game, dict) and 'game' in full_game) else full_game
@@ -447,42 +466,23 @@ def get_match():
             participants_with_icons = sum(1 for p in participants if p.get('profileIcon') or p.get('profileIconId'))
             print(f"🔍 [TFT] 当前 {participants_with_icons}/{len(participants)} 个参与者有头像")
             
-            for idx, p in enumerate(participants):
+            # 并发查询仍缺少头像的参与者（单个玩家超时不会阻塞整个响应）
+            missing = [
+                (idx, p) for idx, p in enumerate(participants)
+                if not (p.get('profileIcon') or p.get('profileIconId'))
+            ]
+            with lcu.request_priority(lcu.PRIORITY_BACKGROUND):
+                lookups = lcu.map_concurrent(
+                    lambda item: _lookup_tft_participant_summoner(token, port, game_json, *item),
+                    missing
+                )
+
+            for (idx, p), lookup in zip(missing, lookups):
                 try:
-                    # 如果已经有头像则跳过
-                    if p.get('profileIcon') or p.get('profileIconId'):
-                        continue
-
+                    if lookup.error is not None:
+                        raise lookup.error
+                    info = lookup.data
                     summoner_name = p.get('summonerName') or f"Player{idx+1}"
-                    print(f"🔍 [TFT] 尝试为 {summoner_name} 获取头像...")
-
-                    puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
-                    if not puuid:
-                        # 备用：participantIdentities 中寻找
-                        pid = p.get('participantId')
-                        if pid:
-                            idents = {ident.get('participantId'): ident.get('player') for ident in (game_json.get('participantIdentities') or [])}
-                            player = idents.get(pid) or {}
-                            puuid = player.get('puuid')
-
-                    info = None
-                    # 方法1: 通过 puuid 查询
-                    if puuid:
-                        print(f"  📞 使用 puuid 查询: {puuid[:8]}...")
-                        info = lcu.get_summoner_by_puuid(token, port, puuid)
-                        if info:
-                            print(f"  ✅ puuid 查询成功")
-                        else:
-                            print(f"  ❌ puuid 查询失败")
-                    
-                    # 方法2: 如果 puuid 查询失败，尝试通过名称查询
-                    if not info and summoner_name and summoner_name != f"Player{idx+1}":
-                        print(f"  📞 使用名称查询: {summoner_name}")
-                        info = lcu.get_summoner_by_name(token, port, summoner_name)
-                        if info:
-                            print(f"  ✅ 名称查询成功")
-                        else:
-                            print(f"  ❌ 名称查询失败")
 
                     # 填充头像信息
                     if info and isinstance(info, dict):
@@ -512,38 +512,41 @@ def get_match():
         return jsonify({"success": True, "game": game})
     else:
         # LOL 战绩查询
+        if index < 0:
+            return jsonify({"success": False, "message": "索引越界"}), 400
         fetch_count = min(index + 20, 200)
-        history = lcu.get_match_history(token, port, puuid, count=fetch_count)
-        if not history:
-            return jsonify({"success": False, "message": "获取战绩失败"}), 500
 
-        games = history.get('games', {}).get('games', [])
-        if index < 0 or index >= len(games):
+        # 先用战绩页已缓存的摘要定位对局 ID（摘要保留了 gameId），再按 ID 获取完整对局，
+        # 避免为点开一场对局再拉取一次完整的 200 场战绩
+        game = None
+        summary = lcu.get_match_history(token, port, puuid, count=fetch_count, summary_only=True)
+        summary_games = summary.get('games', {}).get('games', []) if summary else []
+        if summary and index >= len(summary_games):
             return jsonify({"success": False, "message": "索引越界"}), 400
-
-        game_summary = games[index]
-        
-        # 尝试从 game_summary 中获取 match_id，然后通过 match_id 获取完整对局数据
-        game_match_id = game_summary.get('matchId') or game_summary.get('gameId') or game_summary.get('match_id')
-        
-        if game_match_id:
-            # 通过 match_id 获取完整对局数据（包含所有10名玩家）
-            print(f"🔍 通过 match_id={game_match_id} 获取完整对局详情")
-            full_game = lcu.get_match_by_id(token, port, game_match_id)
-            if full_game:
-                # 有些端点返回 {'game': {...}}，有些直接返回 game 对象
-                game = full_game.get('game') if (isinstance(full_game, dict) and 'game' in full_game) else full_game
-                if isinstance(game, dict):
-                    participants_count = len(game.get('participants', []))
-                    print(f"✅ 获取到完整对局数据，参与者数量: {participants_count}")
-            else:
-                # 如果通过 match_id 获取失败，降级使用 history 中的数据
-                print(f"⚠️ 通过 match_id 获取失败，使用历史记录中的数据")
-                game = game_summary
-        else:
-            # 如果没有 match_id，使用 history 中的数据
-            print(f"⚠️ 无 match_id，使用历史记录中的数据")
-            game = game_summary
+        if index < len(summary_games):
+            game_match_id = summary_games[index].get('matchId') or summary_games[index].get('gameId')
+            if game_match_id:
+                # 通过 match_id 获取完整对局数据（包含所有10名玩家）
+                print(f"🔍 通过 match_id={game_match_id} 获取完整对局详情")
+                full_game = lcu.get_match_by_id(token, port, game_match_id)
+                if full_game:
+                    # 有些端点返回 {'game': {...}}，有些直接返回 game 对象
+                    game = full_game.get('game') if (isinstance(full_game, dict) and 'game' in full_game) else full_game
+                    if isinstance(game, dict):
+                        participants_count = len(game.get('participants', []))
+                        print(f"✅ 获取到完整对局数据，参与者数量: {participants_count}")
+
+        if game is None:
+            # 摘要定位或按 match_id 获取失败时，降级使用完整战绩中的数据
+            print("⚠️ 无法通过 match_id 获取对局，使用完整历史记录中的数据")
+            history = lcu.get_match_history(token, port, puuid, count=fetch_count)
+            if not history:
+                return jsonify({"success": False, "message": "获取战绩失败"}), 500
+
+            games = history.get('games', {}).get('games', [])
+            if index >= len(games):
+                return jsonify({"success": False, "message": "索引越界"}), 400
+            game = games[index]
 
         # 尝试使用 LCU API 补全参与者的召唤师名和头像（如果返回数据缺失）
         try:
@@ -557,9 +560,112 @@ def get_match():
         return jsonify({"success": True, "game": game})
 
 
+def _lookup_tft_participant_summoner(token, port, game_json, idx, p):
+    """
+    为缺少头像的 TFT 参与者查询召唤师信息（先 puuid，后名称）
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        game_json: TFT 对局数据（包含 participantIdentities 备用映射）
+        idx: 参与者索引
+        p: 参与者数据
+    
+    Returns:
+        dict: 召唤师信息，失败返回None
+    """
+    summoner_name = p.get('summonerName') or f"Player{idx+1}"
+    print(f"🔍 [TFT] 尝试为 {summoner_name} 获取头像...")
+
+    puuid = p.get('puuid') or (p.get('player') or {}).get('puuid')
+    if not puuid:
+        # 备用：participantIdentities 中寻找
+        pid = p.get('participantId')
+        if pid:
+            idents = {ident.get('participantId'): ident.get('player') for ident in (game_json.get('participantIdentities') or [])}
+            player = idents.get(pid) or {}
+            puuid = player.get('puuid')
+
+    info = None
+    # 方法1: 通过 puuid 查询
+    if puuid:
+        print(f"  📞 使用 puuid 查询: {puuid[:8]}...")
+        info = lcu.get_summoner_by_puuid(token, port, puuid)
+        if info:
+            print(f"  ✅ puuid 查询成功")
+        else:
+            print(f"  ❌ puuid 查询失败")
+    
+    # 方法2: 如果 puuid 查询失败，尝试通过名称查询
+    if not info and summoner_name and summoner_name != f"Player{idx+1}":
+        print(f"  📞 使用名称查询: {summoner_name}")
+        info = lcu.get_summoner_by_name(token, port, summoner_name)
+        if info:
+            print(f"  ✅ 名称查询成功")
+        else:
+            print(f"  ❌ 名称查询失败")
+
+    return info
+
 # OP.GG helper removed.
 
 
+@api_bp.route('/get_ranked_stats', methods=['GET'])
+@lcu.with_deadline(RANKED_DEADLINE)
+def get_ranked_stats():
+    """
+    批量获取多个召唤师的段位摘要（用于在队友、敌人旁显示段位徽章）
+    
+    查询参数:
+        ids: 逗号分隔的召唤师标识（与 get_ranked_stats 的路径参数相同）
+    
+    Returns:
+        JSON: {"success": True, "ranked": {id: {'solo'/'flex'/'tft': {tier, division, leaguePoints}}}}
+    """
+    if not app_state.is_lcu_connected():
+        return jsonify({"success": False, "message": "未连接到客户端"})
+    
+    ids = [i.strip() for i in request.args.get('ids', '').split(',') if i.strip()]
+    if not ids:
+        return jsonify({"success": False, "message": "缺少 ids 参数"})
+    if len(ids) > MAX_RANKED_BATCH:
+        return jsonify({"success": False, "message": f"单次最多查询 {MAX_RANKED_BATCH} 名召唤师"})
+    
+    token, port = app_state.get_lcu_credentials()
+    ranked = lcu.get_ranked_stats_many(token, port, ids)
+    return jsonify({
+        "success": True,
+        "ranked": {sid: lcu.summarize_ranked_stats(stats) for sid, stats in ranked.items()}
+    })
+
+
+@api_bp.route('/get_lcu_metrics', methods=['GET'])
+def get_lcu_metrics():
+    """
+    获取 LCU 请求的运行时指标（用于排查慢请求）
+    
+    查询参数:
+        window: 统计窗口（秒，默认300）
+    
+    Returns:
+        JSON: 各端点模板的延迟分位数/直方图、熔断状态、缓存命中、限流排队、进行中请求数和对冲统计
+    """
+    window = request.args.get('window', 300, type=int)
+    window = min(max(window, 1), 3600)
+    return jsonify({
+        "success": True,
+        "window": window,
+        "endpoints": lcu.get_request_metrics(window),
+        "circuits": lcu.get_circuit_states(),
+        "cache": lcu.get_cache_stats(),
+        "summoner_cache": lcu.get_summoner_cache_stats(),
+        "match_history_cache": lcu.get_match_history_cache_stats(),
+        "rate_limiter": lcu.get_rate_limiter_stats(),
+        "inflight": lcu.get_inflight_count(),
+        "hedge": lcu.get_hedge_stats()
+    })
+
+
 @api_bp.route('/get_live_game_data', methods=['GET'])
 def get_live_game_data():
     """
@@ -574,7 +680,7 @@ def get_live_game_data():
                                verify=False, timeout=2)
         
         if response.status_code == 200:
-            all_game_data = response.json()
+            all_game_data = json_codec.loads(response.content)
             formatted_data = format_game_data(all_game_data)
             
             # OP.GG integration removed: returning formatted game data without external stats.
@@ -591,7 +697,7 @@ def get_live_game_data():
                 "message": "无法连接到游戏客户端"
             })
             
-    except requests.exceptions.RequestException:
+    except (requests.exceptions.RequestException, ValueError):
         return jsonify({
             "success": False,
             "inGame": False,
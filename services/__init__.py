@@ -3,5 +3,6 @@
 """
 from .auto_accept import auto_accept_task
 from .auto_analyze import auto_analyze_task
+from .credential_watcher import apply_credentials, credential_watcher_task
 
-__all__ = ['auto_accept_task', 'auto_analyze_task']
+__all__ = ['apply_credentials', 'auto_accept_task', 'auto_analyze_task', 'credential_watcher_task']
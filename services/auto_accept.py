@@ -5,6 +5,9 @@ import time
 from config import app_state
 from core import lcu
 
+# 事件驱动模式下等待阶段变化的最长时间（秒），超时后重新检查开关和连接状态
+EVENT_WAIT_TIMEOUT = 5
+
 
 def auto_accept_task(socketio):
     """
@@ -13,27 +16,49 @@ def auto_accept_task(socketio):
     Args:
         socketio: Flask-SocketIO实例，用于发送消息到前端
     """
-    while True:
-        if app_state.auto_accept_enabled and app_state.is_lcu_connected():
-            try:
-                token = app_state.lcu_credentials["auth_token"]
-                port = app_state.lcu_credentials["app_port"]
-                
-                phase = lcu.get_gameflow_phase(token, port)
-                
-                # ReadyCheck 阶段：自动接受对局
-                if phase == "ReadyCheck":
-                    try:
-                        lcu.accept_ready_check(token, port)
-                        socketio.emit('status_update', {'type': 'biz', 'message': '✅ 已自动接受对局!'})
-                        print("✅ 自动接受对局成功")
-                    except Exception as accept_error:
-                        print(f"⚠️ 自动接受对局失败: {accept_error}")
-                        socketio.emit('status_update', {'type': 'biz', 'message': f'⚠️ 自动接受失败: {accept_error}'})
+    # 阶段轮询决定接受对局的及时性，与接受请求一样不参与限流排队
+    with lcu.request_priority(lcu.PRIORITY_CRITICAL):
+        _auto_accept_loop(socketio)
+
+
+def _auto_accept_loop(socketio):
+    """
+    自动接受对局的主循环。
+    
+    LCU 事件推送已连接时，阻塞等待游戏阶段变化（进入 ReadyCheck 后立即接受）；
+    否则回退为每秒轮询一次游戏阶段。
+    """
+    phase_watcher = lcu.EventWatcher(lcu.URI_GAMEFLOW_PHASE)
+    try:
+        while True:
+            if app_state.auto_accept_enabled and app_state.is_lcu_connected():
+                event_driven = lcu.is_event_stream_connected()
+                try:
+                    token, port = app_state.get_lcu_credentials()
+                    
+                    if event_driven and phase_watcher.value is not None:
+                        phase = phase_watcher.value
+                    else:
+                        phase = lcu.get_gameflow_phase(token, port)
+                    
+                    # ReadyCheck 阶段：自动接受对局
+                    if phase == "ReadyCheck":
+                        try:
+                            lcu.accept_ready_check(token, port)
+                            socketio.emit('status_update', {'type': 'biz', 'message': '✅ 已自动接受对局!'})
+                            print("✅ 自动接受对局成功")
+                        except Exception as accept_error:
+                            print(f"⚠️ 自动接受对局失败: {accept_error}")
+                            socketio.emit('status_update', {'type': 'biz', 'message': f'⚠️ 自动接受失败: {accept_error}'})
+                    
+                except Exception as e:
+                    print(f"❌ 自动接受任务异常: {e}")
                 
-            except Exception as e:
-                print(f"❌ 自动接受任务异常: {e}")
-            
-            time.sleep(1)  # 快速轮询
-        else:
-            time.sleep(2)
+                if event_driven:
+                    phase_watcher.wait_for_change(EVENT_WAIT_TIMEOUT)  # 阶段变化时立即唤醒
+                else:
+                    time.sleep(1)  # 快速轮询
+            else:
+                time.sleep(2)
+    finally:
+        phase_watcher.close()
@@ -5,6 +5,12 @@ import time
 from config import app_state
 from core import lcu
 
+# 获取敌方信息的重试策略：游戏加载期间游戏内 API 尚未就绪，按指数退避重试
+ENEMY_RETRY_POLICY = lcu.RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0, budget=None)
+
+# 事件驱动模式下等待阶段变化的最长时间（秒），超时后重新检查开关和连接状态
+EVENT_WAIT_TIMEOUT = 5
+
 
 def auto_analyze_task(socketio):
     """
@@ -13,63 +19,113 @@ def auto_analyze_task(socketio):
     Args:
         socketio: Flask-SocketIO实例，用于发送消息到前端
     """
+    # 后台分析的请求让路给前端的交互请求
+    with lcu.request_priority(lcu.PRIORITY_BACKGROUND):
+        _auto_analyze_loop(socketio)
+
+
+def _auto_analyze_loop(socketio):
+    """
+    敌我分析的主循环。
+    
+    LCU 事件推送已连接且当前阶段没有待完成的分析时，阻塞等待游戏阶段变化；
+    否则按原有间隔轮询。
+    """
     enemy_retry_count = 0
-    MAX_ENEMY_RETRIES = 10
+    MAX_ENEMY_RETRIES = ENEMY_RETRY_POLICY.max_attempts
     last_phase = None
+    phase = None
+    phase_watcher = lcu.EventWatcher(lcu.URI_GAMEFLOW_PHASE)
     
-    while True:
-        if app_state.auto_analyze_enabled and app_state.is_lcu_connected():
-            try:
-                token = app_state.lcu_credentials["auth_token"]
-                port = app_state.lcu_credentials["app_port"]
+    try:
+        while True:
+            if app_state.auto_analyze_enabled and app_state.is_lcu_connected():
+                event_driven = lcu.is_event_stream_connected()
+                try:
+                    token, port = app_state.get_lcu_credentials()
                 
-                phase = lcu.get_gameflow_phase(token, port)
+                    if event_driven and phase_watcher.value is not None:
+                        phase = phase_watcher.value
+                    else:
+                        phase = lcu.get_gameflow_phase(token, port)
                 
-                # 检测到新的游戏流程开始，重置状态
-                if last_phase in ["Lobby", "None", None] and phase not in ["Lobby", "None"]:
-                    app_state.reset_analysis_state()
-                    enemy_retry_count = 0
-                    print(f"🔄 检测到新游戏流程开始 ({last_phase} -> {phase})，重置分析状态")
+                    # 检测到新的游戏流程开始，重置状态
+                    if last_phase in ["Lobby", "None", None] and phase not in ["Lobby", "None"]:
+                        app_state.reset_analysis_state()
+                        enemy_retry_count = 0
+                        print(f"🔄 检测到新游戏流程开始 ({last_phase} -> {phase})，重置分析状态")
                 
-                # ChampSelect 阶段：分析队友战绩
-                elif phase == "ChampSelect" and not app_state.teammate_analysis_done:
-                    _analyze_teammates(token, port, socketio)
+                    # ChampSelect 阶段：分析队友战绩
+                    elif phase == "ChampSelect" and not app_state.teammate_analysis_done:
+                        _analyze_teammates(token, port, socketio)
                 
-                # InProgress/GameStart 阶段：分析敌人战绩
-                elif phase in ["InProgress", "GameStart"] and not app_state.enemy_analysis_done:
-                    if enemy_retry_count < MAX_ENEMY_RETRIES:
-                        enemy_retry_count += 1
-                        success = _analyze_enemies(token, port, socketio, enemy_retry_count, MAX_ENEMY_RETRIES)
-                        if not success:
-                            time.sleep(3)  # 失败后等待3秒重试
-                    else:
-                        # 达到最大重试次数
-                        socketio.emit('status_update', {'type': 'biz', 'message': '❌ 无法获取敌方信息，已停止重试'})
-                        app_state.enemy_analysis_done = True
-                        print(f"❌ 达到最大重试次数 ({MAX_ENEMY_RETRIES})，停止尝试")
+                    # InProgress/GameStart 阶段：分析敌人战绩
+                    elif phase in ["InProgress", "GameStart"] and not app_state.enemy_analysis_done:
+                        if enemy_retry_count < MAX_ENEMY_RETRIES:
+                            enemy_retry_count += 1
+                            success = _analyze_enemies(token, port, socketio, enemy_retry_count, MAX_ENEMY_RETRIES)
+                            if not success:
+                                # 失败后按退避策略等待再重试
+                                time.sleep(ENEMY_RETRY_POLICY.backoff(enemy_retry_count - 1))
+                        else:
+                            # 达到最大重试次数
+                            socketio.emit('status_update', {'type': 'biz', 'message': '❌ 无法获取敌方信息，已停止重试'})
+                            app_state.enemy_analysis_done = True
+                            print(f"❌ 达到最大重试次数 ({MAX_ENEMY_RETRIES})，停止尝试")
                 
-                # EndOfGame 阶段：显示提示
-                elif phase == "EndOfGame":
-                    if app_state.teammate_analysis_done or app_state.enemy_analysis_done:
-                        socketio.emit('status_update', {'type': 'biz', 'message': '🏁 比赛结束，等待下一局...'})
-                        print("🏁 游戏结束")
+                    # EndOfGame 阶段：显示提示
+                    elif phase == "EndOfGame":
+                        if app_state.teammate_analysis_done or app_state.enemy_analysis_done:
+                            socketio.emit('status_update', {'type': 'biz', 'message': '🏁 比赛结束，等待下一局...'})
+                            print("🏁 游戏结束")
                 
-                # 更新上一次的阶段
-                last_phase = phase
+                    # 更新上一次的阶段
+                    last_phase = phase
 
-            except Exception as e:
-                error_msg = f'敌我分析任务出错: {str(e)}'
-                socketio.emit('status_update', {'type': 'biz', 'message': f'❌ {error_msg}'})
-                print(f"❌ 异常: {error_msg}")
-                time.sleep(5)
+                except Exception as e:
+                    error_msg = f'敌我分析任务出错: {str(e)}'
+                    socketio.emit('status_update', {'type': 'biz', 'message': f'❌ {error_msg}'})
+                    print(f"❌ 异常: {error_msg}")
+                    time.sleep(5)
             
-            # 循环等待时间
-            if phase in ["InProgress", "GameStart"] and not app_state.enemy_analysis_done:
-                time.sleep(1)
+                # 循环等待时间：有待完成的分析时继续轮询，否则等待阶段变化
+                if phase in ["InProgress", "GameStart"] and not app_state.enemy_analysis_done:
+                    time.sleep(1)
+                elif phase == "ChampSelect" and not app_state.teammate_analysis_done:
+                    time.sleep(2)
+                elif event_driven:
+                    phase_watcher.wait_for_change(EVENT_WAIT_TIMEOUT)
+                else:
+                    time.sleep(2)
             else:
                 time.sleep(2)
-        else:
-            time.sleep(2)
+    finally:
+        phase_watcher.close()
+
+
+def _emit_ranked(token, port, socketio, players):
+    """
+    为已推送的玩家并发查询段位，通过 'ranked_found' 事件补推段位摘要
+    
+    玩家列表先行推送，前端无需等待段位查询即可开始展示和查询战绩。
+    
+    Args:
+        token: LCU认证令牌
+        port: LCU端口
+        socketio: SocketIO实例
+        players: 含 puuid 的玩家列表
+    """
+    puuids = [p.get('puuid') for p in players if p.get('puuid')]
+    if not puuids:
+        return
+    try:
+        ranked = lcu.get_ranked_stats_many(token, port, puuids)
+    except Exception as e:
+        print(f"⚠️ 获取段位信息失败: {e}")
+        return
+    socketio.emit('ranked_found', {
+        'ranked': {puuid: lcu.summarize_ranked_stats(ranked.get(puuid)) for puuid in puuids}
+    })
 
 
 def _analyze_teammates(token, port, socketio):
@@ -98,6 +154,7 @@ def _analyze_teammates(token, port, socketio):
             socketio.emit('teammates_found', {'teammates': teammates})
             socketio.emit('status_update', {'type': 'biz', 'message': f'👥 发现 {len(teammates)} 名队友，开始分析战绩...'})
             app_state.teammate_analysis_done = True
+            _emit_ranked(token, port, socketio, teammates)
             print(f"✅ 队友分析完成，共 {len(teammates)} 人")
             print(f"📝 记录队友PUUID集合: {len(app_state.current_teammates)} 人")
 
@@ -139,6 +196,7 @@ def _analyze_enemies(token, port, socketio, retry_count, max_retries):
             socketio.emit('enemies_found', {'enemies': enemies})
             socketio.emit('status_update', {'type': 'biz', 'message': f'💥 发现 {len(enemies)} 名敌人，开始分析战绩...'})
             app_state.enemy_analysis_done = True
+            _emit_ranked(token, port, socketio, enemies)
             print(f"✅ 敌人分析完成，共 {len(enemies)} 人")
             return True
         else:
@@ -0,0 +1,85 @@
+"""
+LCU 凭证监视服务
+客户端重启后 token 和端口都会变化，后台定期检查并切换到新凭证
+"""
+import time
+
+from config import app_state
+from core import lcu
+
+# 检查间隔（秒）
+WATCH_INTERVAL = 3
+
+
+class _SilentStatus:
+    """后台检测不向前端推送中间过程，只在凭证变化时通知"""
+
+    def showMessage(self, message):
+        pass
+
+
+def apply_credentials(token, port):
+    """
+    更新全局 LCU 凭证；凭证变化时清空旧会话的状态并连接新凭证。
+
+    Args:
+        token: 认证令牌，None 表示客户端已关闭
+        port: 端口
+
+    Returns:
+        bool: 凭证是否发生变化
+    """
+    changed = app_state.set_lcu_credentials(token, port)
+    if changed:
+        # 旧客户端的分析进度不再有效
+        app_state.reset_analysis_state()
+        lcu.switch_credentials(token, port)
+        if token and port:
+            # 下次启动时先验证这组凭证，客户端未重启时省去完整检测
+            lcu.save_credentials(token, port)
+    elif token and port:
+        # 凭证未变但事件推送可能已被停止，确保其在运行
+        lcu.start_event_stream(token, port)
+    return changed
+
+
+def _read_credentials(proc):
+    """从客户端进程读取凭证，失败时回退为完整检测（读取日志）"""
+    token, port = lcu.get_credentials_from_process(proc)
+    if token and port:
+        return token, port
+    return lcu.autodetect_credentials(_SilentStatus())
+
+
+def credential_watcher_task(socketio):
+    """
+    凭证监视的后台任务。
+
+    只检查客户端进程的 PID（命中缓存时无需遍历进程）：PID 不变说明凭证不变；
+    出现新进程时读取新凭证，进程消失时清空凭证。自动接受、敌我分析等服务
+    每轮都读取最新凭证，因此客户端重启后无需重新开启。
+
+    Args:
+        socketio: Flask-SocketIO实例，用于发送消息到前端
+    """
+    last_pid = None
+    while True:
+        try:
+            proc = lcu.find_client_process()
+            if proc is None:
+                last_pid = None
+                if app_state.is_lcu_connected():
+                    apply_credentials(None, None)
+                    socketio.emit('status_update', {'type': 'lcu', 'message': '⚠️ 英雄联盟客户端已关闭，等待客户端重新启动...'})
+                    print("⚠️ 客户端进程已退出，已清空 LCU 凭证")
+            elif proc.pid != last_pid or not app_state.is_lcu_connected():
+                token, port = _read_credentials(proc)
+                if token and port:
+                    last_pid = proc.pid
+                    if apply_credentials(token, port):
+                        socketio.emit('status_update', {'type': 'lcu', 'message': f'✅ 检测到客户端启动，已连接 LCU！端口: {port}。'})
+                        print(f"🔄 LCU 凭证已更新 (端口: {port})")
+        except Exception as e:
+            print(f"❌ 凭证监视任务异常: {e}")
+
+        time.sleep(WATCH_INTERVAL)
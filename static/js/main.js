@@ -1,5 +1,5 @@
 // main.js - module entrypoint (ES Module)
-import { showInlineMessage, isLCUConnected, setLCUStatus, qs } from './modules/ui.js';
+import { showInlineMessage, isLCUConnected, setLCUStatus, qs, createRankSlot, renderRankBadges } from './modules/ui.js';
 import { fetchSummonerStats, fetchTFTMatches } from './modules/api.js';
 import { setupSocket } from './modules/socketHandler.js';
 
@@ -49,7 +49,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 const headerDiv = document.createElement('div');
                 headerDiv.className = 'd-flex justify-content-between align-items-center';
                 const riotIdLink = document.createElement('a');
-                riotIdLink.href = `/summoner/${encodeURIComponent(enemy.gameName + '#' + enemy.tagLine)}`;
+                // pass the puuid along so the page can fetch the summoner and ranks concurrently
+                const enemyQuery = enemy.puuid ? `?puuid=${encodeURIComponent(enemy.puuid)}` : '';
+                riotIdLink.href = `/summoner/${encodeURIComponent(enemy.gameName + '#' + enemy.tagLine)}${enemyQuery}`;
                 riotIdLink.target = '_blank';
                 riotIdLink.rel = 'noopener noreferrer';
                 riotIdLink.className = 'fw-bold text-danger text-decoration-none';
@@ -57,6 +59,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 riotIdLink.innerHTML = `<i class="bi bi-person-x-fill me-1"></i>${enemy.gameName}#${enemy.tagLine}`;
                 riotIdLink.title = '点击查看详细战绩';
                 headerDiv.appendChild(riotIdLink);
+                headerDiv.appendChild(createRankSlot(enemy.puuid));
                 if (enemy.championId && enemy.championId !== 'Unknown') {
                     const championSpan = document.createElement('span');
                     championSpan.className = 'badge bg-dark';
@@ -90,7 +93,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 const headerDiv = document.createElement('div');
                 headerDiv.className = 'd-flex justify-content-between align-items-center';
                 const riotIdLink = document.createElement('a');
-                riotIdLink.href = `/summoner/${encodeURIComponent(tm.gameName + '#' + tm.tagLine)}`;
+                // pass the puuid along so the page can fetch the summoner and ranks concurrently
+                const tmQuery = tm.puuid ? `?puuid=${encodeURIComponent(tm.puuid)}` : '';
+                riotIdLink.href = `/summoner/${encodeURIComponent(tm.gameName + '#' + tm.tagLine)}${tmQuery}`;
                 riotIdLink.target = '_blank';
                 riotIdLink.rel = 'noopener noreferrer';
                 riotIdLink.className = 'fw-bold text-primary text-decoration-none';
@@ -98,6 +103,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 riotIdLink.innerHTML = `<i class="bi bi-person-check-fill me-1"></i>${tm.gameName}#${tm.tagLine}`;
                 riotIdLink.title = '点击查看详细战绩';
                 headerDiv.appendChild(riotIdLink);
+                headerDiv.appendChild(createRankSlot(tm.puuid));
                 li.appendChild(headerDiv);
                 const statsDisplay = document.createElement('div');
                 statsDisplay.textContent = '⏳ 查询中...';
@@ -111,6 +117,9 @@ document.addEventListener('DOMContentLoaded', () => {
             realtimeStatus.textContent = `✅ 队友分析完成! 等待游戏开始...`;
             realtimeStatus.className = 'badge bg-success';
             console.log('队友战绩分析全部完成');
+        },
+        onRankedFound(data) {
+            renderRankBadges(data.ranked);
         }
     });
 
@@ -1,5 +1,5 @@
 // main.module.js - application bootstrap using ES modules
-import { showInlineMessage, isLCUConnected, setLCUStatus, qs } from './modules/ui.js';
+import { showInlineMessage, isLCUConnected, setLCUStatus, qs, createRankSlot, renderRankBadges } from './modules/ui.js';
 import { fetchSummonerStats } from './modules/api.js';
 import { setupSocket } from './modules/socketHandler.js';
 
@@ -48,12 +48,15 @@ document.addEventListener('DOMContentLoaded', () => {
                 const headerDiv = document.createElement('div');
                 headerDiv.className = 'd-flex justify-content-between align-items-center';
                 const riotIdLink = document.createElement('a');
-                riotIdLink.href = `/summoner/${encodeURIComponent(enemy.gameName + '#' + enemy.tagLine)}`;
+                // pass the puuid along so the page can fetch the summoner and ranks concurrently
+                const enemyQuery = enemy.puuid ? `?puuid=${encodeURIComponent(enemy.puuid)}` : '';
+                riotIdLink.href = `/summoner/${encodeURIComponent(enemy.gameName + '#' + enemy.tagLine)}${enemyQuery}`;
                 riotIdLink.className = 'fw-bold text-danger text-decoration-none';
                 riotIdLink.style.cursor = 'pointer';
                 riotIdLink.innerHTML = `<i class="bi bi-person-x-fill me-1"></i>${enemy.gameName}#${enemy.tagLine}`;
                 riotIdLink.title = '点击查看详细战绩';
                 headerDiv.appendChild(riotIdLink);
+                headerDiv.appendChild(createRankSlot(enemy.puuid));
                 if (enemy.championId && enemy.championId !== 'Unknown') {
                     const championSpan = document.createElement('span');
                     championSpan.className = 'badge bg-dark';
@@ -87,12 +90,15 @@ document.addEventListener('DOMContentLoaded', () => {
                 const headerDiv = document.createElement('div');
                 headerDiv.className = 'd-flex justify-content-between align-items-center';
                 const riotIdLink = document.createElement('a');
-                riotIdLink.href = `/summoner/${encodeURIComponent(tm.gameName + '#' + tm.tagLine)}`;
+                // pass the puuid along so the page can fetch the summoner and ranks concurrently
+                const tmQuery = tm.puuid ? `?puuid=${encodeURIComponent(tm.puuid)}` : '';
+                riotIdLink.href = `/summoner/${encodeURIComponent(tm.gameName + '#' + tm.tagLine)}${tmQuery}`;
                 riotIdLink.className = 'fw-bold text-primary text-decoration-none';
                 riotIdLink.style.cursor = 'pointer';
                 riotIdLink.innerHTML = `<i class="bi bi-person-check-fill me-1"></i>${tm.gameName}#${tm.tagLine}`;
                 riotIdLink.title = '点击查看详细战绩';
                 headerDiv.appendChild(riotIdLink);
+                headerDiv.appendChild(createRankSlot(tm.puuid));
                 li.appendChild(headerDiv);
                 const statsDisplay = document.createElement('div');
                 statsDisplay.textContent = '⏳ 查询中...';
@@ -106,6 +112,9 @@ document.addEventListener('DOMContentLoaded', () => {
             realtimeStatus.textContent = `✅ 队友分析完成! 等待游戏开始...`;
             realtimeStatus.className = 'badge bg-success';
             console.log('队友战绩分析全部完成');
+        },
+        onRankedFound(data) {
+            renderRankBadges(data.ranked);
         }
     });
 
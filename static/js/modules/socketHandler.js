@@ -5,6 +5,8 @@ export function setupSocket(handlers = {}) {
     if (handlers.onConnect) socket.on('connect', handlers.onConnect);
     if (handlers.onEnemiesFound) socket.on('enemies_found', handlers.onEnemiesFound);
     if (handlers.onTeammatesFound) socket.on('teammates_found', handlers.onTeammatesFound);
+    // ranks are pushed after the player lists: { ranked: { puuid: { solo, flex, tft } } }
+    if (handlers.onRankedFound) socket.on('ranked_found', handlers.onRankedFound);
     if (handlers.onStatusUpdate) socket.on('status_update', handlers.onStatusUpdate);
 
     return {
@@ -53,3 +53,44 @@ export function setLCUStatus(message, style = 'neutral') {
         statusBox.style.borderColor = '#b8daff';
     }
 }
+
+const TIER_NAMES = {
+    IRON: '坚韧黑铁', BRONZE: '英勇黄铜', SILVER: '不屈白银', GOLD: '荣耀黄金',
+    PLATINUM: '华贵铂金', EMERALD: '流光翡翠', DIAMOND: '璀璨钻石',
+    MASTER: '超凡大师', GRANDMASTER: '傲世宗师', CHALLENGER: '最强王者'
+};
+const QUEUE_NAMES = { solo: '单双', flex: '灵活', tft: '云顶' };
+
+// placeholder for a player's rank badges, filled in by renderRankBadges once ranks arrive
+export function createRankSlot(puuid) {
+    const slot = document.createElement('span');
+    slot.className = 'rank-badges ms-auto me-2';
+    if (puuid) slot.dataset.rankPuuid = puuid;
+    return slot;
+}
+
+// ranked: { puuid: { solo|flex|tft: { tier, division, leaguePoints } } }
+export function renderRankBadges(ranked = {}) {
+    Object.entries(ranked).forEach(([puuid, summary]) => {
+        document.querySelectorAll(`[data-rank-puuid="${CSS.escape(puuid)}"]`).forEach(slot => {
+            slot.innerHTML = '';
+            const queues = Object.keys(QUEUE_NAMES).filter(key => summary && summary[key]);
+            if (queues.length === 0) {
+                const badge = document.createElement('span');
+                badge.className = 'badge bg-light text-muted';
+                badge.textContent = '未定级';
+                slot.appendChild(badge);
+                return;
+            }
+            queues.forEach(key => {
+                const { tier, division, leaguePoints } = summary[key];
+                const badge = document.createElement('span');
+                badge.className = 'badge bg-warning text-dark me-1';
+                // apex tiers have no division (the client reports 'NA')
+                const div = division && division !== 'NA' ? ` ${division}` : '';
+                badge.textContent = `${QUEUE_NAMES[key]} ${TIER_NAMES[tier] || tier}${div} ${leaguePoints}LP`;
+                slot.appendChild(badge);
+            });
+        });
+    });
+}
@@ -0,0 +1,99 @@
+"""
+测试公共配置和本地替身服务器
+"""
+import json
+import os
+import socket
+import sys
+import threading
+
+import pytest
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Request, TextMessage
+
+# 以仓库根目录为导入起点（与 app.py 的运行方式一致）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandInLCUWebSocket:
+    """
+    本地替身 LCU WebSocket 服务器（明文 ws，WAMP 子协议）。
+
+    记录客户端的请求头和订阅消息，并可向所有连接推送事件或断开连接。
+    """
+
+    def __init__(self):
+        self.headers = []        # 每次握手的请求头
+        self.subscriptions = []  # 收到的 WAMP 消息
+        self._clients = []
+        self._lock = threading.Lock()
+        self._sock = socket.socket()
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        self.url = f"ws://127.0.0.1:{self.port}/"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        ws = WSConnection(ConnectionType.SERVER)
+        while True:
+            try:
+                data = conn.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            ws.receive_data(data)
+            for event in ws.events():
+                if isinstance(event, Request):
+                    self.headers.append({k.decode(): v.decode() for k, v in event.extra_headers})
+                    conn.send(ws.send(AcceptConnection(subprotocol='wamp' if 'wamp' in event.subprotocols else None)))
+                    with self._lock:
+                        self._clients.append((conn, ws))
+                elif isinstance(event, TextMessage):
+                    self.subscriptions.append(json.loads(event.data))
+                elif isinstance(event, CloseConnection):
+                    try:
+                        conn.send(ws.send(event.response()))
+                    except OSError:
+                        pass
+                    return
+
+    def push(self, uri, data, event_type='Update'):
+        """向所有连接推送一个 OnJsonApiEvent 事件"""
+        topic = 'OnJsonApiEvent' + uri.replace('/', '_')
+        message = json.dumps([8, topic, {'uri': uri, 'eventType': event_type, 'data': data}])
+        with self._lock:
+            for conn, ws in self._clients:
+                conn.send(ws.send(TextMessage(data=message)))
+
+    def drop_all(self):
+        """断开所有连接（模拟客户端卡死或重启）"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for conn, _ in clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+
+    def close(self):
+        self.drop_all()
+        self._sock.close()
+
+
+@pytest.fixture
+def lcu_ws_server():
+    server = StandInLCUWebSocket()
+    yield server
+    server.close()
@@ -0,0 +1,54 @@
+"""
+LRU + TTL 缓存测试：字节数上限与嵌套结构的大小估算
+"""
+from core.lcu import match_history
+from core.lcu.cache import LRUTTLCache, estimate_size, json_size
+
+
+def _games(n):
+    return [{'gameId': i, 'participantIdentities': [{'player': {'puuid': 'x' * 78}}] * 10} for i in range(n)]
+
+
+def test_json_size_counts_nested_values():
+    games = _games(50)
+    assert json_size(games) > 50 * 10 * 78
+    # 不递归的估算只计算外层列表本身
+    assert estimate_size(games) < json_size(games) / 10
+
+
+def test_byte_cap_evicts_least_recently_used():
+    one = json_size(_games(10))
+    cache = LRUTTLCache('test', max_entries=100, max_bytes=one * 2 + 1, sizeof=json_size)
+    cache.put('a', _games(10))
+    cache.put('b', _games(10))
+    assert cache.get('a') is not None
+    cache.put('c', _games(10))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['bytes'] == one * 2
+
+
+def test_match_history_cache_evicts_by_encoded_size(monkeypatch):
+    cache = match_history._match_history_cache
+    cache.clear()
+    games = _games(10)
+    one = json_size(games)
+    # 使用模块缓存本身的 sizeof，把上限缩小到只能容纳两个条目
+    monkeypatch.setattr(cache, 'max_bytes', one * 2 + one // 2)
+    # 外层列表的浅层估算远小于上限，不递归的 sizeof 不会触发淘汰
+    assert estimate_size(games) * 3 < cache.max_bytes
+    evictions = cache.stats()['evictions']
+
+    for puuid in ('p1', 'p2', 'p3', 'p4'):
+        cache.put(f"{puuid}_summary", _games(10))
+        assert cache.stats()['bytes'] <= cache.max_bytes
+
+    assert cache.get('p1_summary') is None
+    assert cache.get('p2_summary') is None
+    assert cache.get('p3_summary') is not None
+    assert cache.get('p4_summary') is not None
+    stats = match_history.get_match_history_cache_stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] - evictions == 2
+    assert stats['bytes'] == one * 2
+    cache.clear()
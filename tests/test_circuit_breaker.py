@@ -0,0 +1,39 @@
+"""
+熔断器测试：half-open 探测名额在任何异常后都会释放
+"""
+import pytest
+
+from core.lcu import circuit_breaker
+from core.lcu.circuit_breaker import STATE_OPEN, get_breaker, reset_circuit_breakers
+from core.lcu.client import _send
+
+
+class BrokenSession:
+    def request(self, method, url, **kwargs):
+        raise RuntimeError('unexpected adapter failure')
+
+
+@pytest.fixture(autouse=True)
+def clean_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def _half_open(endpoint, monkeypatch):
+    breaker = get_breaker(endpoint)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    # 冷却结束：下一个请求成为探测请求
+    monkeypatch.setattr(breaker, '_opened_at', circuit_breaker.time.time() - breaker.cooldown)
+    return breaker
+
+
+def test_unexpected_exception_releases_probe_slot(monkeypatch):
+    endpoint = '/lol-probe/v1/x'
+    breaker = _half_open(endpoint, monkeypatch)
+    with pytest.raises(RuntimeError):
+        _send(BrokenSession(), 'GET', endpoint, 'https://127.0.0.1' + endpoint, {'timeout': 5})
+    # 探测失败：重新熔断，而不是停留在 half-open 且名额被占用
+    assert breaker.snapshot()['state'] == STATE_OPEN
+    assert breaker._probe_in_flight is False
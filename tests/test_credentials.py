@@ -0,0 +1,147 @@
+"""
+LCU 凭证测试：命令行参数、lockfile、进程回退查找和凭证保存
+"""
+import os
+import stat
+import sys
+
+import psutil
+import pytest
+
+from core.lcu import credentials
+from core.lcu.credentials import (
+    autodetect_credentials,
+    clear_saved_credentials,
+    get_credentials_from_process,
+    load_saved_credentials,
+    parse_cmdline_credentials,
+    parse_lockfile,
+    read_lockfile,
+    save_credentials,
+)
+
+
+class FakeProcess:
+    """提供 cmdline()/exe() 的进程替身；传入异常类时对应方法抛出该异常"""
+
+    def __init__(self, cmdline=(), exe=None):
+        self._cmdline = cmdline
+        self._exe = exe
+
+    def cmdline(self):
+        if isinstance(self._cmdline, type):
+            raise self._cmdline(pid=1)
+        return list(self._cmdline)
+
+    def exe(self):
+        if self._exe is None:
+            raise psutil.AccessDenied(pid=1)
+        return self._exe
+
+
+@pytest.fixture(autouse=True)
+def no_install_root(monkeypatch):
+    monkeypatch.setattr(credentials, 'CLIENT_ROOT_PATH', None)
+    monkeypatch.setattr(credentials, 'LOG_DIR', None)
+
+
+@pytest.mark.parametrize('cmdline, expected', [
+    (['LeagueClientUx.exe', '--remoting-auth-token=abc-DEF_1', '--app-port=5000'], ('abc-DEF_1', 5000)),
+    ('"LeagueClientUx.exe" "--app-port=61234" "--remoting-auth-token=xyz"', ('xyz', 61234)),
+    (['LeagueClientUx.exe', '--app-port=5000'], (None, 5000)),
+    ([], (None, None)),
+    (None, (None, None)),
+])
+def test_parse_cmdline_credentials(cmdline, expected):
+    assert parse_cmdline_credentials(cmdline) == expected
+
+
+@pytest.mark.parametrize('content, expected', [
+    ('LeagueClient:12345:54321:s3cr3t:https', ('s3cr3t', 54321)),
+    ('LeagueClient:12345:54321:s3cr3t:https\n', ('s3cr3t', 54321)),
+    ('LeagueClient:12345:notaport:s3cr3t:https', (None, None)),
+    ('LeagueClient:12345:54321::https', (None, None)),
+    ('LeagueClient:12345:54321', (None, None)),
+    ('', (None, None)),
+])
+def test_parse_lockfile(content, expected):
+    assert parse_lockfile(content) == expected
+
+
+def test_read_lockfile(tmp_path):
+    (tmp_path / 'lockfile').write_text('LeagueClient:1:54321:s3cr3t:https', encoding='utf-8')
+    assert read_lockfile(str(tmp_path)) == ('s3cr3t', 54321)
+    assert read_lockfile(str(tmp_path / 'missing')) == (None, None)
+
+
+def test_process_cmdline_takes_priority(tmp_path):
+    (tmp_path / 'lockfile').write_text('LeagueClient:1:1111:from-lockfile:https', encoding='utf-8')
+    proc = FakeProcess(['--remoting-auth-token=from-cmdline', '--app-port=2222'], exe=str(tmp_path / 'LeagueClientUx.exe'))
+    assert get_credentials_from_process(proc) == ('from-cmdline', 2222)
+
+
+def test_process_falls_back_to_install_directory_lockfile(tmp_path):
+    (tmp_path / 'lockfile').write_text('LeagueClient:1:1111:from-lockfile:https', encoding='utf-8')
+    proc = FakeProcess(['LeagueClientUx.exe', f'--install-directory={tmp_path}'])
+    assert get_credentials_from_process(proc) == ('from-lockfile', 1111)
+
+
+def test_process_access_denied_uses_exe_directory(tmp_path):
+    (tmp_path / 'lockfile').write_text('LeagueClient:1:1111:from-lockfile:https', encoding='utf-8')
+    proc = FakeProcess(psutil.AccessDenied, exe=str(tmp_path / 'LeagueClientUx.exe'))
+    assert get_credentials_from_process(proc) == ('from-lockfile', 1111)
+
+
+def test_process_falls_back_to_install_root(tmp_path, monkeypatch):
+    root = tmp_path / 'LeagueClient'
+    (root / 'Logs').mkdir(parents=True)
+    (root / 'lockfile').write_text('LeagueClient:1:1111:from-root:https', encoding='utf-8')
+    # 日志目录本身没有 lockfile，应在其上级（安装根目录）中找到
+    monkeypatch.setattr(credentials, 'LOG_DIR', str(root / 'Logs'))
+    assert get_credentials_from_process(FakeProcess(psutil.AccessDenied)) == ('from-root', 1111)
+
+    monkeypatch.setattr(credentials, 'LOG_DIR', None)
+    monkeypatch.setattr(credentials, 'CLIENT_ROOT_PATH', str(root))
+    assert get_credentials_from_process(FakeProcess(psutil.AccessDenied)) == ('from-root', 1111)
+
+
+def test_process_without_credentials():
+    assert get_credentials_from_process(FakeProcess(['LeagueClientUx.exe'])) == (None, None)
+
+
+class StatusBar:
+    def __init__(self):
+        self.messages = []
+
+    def showMessage(self, message):
+        self.messages.append(message)
+
+
+def test_saved_credentials_round_trip(tmp_path):
+    path = str(tmp_path / 'helper' / 'lcu_credentials.json')
+    assert save_credentials('s3cr3t', 54321, path=path)
+    assert load_saved_credentials(path=path) == ('s3cr3t', 54321)
+    assert not os.path.exists(f"{path}.tmp")
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='POSIX 权限位')
+def test_saved_credentials_only_readable_by_owner(tmp_path):
+    path = tmp_path / 'lcu_credentials.json'
+    # 旧版本留下的临时文件权限较宽，不能沿用
+    tmp = tmp_path / 'lcu_credentials.json.tmp'
+    tmp.write_bytes(b'')
+    tmp.chmod(0o644)
+    assert save_credentials('s3cr3t', 54321, path=str(path))
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_stale_saved_credentials_deleted(tmp_path, monkeypatch):
+    path = str(tmp_path / 'lcu_credentials.json')
+    save_credentials('old-token', 1111, path=path)
+    # 默认路径在定义时绑定，这里把读写都指向临时目录
+    monkeypatch.setattr(credentials, 'load_saved_credentials', lambda: load_saved_credentials(path=path))
+    monkeypatch.setattr(credentials, 'clear_saved_credentials', lambda: clear_saved_credentials(path=path))
+    monkeypatch.setattr(credentials, 'validate_credentials', lambda token, port: False)
+    monkeypatch.setattr(credentials, 'is_league_client_running', lambda status_bar: False)
+    assert autodetect_credentials(StatusBar()) == (None, None)
+    assert not os.path.exists(path)
@@ -0,0 +1,116 @@
+"""
+LCU 事件推送测试：使用本地替身 WebSocket 服务器
+"""
+import base64
+import json
+import time
+
+import pytest
+
+from core.lcu import events
+from core.lcu.client import LCURequestError
+from core.lcu.events import (
+    URI_GAMEFLOW_PHASE,
+    URI_READY_CHECK,
+    EventWatcher,
+    LCUEventClient,
+)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture(autouse=True)
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(events, 'RECONNECT_DELAY', 0.05)
+
+
+@pytest.fixture
+def phase_watcher():
+    watcher = EventWatcher(URI_GAMEFLOW_PHASE)
+    yield watcher
+    watcher.close()
+
+
+def test_parse_event_message():
+    message = json.dumps([8, 'OnJsonApiEvent_lol-gameflow_v1_gameflow-phase',
+                          {'uri': URI_GAMEFLOW_PHASE, 'eventType': 'Update', 'data': 'Lobby'}])
+    event = events.parse_event_message(message)
+    assert event.uri == URI_GAMEFLOW_PHASE
+    assert event.event_type == 'Update'
+    assert event.data == 'Lobby'
+    assert events.parse_event_message('[0, "session", 1, "server"]') is None
+    assert events.parse_event_message('not json') is None
+
+
+def test_client_authenticates_subscribes_and_dispatches(lcu_ws_server, phase_watcher):
+    client = LCUEventClient('secret', 1234, url=lcu_ws_server.url, fetch=lambda uri: 'Lobby')
+    client.start()
+    try:
+        assert client.wait_connected(5)
+        expected_auth = 'Basic ' + base64.b64encode(b'riot:secret').decode('ascii')
+        assert lcu_ws_server.headers[0]['authorization'] == expected_auth
+        assert _wait_until(lambda: len(lcu_ws_server.subscriptions) == len(events.DEFAULT_TOPICS))
+        assert [5, 'OnJsonApiEvent_lol-gameflow_v1_gameflow-phase'] in lcu_ws_server.subscriptions
+
+        # 连接后先补齐当前数据
+        assert phase_watcher.value == 'Lobby'
+
+        phase_watcher.wait_for_change(0)
+        lcu_ws_server.push(URI_GAMEFLOW_PHASE, 'ReadyCheck')
+        assert phase_watcher.wait_for_change(5)
+        assert phase_watcher.value == 'ReadyCheck'
+    finally:
+        client.stop(timeout=5)
+
+
+def test_watchers_reset_on_disconnect_and_reseeded_on_reconnect(lcu_ws_server, phase_watcher):
+    phases = iter(['ReadyCheck', 'InProgress'])
+    client = LCUEventClient('secret', 1234, url=lcu_ws_server.url, fetch=lambda uri: next(phases))
+    client.start()
+    try:
+        assert client.wait_connected(5)
+        assert phase_watcher.value == 'ReadyCheck'
+
+        # 断线：旧数据不再可信
+        lcu_ws_server.drop_all()
+        assert _wait_until(lambda: phase_watcher.value != 'ReadyCheck')
+        assert phase_watcher.value in (None, 'InProgress')
+
+        # 重连后重新读取当前数据
+        assert _wait_until(lambda: client.connected and phase_watcher.value == 'InProgress')
+    finally:
+        client.stop(timeout=5)
+
+
+def test_seed_missing_resource_clears_watcher(lcu_ws_server):
+    watcher = EventWatcher(URI_READY_CHECK)
+    watcher.value = {'state': 'InProgress'}
+
+    def fetch(uri):
+        raise LCURequestError('GET', uri, '', status_code=404)
+
+    client = LCUEventClient('secret', 1234, url=lcu_ws_server.url, fetch=fetch)
+    client.start()
+    try:
+        assert client.wait_connected(5)
+        assert watcher.value is None
+    finally:
+        client.stop(timeout=5)
+        watcher.close()
+
+
+def test_closed_watcher_leaves_registry():
+    watcher = EventWatcher('/lol-test/v1/registry')
+    assert watcher in events._live_watchers()
+    watcher.close()
+    assert watcher not in events._live_watchers()
+    # 关闭后不再接收事件
+    events.dispatch_event(events.LCUEvent('/lol-test/v1/registry', 'Update', 1, None))
+    assert watcher.value is None
@@ -0,0 +1,80 @@
+"""
+对冲请求测试：确定的 4xx 立即返回，两个副本只记录一次熔断结果
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from core.lcu import client
+from core.lcu.circuit_breaker import get_breaker, reset_circuit_breakers
+from core.lcu.client import LCURequestError, _send_hedged
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.reason = 'fake'
+        self.content = b'{}'
+        self.headers = {}
+
+
+class FakeSession:
+    """按调用顺序执行预设的行为：(延迟秒数, 状态码或异常)"""
+
+    def __init__(self, *behaviours):
+        self._behaviours = list(behaviours)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            delay, result = self._behaviours.pop(0)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return FakeResponse(result)
+
+
+@pytest.fixture(autouse=True)
+def short_hedge_delay(monkeypatch):
+    monkeypatch.setattr(client, '_hedge_delay', lambda method, endpoint: 0.05)
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def _hedged(session, endpoint):
+    return _send_hedged(session, 'GET', endpoint, 'https://127.0.0.1' + endpoint, {'timeout': 5})
+
+
+def test_primary_404_after_hedge_delay_raises_without_waiting_for_hedge():
+    session = FakeSession((0.1, 404), (2.0, 200))
+    started = time.monotonic()
+    with pytest.raises(LCURequestError) as excinfo:
+        _hedged(session, '/lol-hedge-a/v1/x')
+    assert excinfo.value.status_code == 404
+    assert time.monotonic() - started < 1
+
+
+def test_hedge_wins_when_primary_is_slow():
+    session = FakeSession((1.0, 200), (0.0, 200))
+    started = time.monotonic()
+    assert _hedged(session, '/lol-hedge-b/v1/x').status_code == 200
+    assert time.monotonic() - started < 0.5
+
+
+def test_both_copies_timing_out_count_as_one_failure():
+    timeout = requests.exceptions.ReadTimeout('slow')
+    session = FakeSession((0.1, timeout), (0.1, timeout))
+    with pytest.raises(LCURequestError):
+        _hedged(session, '/lol-hedge-c/v1/x')
+    time.sleep(0.05)
+    assert get_breaker('/lol-hedge-c').snapshot()['failures'] == 1
+
+
+def test_one_copy_succeeding_is_not_a_failure():
+    session = FakeSession((0.1, requests.exceptions.ReadTimeout('slow')), (0.2, 200))
+    assert _hedged(session, '/lol-hedge-d/v1/x').status_code == 200
+    time.sleep(0.05)
+    assert get_breaker('/lol-hedge-d').snapshot()['failures'] == 0
@@ -0,0 +1,88 @@
+"""
+战绩查询测试：并发查询合并与按对局 ID 定位
+"""
+import threading
+import time
+
+import pytest
+
+from core.lcu import match_history
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    match_history.clear_match_history_cache()
+    yield
+    match_history.clear_match_history_cache()
+
+
+def test_concurrent_summary_fetches_share_one_stream(monkeypatch):
+    streams = []
+
+    def fake_iter(token, port, puuid, max_games=200, timeout=25, summary_only=True):
+        streams.append(puuid)
+        time.sleep(0.2)
+        return iter([{'gameId': i} for i in range(30)])
+
+    monkeypatch.setattr(match_history, 'iter_match_history_games', fake_iter)
+    results = []
+
+    def view():
+        results.append(match_history.get_match_history('t', 1, 'p1', count=10, summary_only=True))
+
+    threads = [threading.Thread(target=view) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert streams == ['p1']
+    assert len(results) == 5
+    assert all(len(r['games']['games']) == 10 for r in results)
+
+
+def _route_client(monkeypatch):
+    flask = pytest.importorskip('flask')
+    from config import app_state
+    from core import lcu
+    from routes import api_routes
+
+    app = flask.Flask(__name__)
+    app.register_blueprint(api_routes.api_bp)
+    monkeypatch.setattr(app_state, 'is_lcu_connected', lambda: True)
+    monkeypatch.setattr(app_state, 'get_lcu_credentials', lambda: ('t', 1))
+    monkeypatch.setattr(lcu, 'get_puuid', lambda token, port, name: 'p1')
+    monkeypatch.setattr(lcu, 'enrich_game_with_summoner_info', lambda token, port, game: None)
+    monkeypatch.setattr(api_routes, 'enrich_game_with_augments', lambda game: None)
+    return app.test_client(), lcu
+
+
+def test_match_by_index_resolves_from_summary(monkeypatch):
+    client, lcu = _route_client(monkeypatch)
+    calls = []
+
+    def fake_history(token, port, puuid, count=20, begin_index=0, summary_only=False):
+        calls.append(summary_only)
+        return {'games': {'games': [{'gameId': 100 + i} for i in range(count)]}}
+
+    monkeypatch.setattr(lcu, 'get_match_history', fake_history)
+    monkeypatch.setattr(lcu, 'get_match_by_id', lambda token, port, match_id: {'gameId': match_id, 'participants': []})
+    resp = client.get('/get_match?name=a%23b&index=3')
+    assert resp.get_json()['game']['gameId'] == 103
+    # 只读取摘要，不再拉取完整战绩
+    assert calls == [True]
+
+
+def test_match_by_index_falls_back_to_full_history(monkeypatch):
+    client, lcu = _route_client(monkeypatch)
+    calls = []
+
+    def fake_history(token, port, puuid, count=20, begin_index=0, summary_only=False):
+        calls.append(summary_only)
+        return {'games': {'games': [{'gameId': 100 + i, 'full': not summary_only} for i in range(count)]}}
+
+    monkeypatch.setattr(lcu, 'get_match_history', fake_history)
+    monkeypatch.setattr(lcu, 'get_match_by_id', lambda token, port, match_id: None)
+    resp = client.get('/get_match?name=a%23b&index=3')
+    assert resp.get_json()['game'] == {'gameId': 103, 'full': True}
+    assert calls == [True, False]
@@ -0,0 +1,87 @@
+"""
+重试策略测试：预算同时限制退避等待和每次尝试的超时
+"""
+import pytest
+
+from core.lcu.client import LCURequestError
+from core.lcu.deadline import cap_timeout, request_deadline
+from core.lcu.retry import RetryPolicy
+
+
+def _timeout_error():
+    return LCURequestError('GET', '/x', 'https://127.0.0.1/x', is_timeout=True)
+
+
+class FakeClock:
+    def __init__(self, monkeypatch):
+        self.now = 0.0
+        monkeypatch.setattr('time.monotonic', lambda: self.now)
+        monkeypatch.setattr('time.sleep', self.sleep)
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return FakeClock(monkeypatch)
+
+
+def test_attempt_timeout_capped_to_remaining_budget(clock):
+    policy = RetryPolicy(max_attempts=3, base_delay=0, budget=30.0, min_attempt_time=1.0)
+    timeouts = []
+
+    def attempt():
+        # 与 request_json 相同：按当前请求期限收紧 25 秒的超时，并假设每次都超时
+        timeout = cap_timeout(25)
+        timeouts.append(timeout)
+        clock.now += timeout
+        raise _timeout_error()
+
+    with pytest.raises(LCURequestError):
+        policy.call(attempt)
+    assert timeouts == [25, 5.0]
+    assert clock.now == 30.0
+
+
+def test_retry_skipped_when_remaining_budget_too_small(clock):
+    policy = RetryPolicy(max_attempts=3, base_delay=0, budget=30.0, min_attempt_time=1.0)
+    calls = []
+
+    def attempt():
+        calls.append(clock.now)
+        clock.now += 29.5
+        raise _timeout_error()
+
+    with pytest.raises(LCURequestError):
+        policy.call(attempt)
+    assert calls == [0.0]
+    assert clock.sleeps == []
+
+
+def test_retry_respects_outer_request_deadline(clock):
+    policy = RetryPolicy(max_attempts=3, base_delay=0, budget=None, min_attempt_time=1.0)
+    calls = []
+
+    def attempt():
+        calls.append(cap_timeout(10))
+        clock.now += 2
+        raise _timeout_error()
+
+    with request_deadline(3.5), pytest.raises(LCURequestError):
+        policy.call(attempt)
+    assert calls == [3.5, 1.5]
+
+
+def test_non_retryable_error_raised_immediately(clock):
+    calls = []
+
+    def attempt():
+        calls.append(1)
+        raise LCURequestError('GET', '/x', 'https://127.0.0.1/x', status_code=404)
+
+    with pytest.raises(LCURequestError):
+        RetryPolicy().call(attempt)
+    assert len(calls) == 1
@@ -0,0 +1,102 @@
+"""
+请求合并测试：首个调用方的请求期限不影响等待方
+"""
+import threading
+import time
+
+import pytest
+
+from core.lcu import client
+from core.lcu.client import LCUDeadlineExceededError, LCURequestError, _singleflight
+from core.lcu.deadline import request_deadline
+
+
+def _start_leader(key, fetch, timeout, deadline=None):
+    outcome = {}
+
+    def run():
+        try:
+            if deadline is None:
+                outcome['value'] = _singleflight(key, fetch, timeout)
+            else:
+                with request_deadline(deadline):
+                    outcome['value'] = _singleflight(key, fetch, timeout)
+        except LCURequestError as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    # 等首个调用方登记进行中的请求
+    while key not in client._inflight:
+        time.sleep(0.001)
+    return thread, outcome
+
+
+def test_waiters_share_leader_result():
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return 'shared'
+
+    thread, outcome = _start_leader(('t', 1, '/a', None), fetch, 5)
+    waiter = {}
+    waiter_thread = threading.Thread(target=lambda: waiter.setdefault('value', _singleflight(('t', 1, '/a', None), fetch, 5)))
+    waiter_thread.start()
+    time.sleep(0.05)
+    release.set()
+    thread.join()
+    waiter_thread.join()
+    assert outcome['value'] == waiter['value'] == 'shared'
+    assert calls == [1]
+
+
+def test_leader_budget_timeout_not_shared():
+    key = ('t', 1, '/b', None)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            # 首个调用方的超时被它自己的 0.2 秒预算收紧
+            time.sleep(0.1)
+            raise LCURequestError('GET', '/b', '', reason='timeout', is_timeout=True)
+        return 'fresh'
+
+    thread, outcome = _start_leader(key, fetch, 0.2, deadline=0.2)
+    with request_deadline(30):
+        assert _singleflight(key, fetch, 5) == 'fresh'
+    thread.join()
+    assert isinstance(outcome['error'], LCURequestError)
+    assert len(calls) == 2
+
+
+def test_genuine_errors_still_shared():
+    key = ('t', 1, '/c', None)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        raise LCURequestError('GET', '/c', '', status_code=503)
+
+    thread, _ = _start_leader(key, fetch, 5, deadline=0.5)
+    with request_deadline(30), pytest.raises(LCURequestError) as excinfo:
+        _singleflight(key, fetch, 5)
+    thread.join()
+    assert excinfo.value.status_code == 503
+    assert calls == [1]
+
+
+def test_waiter_wait_capped_by_own_budget():
+    key = ('t', 1, '/d', None)
+    release = threading.Event()
+    thread, _ = _start_leader(key, lambda: release.wait(2) and 'late', 5)
+    started = time.monotonic()
+    with request_deadline(0.1), pytest.raises(LCUDeadlineExceededError):
+        _singleflight(key, lambda: 'unused', 5)
+    assert time.monotonic() - started < 1
+    release.set()
+    thread.join()
@@ -0,0 +1,50 @@
+"""
+批量召唤师查询测试：ID 校验和批量端点不支持时的回退
+"""
+import json
+
+import pytest
+
+from core.lcu import summoner
+from core.lcu.client import LCURequestError
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    summoner.clear_summoner_cache()
+    yield
+    summoner.clear_summoner_cache()
+
+
+def test_non_numeric_ids_skipped_before_batching(monkeypatch):
+    batches = []
+
+    def fake_request_json(method, endpoint, token, port, params=None, **kwargs):
+        ids = json.loads(params['ids'])
+        batches.append(ids)
+        return [{'summonerId': sid, 'puuid': f'p{sid}', 'gameName': f'n{sid}'} for sid in ids]
+
+    monkeypatch.setattr(summoner, 'request_json', fake_request_json)
+    result = summoner.get_summoners_by_ids('t', 1, [1, '2', 'abc', None, '', 1])
+    assert batches == [[1, 2]]
+    assert set(result) == {1, '2'}
+
+
+def test_bad_request_does_not_disable_batch_endpoint(monkeypatch):
+    def fake_request_json(method, endpoint, token, port, params=None, **kwargs):
+        raise LCURequestError(method, endpoint, '', status_code=400)
+
+    monkeypatch.setattr(summoner, 'request_json', fake_request_json)
+    monkeypatch.setattr(summoner, 'get_summoner_by_id', lambda token, port, sid: None)
+    assert summoner.get_summoners_by_ids('t', 1, [1]) == {}
+    assert (1, summoner.BATCH_BY_ID_ENDPOINT) not in summoner._batch_unsupported
+
+
+def test_missing_batch_endpoint_falls_back_to_single_lookups(monkeypatch):
+    def fake_request_json(method, endpoint, token, port, params=None, **kwargs):
+        raise LCURequestError(method, endpoint, '', status_code=404)
+
+    monkeypatch.setattr(summoner, 'request_json', fake_request_json)
+    monkeypatch.setattr(summoner, 'get_summoner_by_id', lambda token, port, sid: {'summonerId': int(sid)})
+    assert summoner.get_summoners_by_ids('t', 1, [7]) == {7: {'summonerId': 7}}
+    assert (1, summoner.BATCH_BY_ID_ENDPOINT) in summoner._batch_unsupported
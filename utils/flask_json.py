@@ -0,0 +1,38 @@
+"""
+Flask JSON Provider
+让 jsonify 使用 utils.json_codec 的高速编解码
+"""
+from flask.json.provider import DefaultJSONProvider
+
+from . import json_codec
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """
+    使用 json_codec 的 Flask JSON Provider。
+    
+    紧凑输出（默认）走高速后端；调试模式需要缩进时回退到 Flask 默认实现。
+    不对键排序：前端不依赖键顺序，排序会抵消编码加速。
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+        return json_codec.dumps(obj, default=self.default)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # 直接输出字节串，省去 str 中转
+        return self._app.response_class(
+            json_codec.dumps_bytes(obj, default=self.default) + b"\n",
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,76 @@
+"""
+JSON 编解码模块
+优先使用 orjson（可选依赖），未安装时回退到标准库 json
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+# 当前使用的后端名称：'orjson' 或 'json'
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    # 允许非字符串键（如 {championId: ...}），与标准库行为保持一致；
+    # datetime 交给 default 处理（与标准库 + Flask 的格式一致）
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def loads(data):
+    """
+    解析 JSON 数据。
+    
+    Args:
+        data: bytes 或 str
+    
+    Returns:
+        解析后的 Python 对象
+    
+    Raises:
+        ValueError: JSON 格式错误
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson 不支持超出 64 位的整数等少数情况，交给标准库处理（并给出标准错误）
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def dumps_bytes(obj, default=None):
+    """
+    将对象序列化为紧凑的 UTF-8 JSON 字节串。
+    
+    Args:
+        obj: 待序列化对象
+        default: 无法序列化的对象的转换函数
+    
+    Returns:
+        bytes: JSON 字节串
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # 超大整数等 orjson 不支持的值，回退到标准库
+            pass
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj, default=None):
+    """
+    将对象序列化为紧凑的 JSON 字符串。
+    
+    Args:
+        obj: 待序列化对象
+        default: 无法序列化的对象的转换函数
+    
+    Returns:
+        str: JSON 字符串
+    """
+    return dumps_bytes(obj, default=default).decode('utf-8')
@@ -2,9 +2,10 @@
 WebSocket事件处理模块
 """
 import threading
+import time
 from flask_socketio import emit
 from config import app_state
-from services import auto_accept_task, auto_analyze_task
+from services import auto_accept_task, auto_analyze_task, credential_watcher_task, apply_credentials
 from core import lcu
 try:
     # vision-related services were removed; provide no-op placeholders to keep imports safe
@@ -17,6 +18,19 @@ except Exception:
         print("capture_screenshot_task is not available (feature removed)")
 
 
+# 检测失败后在该时间内（秒）复用失败结果，不为每个新连接重新检测；
+# 客户端之后启动时由凭证监视服务自动连接
+DETECTION_RESULT_TTL = 10
+
+# 全局共享的检测任务状态：同一时间最多运行一次检测
+_detection_lock = threading.Lock()
+_detection_state = {
+    'running': False,
+    'finished_at': None,  # 上次检测失败的结束时间（time.monotonic()），成功时清空
+    'message': None,      # 上次检测失败的结果消息
+}
+
+
 class SocketIOMessageProxy:
     """用 Socket.IO 消息模拟 status_bar 的 showMessage 方法"""
     
@@ -39,14 +53,37 @@ def register_socket_events(socketio):
     """
     thread_lock = threading.Lock()
     
+    # 凭证监视随服务启动，客户端重启后自动切换到新凭证
+    if app_state.credential_watcher_thread is None or not app_state.credential_watcher_thread.is_alive():
+        app_state.credential_watcher_thread = threading.Thread(
+            target=credential_watcher_task,
+            args=(socketio,),
+            daemon=True
+        )
+        app_state.credential_watcher_thread.start()
+    
     @socketio.on('connect')
     def handle_connect():
-        """客户端连接事件"""
+        """客户端连接事件：立即告知当前连接状态，必要时触发共享的检测任务"""
+        if app_state.is_lcu_connected():
+            _, port = app_state.get_lcu_credentials()
+            print('浏览器客户端已连接，LCU 已连接，无需检测')
+            emit('status_update', {'type': 'lcu', 'message': f'✅ LCU 已连接！端口: {port}。'})
+            return
+
+        with _detection_lock:
+            if _detection_state['running']:
+                emit('status_update', {'type': 'lcu', 'message': '正在自动检测英雄联盟客户端...'})
+                return
+            finished_at = _detection_state['finished_at']
+            if finished_at is not None and time.monotonic() - finished_at < DETECTION_RESULT_TTL:
+                emit('status_update', {'type': 'lcu', 'message': _detection_state['message']})
+                return
+            _detection_state['running'] = True
+
         print('浏览器客户端已连接，触发自动检测...')
-        status_proxy = SocketIOMessageProxy(socketio)
-        status_proxy.showMessage('已连接到本地服务器，开始自动检测LCU...')
-        
-        socketio.start_background_task(_detect_and_connect_lcu, socketio, status_proxy)
+        emit('status_update', {'type': 'lcu', 'message': '已连接到本地服务器，开始自动检测LCU...'})
+        socketio.start_background_task(_run_shared_detection, socketio)
     
     @socketio.on('start_auto_accept')
     def handle_start_auto_accept():
@@ -99,6 +136,29 @@ def register_socket_events(socketio):
 
 
 
+def _run_shared_detection(socketio):
+    """
+    后台任务：执行一次共享的 LCU 检测，检测失败时记录结果供后续连接复用
+    
+    只缓存失败结果：检测成功后新连接直接按当前连接状态回复，
+    LCU 随后断开时也会重新检测，而不是重放过期的成功消息。
+    调用方需已在 _detection_lock 下将 running 置为 True。
+    """
+    status_proxy = SocketIOMessageProxy(socketio)
+    message = None
+    try:
+        message = _detect_and_connect_lcu(socketio, status_proxy)
+    finally:
+        with _detection_lock:
+            _detection_state['running'] = False
+            if app_state.is_lcu_connected():
+                _detection_state['finished_at'] = None
+                _detection_state['message'] = None
+            else:
+                _detection_state['finished_at'] = time.monotonic()
+                _detection_state['message'] = message or "❌ 连接 LCU 失败。请检查客户端是否运行或重启程序。"
+
+
 def _detect_and_connect_lcu(socketio, status_proxy):
     """
     后台任务：尝试获取 LCU 凭证
@@ -106,16 +166,19 @@ def _detect_and_connect_lcu(socketio, status_proxy):
     Args:
         socketio: SocketIO实例
         status_proxy: 消息代理对象
+    
+    Returns:
+        str: 检测结果消息
     """
     status_proxy.showMessage("正在自动检测英雄联盟客户端 (进程和凭证)...")
     
     token, port = lcu.autodetect_credentials(status_proxy)
 
     if token and port:
-        app_state.lcu_credentials["auth_token"] = token
-        app_state.lcu_credentials["app_port"] = port
-        status_proxy.showMessage(f"✅ LCU 连接成功！端口: {port}。")
+        apply_credentials(token, port)
+        message = f"✅ LCU 连接成功！端口: {port}。"
     else:
-        app_state.lcu_credentials["auth_token"] = None
-        app_state.lcu_credentials["app_port"] = None
-        status_proxy.showMessage("❌ 连接 LCU 失败。请检查客户端是否运行或重启程序。")
+        apply_credentials(None, None)
+        message = "❌ 连接 LCU 失败。请检查客户端是否运行或重启程序。"
+    status_proxy.showMessage(message)
+    return message